@@ -0,0 +1,276 @@
+"""
+焼きなまし法による大規模グラフ向けの近似ソルバー
+
+厳密解法が終わらない数千駅規模の路線網向け。貪欲法と局所改善で作ったパスから始め、
+次の近傍操作をランダムに選んで焼きなます。
+
+- 延長: 端から未訪問の隣接駅へ伸ばす
+- 短縮: 端の駅を1つ外す
+- 回転: 端の駅とパスの途中の駅をつなぎ、その先の区間を反転する（Pósa の回転）
+- 挿入: 隣り合う2駅の間に未訪問の駅を挟む
+- 除去: 両隣が直接つながっている途中の駅を外す
+
+制限時間と反復回数の両方を予算にでき、乱数の種を固定すれば反復回数の予算では
+（制限時間に達しない限り）結果が再現する。独立な再出発（種を1ずつずらす）をプロセスプールで並列に実行し、
+最良の結果を採用する。
+"""
+
+import os
+import math
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from heuristics import PathHeuristics
+from search_control import SearchLimit, graph_upper_bound
+
+# 打ち切り条件と時計を確認する反復の間隔
+_CHECK_INTERVAL = 256
+
+# 最終温度 / 初期温度
+_COOLING_RATIO = 1e-3
+
+# 初期解の局所改善と最良解の仕上げにそれぞれ使う制限時間の割合
+_POLISH_SHARE = 0.1
+
+def _anneal(rows, seed, time_budget, max_iterations=None, search_limit=None, target=None):
+    """1回の焼きなまし。(最良パスのインデックス列, 距離, [(経過秒, 最良距離)], 反復回数) を返す
+
+    最良距離が target（距離の上界）に届けばそれ以上は改善できないため終える。
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    heuristics = PathHeuristics(rows, rng)
+    weights, ordered = heuristics.weights, heuristics.ordered
+    n = len(rows)
+    if n == 0:
+        return [], 0.0, [], 0
+
+    polish_time = time_budget * _POLISH_SHARE
+    path = heuristics.improve(heuristics.greedy(rng.randrange(n)), started + polish_time,
+                              search_limit)
+    visited = set(path)
+    current = heuristics.distance(path)
+    best_path, best_distance = list(path), current
+    history = [(time.perf_counter() - started, best_distance)]
+
+    # 初期温度は辺の重みの平均程度（悪化する操作も最初はよく受け入れる）
+    edge_weights = [w for row in weights for w in row.values()]
+    initial_temperature = max(sum(map(abs, edge_weights)) / max(1, len(edge_weights)), 1e-9)
+    temperature = initial_temperature
+
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        if iteration % _CHECK_INTERVAL == 0:
+            elapsed = time.perf_counter() - started
+            if elapsed >= time_budget - polish_time or \
+                    (target is not None and best_distance >= target) or (
+                    search_limit is not None and search_limit.should_stop()):
+                break
+            # 反復回数の予算があればそれに、なければ経過時間に合わせて指数的に冷却する
+            # （反復回数で冷却すれば制限時間に達しない限り結果が再現する）
+            if max_iterations:
+                progress = iteration / max_iterations
+            else:
+                progress = elapsed / (time_budget - polish_time)
+            temperature = initial_temperature * _COOLING_RATIO ** progress
+        iteration += 1
+
+        if rng.random() < 0.5:
+            path.reverse()
+        move = rng.random()
+        last = path[-1]
+
+        if move < 0.3:
+            # 延長
+            if not ordered[last]:
+                continue
+            v = rng.choice(ordered[last])
+            if v in visited:
+                continue
+            delta = weights[last][v]
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                continue
+            path.append(v)
+            visited.add(v)
+            current += delta
+        elif move < 0.45:
+            # 短縮
+            if len(path) < 2:
+                continue
+            delta = -weights[path[-2]][last]
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                continue
+            visited.discard(path.pop())
+            current += delta
+        elif move < 0.7:
+            # 回転
+            if len(path) < 3:
+                continue
+            x = rng.choice(ordered[last])
+            if x not in visited or x == path[-2] or x == last:
+                continue
+            i = path.index(x)
+            delta = weights[x][last] - weights[x][path[i + 1]]
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                continue
+            path[i + 1:] = path[:i:-1]
+            current += delta
+        elif move < 0.9:
+            # 挿入
+            if len(path) < 2:
+                continue
+            i = rng.randrange(len(path) - 1)
+            a, b = path[i], path[i + 1]
+            x = rng.choice(ordered[a])
+            if x in visited or b not in weights[x]:
+                continue
+            delta = weights[a][x] + weights[x][b] - weights[a][b]
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                continue
+            path.insert(i + 1, x)
+            visited.add(x)
+            current += delta
+        else:
+            # 除去
+            if len(path) < 3:
+                continue
+            i = rng.randrange(1, len(path) - 1)
+            a, x, b = path[i - 1], path[i], path[i + 1]
+            if b not in weights[a]:
+                continue
+            delta = weights[a][b] - weights[a][x] - weights[x][b]
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                continue
+            del path[i]
+            visited.discard(x)
+            current += delta
+
+        if current > best_distance:
+            # 差分の積み重ねによる誤差を避けるため記録時に計算し直す
+            current = heuristics.distance(path)
+            if current > best_distance:
+                best_path, best_distance = list(path), current
+                history.append((time.perf_counter() - started, best_distance))
+
+    # 最良のパスを局所改善で仕上げる（全体の制限時間を超えない）
+    heuristics.improve(best_path, min(time.perf_counter() + polish_time, started + time_budget),
+                       search_limit)
+    polished = heuristics.distance(best_path)
+    if polished > best_distance:
+        best_distance = polished
+        history.append((time.perf_counter() - started, best_distance))
+    return best_path, best_distance, history, iteration
+
+# ワーカープロセス側で保持するグラフと打ち切り条件（initializerで一度だけ設定）
+_WORKER_STATE = None
+
+def _init_worker(compiled, shared_limit=None):
+    """ワーカープロセスの初期化: CSR形式のグラフを受け取る"""
+    global _WORKER_STATE
+    # Ctrl+C は親プロセスが受け取り、共有中断フラグ経由でワーカーへ伝える
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    search_limit = SearchLimit.from_shared(shared_limit) if shared_limit is not None else None
+    _WORKER_STATE = (compiled.neighbor_rows(), search_limit)
+
+def _anneal_in_worker(args):
+    """ワーカープロセスで1回の焼きなましを実行"""
+    rows, search_limit = _WORKER_STATE
+    seed, time_budget, max_iterations, target = args
+    return _anneal(rows, seed, time_budget, max_iterations, search_limit, target)
+
+class AnnealingSolver:
+    """焼きなまし法による最長パスの近似ソルバー
+
+    time_budget は全体の制限時間（秒）、max_iterations は再出発1回あたりの反復回数の
+    上限（None なら時間のみ）。restarts 回の独立な焼きなまし（種は seed, seed + 1, ...）を
+    max_workers プロセス（既定は CPU 数）で分担する。history は全体の (経過秒, 最良距離) の推移。
+    """
+
+    def __init__(self, graph, time_budget=10.0, max_iterations=None, seed=0,
+                 restarts=None, max_workers=None):
+        self.graph = graph
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.seed = seed
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.restarts = restarts or self.max_workers
+        self.best_path = []
+        self.best_distance = 0.0
+        self.iterations = 0
+        self.history = []
+        self.progress_callback = None
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = False
+        self.upper_bound = 0.0
+
+    def set_progress_callback(self, callback):
+        """進捗表示用コールバックを設定（最良距離の推移を報告）"""
+        self.progress_callback = callback
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """計測値の記録先（SearchStats）を設定。反復を深さ0の展開として数え、最良距離の推移を記録する"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """焼きなまし法による最長パス探索"""
+        started = time.monotonic()
+        self.best_path = []
+        self.best_distance = 0.0
+        self.iterations = 0
+        self.history = []
+
+        compiled = self.graph.freeze()
+        if not compiled.vertex_ids:
+            self.is_optimal = True
+            self.upper_bound = 0.0
+            return [], 0.0
+
+        # 全域森の上界に届けば最適と分かるため、その時点で終える（通常は近似解のまま）
+        bound = graph_upper_bound(compiled)
+
+        # 再出発は各プロセスに順に割り当て、変換と上界の計算の残りの時間を均等に配る
+        rounds = -(-self.restarts // self.max_workers)
+        per_run = max(0.0, self.time_budget - (time.monotonic() - started)) / rounds
+        tasks = [(self.seed + i, per_run, self.max_iterations, bound)
+                 for i in range(self.restarts)]
+
+        if self.max_workers <= 1 or self.restarts <= 1:
+            rows = compiled.neighbor_rows()
+            results = [_anneal(rows, seed, budget, iterations, self.search_limit, target)
+                       for seed, budget, iterations, target in tasks]
+        else:
+            shared_limit = self.search_limit.share() if self.search_limit is not None else None
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(compiled, shared_limit)) as executor:
+                results = list(executor.map(_anneal_in_worker, tasks))
+
+        # 結果は種の順に統合するため、同距離の場合も決定的
+        events = []
+        for run, (path, distance, history, iterations) in enumerate(results):
+            self.iterations += iterations
+            offset = (run // self.max_workers) * per_run
+            events.extend((offset + elapsed, value) for elapsed, value in history)
+            if distance > self.best_distance or not self.best_path:
+                self.best_distance = distance
+                self.best_path = [compiled.vertex_ids[i] for i in path]
+
+        for elapsed, value in sorted(events):
+            if not self.history or value > self.history[-1][1]:
+                self.history.append((elapsed, value))
+                if self.progress_callback:
+                    self.progress_callback(f"{elapsed:.2f}秒: 最良距離 {value:.3f}")
+
+        if self.search_stats is not None:
+            self.search_stats.node(0, self.iterations)
+            for elapsed, value in self.history:
+                self.search_stats.improve(value, started + elapsed)
+
+        self.upper_bound = max(self.best_distance, bound)
+        self.is_optimal = self.best_distance >= bound
+        return self.best_path, self.best_distance
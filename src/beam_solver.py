@@ -0,0 +1,130 @@
+"""
+ビームサーチによる最長パスの近似ソルバー
+
+深さ（パスの頂点数）ごとに部分パスを展開し、「距離 + 残りの楽観的な上界」の
+評価値が高い上位 beam_width 個だけを次の深さへ残す。同じ (訪問済み集合, 端点) の
+部分パスは距離が最大のものだけを残す（以後の伸ばし方は同じため）。
+計算量は O(V · K · deg · log K) で、K で時間と解の質を調整できる。
+ビームから一度も状態を捨てなければ部分集合DPと同じく全状態を調べたことになり、
+結果は最適である。
+"""
+
+import heapq
+from search_control import SearchInterrupted, graph_upper_bound
+
+class BeamSearchSolver:
+    """幅 beam_width のビームサーチによる最長パスの近似ソルバー
+
+    残りの上界は未訪問頂点ごとの最も重い辺（負の重みは 0）の和で、
+    延長パスが新たに入る頂点ごとに1辺しか足されないため許容的。
+    """
+
+    def __init__(self, graph, beam_width=64):
+        if beam_width < 1:
+            raise ValueError("beam_width は 1 以上を指定してください")
+        self.graph = graph
+        self.beam_width = beam_width
+        self.best_path = []
+        self.best_distance = 0.0
+        self.states_expanded = 0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """計測値の記録先（SearchStats）を設定。重複した状態・ビームから落とした状態を枝刈りとして数える"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """ビームサーチによる最長パス探索"""
+        self.best_path = []
+        self.best_distance = 0.0
+        self.states_expanded = 0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+        compiled = self.graph.freeze()
+        vertex_ids = compiled.vertex_ids
+        if not vertex_ids:
+            return [], 0.0
+
+        # 頂点の組ごとの重み（多重辺は最大、自己ループは除く）
+        weights = [{} for _ in vertex_ids]
+        for u, row in enumerate(compiled.neighbor_rows()):
+            for v, weight in row:
+                if u != v and (v not in weights[u] or weight > weights[u][v]):
+                    weights[u][v] = weight
+        adjacency = [tuple((v, 1 << v, w) for v, w in row.items()) for row in weights]
+        heaviest = [max([0.0] + [max(0.0, w) for w in row.values()]) for row in weights]
+        total = sum(heaviest)
+
+        # 状態は (評価値, 距離, 訪問済みビット, 端点, 残りの上界, 親の状態)
+        # 始点は重い辺を持つ頂点から beam_width 個選ぶ
+        starts = heapq.nlargest(self.beam_width, range(len(vertex_ids)),
+                                key=heaviest.__getitem__)
+        truncated = len(vertex_ids) > self.beam_width
+        beam = [(total - heaviest[v], 0.0, 1 << v, v, total - heaviest[v], None)
+                for v in starts]
+        best = beam[0]
+        stats = self.search_stats
+        depth = 0
+
+        try:
+            while beam:
+                children = {}
+                generated = 0
+                for state in beam:
+                    if self.search_limit is not None:
+                        self.search_limit.check()
+                    self.states_expanded += 1
+                    _, distance, visited, end, remaining, _ = state
+                    for v, bit, weight in adjacency[end]:
+                        if visited & bit:
+                            continue
+                        key = (visited | bit, v)
+                        generated += 1
+                        child_distance = distance + weight
+                        previous = children.get(key)
+                        if previous is None or child_distance > previous[1]:
+                            child_remaining = remaining - heaviest[v]
+                            children[key] = (child_distance + child_remaining, child_distance,
+                                             key[0], v, child_remaining, state)
+
+                for state in children.values():
+                    if state[1] > best[1]:
+                        best = state
+                if len(children) > self.beam_width:
+                    truncated = True
+                if stats is not None:
+                    stats.node(depth, len(beam))
+                    stats.prune("duplicate", generated - len(children))
+                    stats.prune("beam_width", max(0, len(children) - self.beam_width))
+                    if best[1] > 0:
+                        stats.improve(best[1])
+                depth += 1
+                beam = heapq.nlargest(self.beam_width, children.values(),
+                                      key=lambda state: state[0])
+        except SearchInterrupted:
+            truncated = True
+
+        path = []
+        state = best
+        while state is not None:
+            path.append(vertex_ids[state[3]])
+            state = state[5]
+        path.reverse()
+        self.best_path = path if len(path) > 1 else []
+        self.best_distance = best[1] if len(path) > 1 else 0.0
+
+        if truncated:
+            bound = graph_upper_bound(compiled)
+            self.is_optimal = self.best_distance >= bound
+            self.upper_bound = max(self.best_distance, bound)
+        else:
+            self.upper_bound = self.best_distance
+        return self.best_path, self.best_distance
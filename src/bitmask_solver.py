@@ -0,0 +1,104 @@
+from search_control import SearchInterrupted, graph_upper_bound
+from symmetry import CanonicalIncumbent
+
+class BitmaskLongestPathSolver:
+    """ビットマスクで訪問状態を管理する高速な厳密ソルバー
+
+    駅IDを一度だけ 0..V-1 の密なインデックスへ写像し、隣接リストは
+    (隣接インデックス, ビット, 重み) のタプルとして事前に固めておく。
+    探索順序と向きの正規化（symmetry_breaking）は LongestPathSolver と同一なので、
+    同じパス・距離を返す。
+    """
+
+    def __init__(self, graph, symmetry_breaking=True):
+        self.graph = graph
+        self.symmetry_breaking = symmetry_breaking
+        self.best_path = []
+        self.best_distance = 0.0
+        self.nodes_explored = 0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+        self._build_index()
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先（SearchStats）を設定。None なら記録しない"""
+        self.search_stats = search_stats
+
+    def _build_index(self):
+        """頂点IDを密なインデックスに写像し、隣接配列を構築"""
+        # 始点の順序は LongestPathSolver と同じく get_all_vertices() に従う
+        self.vertex_ids = self.graph.get_all_vertices()
+        index = {vertex: i for i, vertex in enumerate(self.vertex_ids)}
+
+        # get_neighbors() は呼び出しごとにソートするため、ここで一度だけ使う
+        self.adjacency = tuple(
+            tuple((index[neighbor], 1 << index[neighbor], weight)
+                  for neighbor, weight in self.graph.get_neighbors(vertex))
+            for vertex in self.vertex_ids
+        )
+
+    def find_longest_path(self):
+        """全頂点から開始して最長パスを探索"""
+        adjacency = self.adjacency
+        path = []
+        weights = []
+        incumbent = CanonicalIncumbent(self.vertex_ids)
+        check = self.search_limit.check if self.search_limit is not None else None
+        stats = self.search_stats
+        nodes = 0
+        start = -1
+        later = 0
+        full = (1 << len(adjacency)) - 1
+
+        def dfs(current, visited, total_distance):
+            nonlocal nodes
+            nodes += 1
+
+            if check is not None:
+                check()
+            if stats is not None:
+                stats.node(len(path) - 1)
+
+            # 現在のパスが最長か確認（終点が始点より後の順位の場合のみ）
+            if current > start and total_distance >= incumbent.threshold:
+                if incumbent.offer(path, weights, total_distance) and stats is not None:
+                    stats.improve(incumbent.distance)
+
+            # 終点にできる頂点が未訪問に残っていなければ打ち切る
+            if not later & ~visited:
+                if stats is not None and visited != full:
+                    stats.prune("symmetry")
+                return
+
+            for neighbor, bit, weight in adjacency[current]:
+                if not visited & bit:
+                    path.append(neighbor)
+                    weights.append(weight)
+                    dfs(neighbor, visited | bit, total_distance + weight)
+                    weights.pop()
+                    path.pop()
+
+        # 打ち切られた場合はそれまでの最良解を返す
+        self.is_optimal = True
+        try:
+            for first in range(len(adjacency)):
+                # 対称性の除去を行わない場合は全頂点を「後の順位」として扱う
+                start = first if self.symmetry_breaking else -1
+                later = full & ~((1 << (start + 1)) - 1)
+                path[:] = [first]
+                dfs(first, 1 << first, 0.0)
+        except SearchInterrupted:
+            self.is_optimal = False
+
+        self.nodes_explored = nodes
+        self.best_distance = incumbent.distance
+        self.best_path = incumbent.path
+        self.upper_bound = self.best_distance if self.is_optimal else max(
+            self.best_distance, graph_upper_bound(self.graph))
+        return self.best_path, self.best_distance
@@ -0,0 +1,326 @@
+from collections import deque
+
+from search_control import SearchInterrupted, graph_upper_bound
+
+def build_simple_adjacency(graph):
+    """自己ループを除き、多重辺は最大重みのみ残した隣接辞書 {v: {u: w}} を構築"""
+    adjacency = {}
+    for vertex in graph.get_all_vertices():
+        neighbors = {}
+        for neighbor, weight in graph.get_neighbors(vertex):
+            if neighbor == vertex:
+                continue
+            if neighbor not in neighbors or weight > neighbors[neighbor]:
+                neighbors[neighbor] = weight
+        adjacency[vertex] = neighbors
+    return adjacency
+
+def biconnected_components(adjacency):
+    """Tarjan法（反復版）で二重連結成分（ブロック）を求める
+
+    戻り値はブロックごとの頂点リストのリスト。辺を持たない頂点はどのブロックにも属さない。
+    """
+    disc = {}
+    low = {}
+    blocks = []
+    counter = 0
+
+    for root in adjacency:
+        if root in disc:
+            continue
+        disc[root] = low[root] = counter
+        counter += 1
+        stack = [(root, None, iter(adjacency[root]))]
+        edge_stack = []
+
+        while stack:
+            v, parent, neighbors = stack[-1]
+            advanced = False
+            for w in neighbors:
+                if w == parent:
+                    continue
+                if w not in disc:
+                    edge_stack.append((v, w))
+                    disc[w] = low[w] = counter
+                    counter += 1
+                    stack.append((w, v, iter(adjacency[w])))
+                    advanced = True
+                    break
+                if disc[w] < disc[v]:
+                    # 後退辺
+                    edge_stack.append((v, w))
+                    if disc[w] < low[v]:
+                        low[v] = disc[w]
+            if advanced:
+                continue
+
+            stack.pop()
+            if not stack:
+                continue
+            p = stack[-1][0]
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if low[v] >= disc[p]:
+                # p は関節点（または根）: (p, v) までの辺がひとつのブロック
+                block = set()
+                while True:
+                    edge = edge_stack.pop()
+                    block.update(edge)
+                    if edge == (p, v):
+                        break
+                blocks.append(sorted(block))
+
+    return blocks
+
+def _block_all_pairs(block, adjacency, check=None, stats=None, pairs=None):
+    """ブロック内の全頂点対について最長単純パスを求める
+
+    戻り値は {(u, v): (距離, パスのタプル)}。ブロック内の頂点数に対して指数時間。
+    check を渡すと探索ノードごとに呼び出す（打ち切り時は SearchInterrupted が伝播する）。
+    stats（SearchStats）を渡すと展開したノードを深さごとに数える。
+    pairs に辞書を渡すとそこへ書き込むので、打ち切られた場合もそれまでに見つけた
+    （最長とは限らない）パスが残る。
+    """
+    index = {vertex: i for i, vertex in enumerate(block)}
+    local = tuple(
+        tuple((index[u], 1 << index[u], w) for u, w in sorted(adjacency[v].items())
+              if u in index)
+        for v in block
+    )
+
+    if pairs is None:
+        pairs = {}
+    for start in range(len(block)):
+        best = {}
+        path = [start]
+
+        def dfs(current, visited, total_distance):
+            if check is not None:
+                check()
+            if stats is not None:
+                stats.node(len(path) - 1)
+            if current != start:
+                known = best.get(current)
+                if known is None or total_distance > known[0]:
+                    best[current] = (total_distance, tuple(path))
+            for neighbor, bit, weight in local[current]:
+                if not visited & bit:
+                    path.append(neighbor)
+                    dfs(neighbor, visited | bit, total_distance + weight)
+                    path.pop()
+
+        try:
+            dfs(start, 1 << start, 0.0)
+        finally:
+            for end, (distance, local_path) in best.items():
+                pairs[(block[start], block[end])] = (distance, tuple(block[i] for i in local_path))
+
+    return pairs
+
+class BlockCutTreeSolver:
+    """ブロック・カット木による分解を用いた厳密ソルバー
+
+    最長単純パスはブロック・カット木上のパスに沿ってブロックを高々一度ずつ通るため、
+    各ブロック内では関節点を出入口とする最長パスだけを求め、
+    ブロック・カット木上の動的計画法で組み合わせる。
+    計算量は最大ブロックの頂点数に対してのみ指数的になる。
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.best_path = []
+        self.best_distance = 0.0
+        self.blocks = []
+        self.articulation_points = set()
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先（SearchStats）を設定。None なら記録しない"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """ブロック・カット木上のDPによる最長パス探索"""
+        self.best_path = []
+        self.best_distance = 0.0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+        vertex_ids = self.graph.get_all_vertices()
+        if not vertex_ids:
+            return [], 0.0
+
+        adjacency = build_simple_adjacency(self.graph)
+        self.blocks = biconnected_components(adjacency)
+
+        blocks_of = {}
+        for block_id, block in enumerate(self.blocks):
+            for v in block:
+                blocks_of.setdefault(v, []).append(block_id)
+        self.articulation_points = {v for v, ids in blocks_of.items() if len(ids) > 1}
+
+        best_distance = 0.0
+        best_path = None
+
+        # 連結成分ごとにブロック・カット木を根付けて処理
+        seen_blocks = set()
+        for block_id in range(len(self.blocks)):
+            if block_id in seen_blocks:
+                continue
+            distance, path = self._solve_tree(block_id, blocks_of, adjacency, seen_blocks)
+            if distance > best_distance:
+                best_distance = distance
+                best_path = path
+                if self.search_stats is not None:
+                    self.search_stats.improve(distance)
+            if not self.is_optimal:
+                break
+
+        if not self.is_optimal:
+            self.upper_bound = max(best_distance, graph_upper_bound(self.graph))
+
+        if best_path is None:
+            return self.best_path, self.best_distance
+
+        # 他の厳密ソルバーと同じ向き（始点の順位 < 終点の順位）に揃える
+        rank = {vertex: i for i, vertex in enumerate(vertex_ids)}
+        if rank[best_path[0]] > rank[best_path[-1]]:
+            best_path.reverse()
+
+        self.best_path = best_path
+        self.best_distance = sum(adjacency[u][v] for u, v in zip(best_path, best_path[1:]))
+        if self.is_optimal:
+            self.upper_bound = self.best_distance
+        return self.best_path, self.best_distance
+
+    def _solve_tree(self, root_block, blocks_of, adjacency, seen_blocks):
+        """ひとつの連結成分のブロック・カット木でDPを行い (距離, パス) を返す"""
+        # 幅優先で (ブロック, 親関節点) の処理順を決める
+        order = []
+        parent_cut = {root_block: None}
+        queue = deque([root_block])
+        seen_blocks.add(root_block)
+        while queue:
+            block_id = queue.popleft()
+            order.append(block_id)
+            for v in self.blocks[block_id]:
+                if v == parent_cut[block_id] or v not in self.articulation_points:
+                    continue
+                for child in blocks_of[v]:
+                    if child not in seen_blocks:
+                        seen_blocks.add(child)
+                        parent_cut[child] = v
+                        queue.append(child)
+
+        # down[c] = 関節点 c から子ブロック側へ下る最長パス (距離, 子ブロック, 終点)
+        # 頂点あたり上位2つの子ブロックを保持する
+        down = {}
+        pairs_of = {}
+        best_distance = 0.0
+        best_path = None
+
+        def ext(vertex, block_id):
+            """ブロック block_id から見て vertex の先に下れる距離"""
+            if vertex == parent_cut[block_id]:
+                return 0.0
+            entries = down.get(vertex)
+            return entries[0][0] if entries else 0.0
+
+        check = self.search_limit.check if self.search_limit is not None else None
+
+        for block_id in reversed(order):
+            block = self.blocks[block_id]
+            pairs = pairs_of[block_id] = {}
+            try:
+                _block_all_pairs(block, adjacency, check, self.search_stats, pairs)
+            except SearchInterrupted:
+                # 処理済みのブロックと打ち切られたブロックで見つけた対から候補を組み立てる
+                self.is_optimal = False
+
+            # ブロック内で完結する（両端が子側へ伸びる）候補
+            for (u, v), (distance, _) in pairs.items():
+                total = ext(u, block_id) + distance + ext(v, block_id)
+                if total > best_distance:
+                    best_distance = total
+                    best_path = ('pair', block_id, u, v)
+
+            if not self.is_optimal:
+                break
+            p = parent_cut[block_id]
+            if p is None:
+                continue
+
+            # 親関節点 p からこのブロックへ下る最長パス
+            best_down = (0.0, block_id, p)
+            for v in block:
+                if v == p:
+                    continue
+                distance = pairs[(p, v)][0] + ext(v, block_id)
+                if distance > best_down[0]:
+                    best_down = (distance, block_id, v)
+
+            entries = down.setdefault(p, [])
+            entries.append(best_down)
+            entries.sort(key=lambda x: x[0], reverse=True)
+            del entries[2:]
+
+        # 関節点で2つの子ブロックへ下るパスをつなぐ候補
+        for c, entries in down.items():
+            total = sum(entry[0] for entry in entries)
+            if total > best_distance:
+                best_distance = total
+                best_path = ('cut', c)
+
+        if best_path is None:
+            return 0.0, None
+        return best_distance, self._assemble(best_path, down, pairs_of, parent_cut)
+
+    def _descend(self, vertex, block_id, down, pairs_of):
+        """vertex から子ブロック側へ下る最長パスを展開（block_id 側へは下らない）"""
+        path = [vertex]
+        while True:
+            entries = [e for e in down.get(vertex, []) if e[1] != block_id]
+            if not entries or entries[0][0] <= 0.0:
+                return path
+            _, child, end = entries[0]
+            if end == vertex:
+                return path
+            path.extend(pairs_of[child][(vertex, end)][1][1:])
+            vertex, block_id = end, child
+
+    def _assemble(self, choice, down, pairs_of, parent_cut):
+        """DPの選択から実際のパスを組み立てる"""
+        if choice[0] == 'cut':
+            c = choice[1]
+            entries = down[c]
+            first = self._descend_via(c, entries[0], down, pairs_of)
+            if len(entries) < 2:
+                return first
+            second = self._descend_via(c, entries[1], down, pairs_of)
+            return first[::-1] + second[1:]
+
+        _, block_id, u, v = choice
+        middle = list(pairs_of[block_id][(u, v)][1])
+        head = self._descend_unless_parent(u, block_id, down, pairs_of, parent_cut)
+        tail = self._descend_unless_parent(v, block_id, down, pairs_of, parent_cut)
+        return head[::-1] + middle[1:-1] + tail
+
+    def _descend_unless_parent(self, vertex, block_id, down, pairs_of, parent_cut):
+        """ブロックの親関節点でなければ子側へ下るパスを展開"""
+        if vertex == parent_cut[block_id]:
+            return [vertex]
+        return self._descend(vertex, block_id, down, pairs_of)
+
+    def _descend_via(self, vertex, entry, down, pairs_of):
+        """指定した子ブロックを経由して下るパスを展開"""
+        _, child, end = entry
+        if end == vertex:
+            return [vertex]
+        path = [vertex] + list(pairs_of[child][(vertex, end)][1][1:])
+        return path[:-1] + self._descend(end, child, down, pairs_of)
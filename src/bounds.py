@@ -0,0 +1,188 @@
+"""
+分枝限定法のための残り距離の上界
+
+いずれの上界も「現在の頂点から未訪問頂点だけを通って伸ばせる距離」を
+過小評価しない（許容的）ことを保証する。負の重みは 0 に切り上げて扱う。
+"""
+
+# 浮動小数点の丸め誤差で最適解を枝刈りしないための余裕
+_RELATIVE_SLACK = 1e-12
+_ABSOLUTE_SLACK = 1e-9
+
+def inflate(bound):
+    """丸め誤差を吸収するため上界をわずかに広げる"""
+    return bound * (1.0 + _RELATIVE_SLACK) + _ABSOLUTE_SLACK
+
+def build_bound_adjacency(adjacency):
+    """上界計算用の隣接配列: 多重辺は最大重みのみ、重みは 0 以上、重み降順"""
+    result = []
+    for neighbors in adjacency:
+        heaviest = {}
+        for neighbor, bit, weight in neighbors:
+            weight = max(0.0, weight)
+            if neighbor not in heaviest or weight > heaviest[neighbor][1]:
+                heaviest[neighbor] = (bit, weight)
+        ordered = sorted(((n, bit, w) for n, (bit, w) in heaviest.items()),
+                         key=lambda x: x[2], reverse=True)
+        result.append(tuple(ordered))
+    return tuple(result)
+
+def reachable_mask(neighbor_masks, current, visited):
+    """現在の頂点から未訪問頂点だけを通って到達できる頂点集合（ビットセットの塗りつぶし）"""
+    reached = 0
+    frontier = neighbor_masks[current] & ~visited
+    while frontier:
+        reached |= frontier
+        expanded = 0
+        remaining = frontier
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            expanded |= neighbor_masks[low.bit_length() - 1]
+        frontier = expanded & ~visited & ~reached
+    return reached
+
+def max_spanning_forest_bound(sorted_edges, current, open_mask):
+    """current と open_mask の頂点からなる誘導部分グラフの最大全域森の重み
+
+    パスは森なので、その重みは最大全域森を超えない（マトロイドの性質）。
+    sorted_edges は (重み, u, v) を重み降順に並べたもの。
+    """
+    allowed = open_mask | (1 << current)
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    total = 0.0
+    for weight, u, v in sorted_edges:
+        if weight <= 0.0:
+            break
+        if not (allowed >> u) & 1 or not (allowed >> v) & 1:
+            continue
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            parent[ru] = rv
+            total += weight
+    return total
+
+class IncrementalPathBound:
+    """訪問・訪問解除に合わせて増分更新する、頂点次数ベースの上界
+
+    開集合 O = 未訪問頂点 ∪ {現在の頂点} とし、未訪問頂点 u ごとに
+      t1[u] = u から O への最大の辺の重み
+      t2[u] = u から O への重い順に2本の辺の重みの和
+    を保持する。延長パス c = x0, x1, ..., xk の距離は
+      sum(t1[xi])                               （各頂点へ入る辺）
+      (c から未訪問への最大辺 + sum(t2[u])) / 2  （各頂点に接する2辺）
+    のどちらも超えないため、その小さい方を上界とする。
+    """
+
+    def __init__(self, adjacency):
+        self.adjacency = build_bound_adjacency(adjacency)
+        n = len(self.adjacency)
+        self.t1 = [0.0] * n
+        self.t2 = [0.0] * n
+        self.sum1 = 0.0
+        self.sum2 = 0.0
+        self._undo = []
+
+    def reset(self, current, visited):
+        """現在の状態から全ての値を計算し直す"""
+        self._undo = []
+        self.sum1 = 0.0
+        self.sum2 = 0.0
+        for u in range(len(self.adjacency)):
+            if (visited >> u) & 1:
+                self.t1[u] = self.t2[u] = 0.0
+                continue
+            t1, t2 = self._top_two(u, current, visited)
+            self.t1[u], self.t2[u] = t1, t2
+            self.sum1 += t1
+            self.sum2 += t2
+
+    def _top_two(self, u, current, visited):
+        """u から開集合への重い順2本の辺（隣接配列は重み降順）"""
+        first = None
+        for neighbor, bit, weight in self.adjacency[u]:
+            if visited & bit and neighbor != current:
+                continue
+            if first is None:
+                first = weight
+            else:
+                return first, first + weight
+        if first is None:
+            return 0.0, 0.0
+        return first, first
+
+    def advance(self, current, nxt, visited):
+        """current から nxt へ進む（visited は nxt を含む）。retreat 用の印を返す"""
+        undo = self._undo
+        mark = len(undo)
+        t1, t2 = self.t1, self.t2
+
+        # nxt は未訪問集合から外れる
+        undo.append((nxt, t1[nxt], t2[nxt]))
+        self.sum1 -= t1[nxt]
+        self.sum2 -= t2[nxt]
+        t1[nxt] = t2[nxt] = 0.0
+
+        # current は開集合から外れるので、その未訪問の隣接頂点を再計算
+        for u, bit, _ in self.adjacency[current]:
+            if visited & bit:
+                continue
+            old1, old2 = t1[u], t2[u]
+            new1, new2 = self._top_two(u, nxt, visited)
+            if new1 != old1 or new2 != old2:
+                undo.append((u, old1, old2))
+                t1[u], t2[u] = new1, new2
+                self.sum1 += new1 - old1
+                self.sum2 += new2 - old2
+        return mark
+
+    def retreat(self, mark):
+        """advance の変更を取り消す"""
+        undo = self._undo
+        t1, t2 = self.t1, self.t2
+        while len(undo) > mark:
+            u, old1, old2 = undo.pop()
+            self.sum1 += old1 - t1[u]
+            self.sum2 += old2 - t2[u]
+            t1[u], t2[u] = old1, old2
+
+    def value(self, current, visited):
+        """現在の頂点から伸ばせる残り距離の上界"""
+        head = 0.0
+        for _, bit, weight in self.adjacency[current]:
+            if not visited & bit:
+                head = weight
+                break
+        else:
+            # 未訪問の隣接頂点がなければこれ以上伸ばせない
+            return 0.0
+        return inflate(min(self.sum1, (head + self.sum2) * 0.5))
+
+    def reachable_value(self, neighbor_masks, current, visited):
+        """到達可能な未訪問頂点だけに限定した上界（塗りつぶしを伴うため高コスト）"""
+        reached = reachable_mask(neighbor_masks, current, visited)
+        if not reached:
+            return 0.0
+        sum1 = sum2 = 0.0
+        remaining = reached
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            u = low.bit_length() - 1
+            sum1 += self.t1[u]
+            sum2 += self.t2[u]
+        head = 0.0
+        for _, bit, weight in self.adjacency[current]:
+            if not visited & bit:
+                head = weight
+                break
+        return inflate(min(sum1, (head + sum2) * 0.5))
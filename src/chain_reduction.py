@@ -0,0 +1,147 @@
+from graph import Graph
+
+class ChainContraction:
+    """次数2の駅が連なる鎖を重み付きの超辺に縮約したグラフ
+
+    鎖（両端の分岐駅 a, b の間に次数2の駅 v1..vk が並んだもの）は、
+    v1, vk と鎖内で最も軽い辺の両端だけを代表駅として残し、
+    その間を超辺に縮約する。重みが非負であれば、最長パスの端点は
+    これらの代表駅に寄せても距離が減らないため、縮約後も厳密解が得られる。
+    負の重みを含むグラフは縮約しない。
+    """
+
+    def __init__(self, graph):
+        self.original = graph
+        self.graph = Graph()
+        self.expansions = {}  # (u, v) -> u と v の間に挟まる駅のリスト
+        self.contracted_vertices = 0
+        self._contract()
+
+    def _contract(self):
+        """鎖を検出して縮約グラフを構築"""
+        original = self.original
+        vertices = original.get_all_vertices()
+
+        if any(weight < 0 for v in vertices for _, weight in original.get_neighbors(v)):
+            self.graph = original
+            return
+
+        def is_chain_vertex(v):
+            neighbors = original.get_neighbors(v)
+            return (len(neighbors) == 2 and neighbors[0][0] != neighbors[1][0]
+                    and v not in (neighbors[0][0], neighbors[1][0]))
+
+        chain_vertices = {v for v in vertices if is_chain_vertex(v)}
+        consumed = set()
+
+        # 分岐駅同士を直接結ぶ辺はそのまま残す（各辺を一度だけ追加）
+        for u in vertices:
+            if u in chain_vertices:
+                continue
+            loops = []
+            for v, weight in original.get_neighbors(u):
+                if v == u:
+                    loops.append(weight)
+                elif v not in chain_vertices and u < v:
+                    self.graph.add_edge(u, v, weight)
+            # 自己ループは隣接リストに2回ずつ並んで現れる
+            for weight in loops[::2]:
+                self.graph.add_edge(u, u, weight)
+
+        # 分岐駅から出る鎖
+        for hub in vertices:
+            if hub in chain_vertices:
+                continue
+            for first, weight in original.get_neighbors(hub):
+                if first in chain_vertices and first not in consumed:
+                    self._add_chain(self._walk(hub, first, weight, chain_vertices), consumed)
+
+        # 分岐駅を持たない環状の成分は、先頭の駅を分岐駅とみなす
+        for v in vertices:
+            if v in chain_vertices and v not in consumed:
+                consumed.add(v)
+                first, weight = original.get_neighbors(v)[0]
+                self._add_chain(self._walk(v, first, weight, chain_vertices), consumed)
+
+    def _walk(self, hub, first, weight, chain_vertices):
+        """hub から first 方向へ鎖を辿り、(駅列, 辺の重み列) を返す"""
+        stations = [hub, first]
+        weights = [weight]
+        previous, current = hub, first
+        while current in chain_vertices and current != hub:
+            (n1, w1), (n2, w2) = self.original.get_neighbors(current)
+            nxt, w = (n2, w2) if n1 == previous else (n1, w1)
+            stations.append(nxt)
+            weights.append(w)
+            previous, current = current, nxt
+        return stations, weights
+
+    def _add_chain(self, chain, consumed):
+        """鎖を代表駅と超辺に縮約して縮約グラフへ追加"""
+        stations, weights = chain
+        interior = range(1, len(stations) - 1)
+        consumed.update(stations[i] for i in interior)
+
+        # 代表駅: 両端の分岐駅, 先頭・末尾の中間駅, 内部で最も軽い辺の両端
+        keep = {0, 1, len(stations) - 2, len(stations) - 1}
+        if len(stations) > 4:
+            lightest = min(range(1, len(weights) - 1), key=lambda i: weights[i])
+            keep.update((lightest, lightest + 1))
+
+        kept = sorted(keep)
+        for i, j in zip(kept, kept[1:]):
+            u, v = stations[i], stations[j]
+            self.graph.add_edge(u, v, sum(weights[i:j]))
+            if j > i + 1:
+                between = stations[i + 1:j]
+                self.expansions[(u, v)] = between
+                self.expansions[(v, u)] = between[::-1]
+                self.contracted_vertices += len(between)
+
+    def expand(self, path):
+        """縮約グラフ上のパスを元の駅列に展開"""
+        if not path:
+            return []
+        expanded = [path[0]]
+        for u, v in zip(path, path[1:]):
+            expanded.extend(self.expansions.get((u, v), ()))
+            expanded.append(v)
+        return expanded
+
+class ChainContractedSolver:
+    """鎖を縮約したグラフで任意のソルバーを実行し、結果を展開するラッパー"""
+
+    def __init__(self, graph, solver_factory):
+        self.graph = graph
+        self.solver_factory = solver_factory
+        self.reduction = None
+        self.best_path = []
+        self.best_distance = 0.0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件を設定（縮約グラフ上のソルバーへ引き継ぐ）"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先を設定（縮約グラフ上のソルバーへ引き継ぐ）"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """縮約グラフ上で最長パスを探索し、元の駅列に展開"""
+        self.reduction = ChainContraction(self.graph)
+        solver = self.solver_factory(self.reduction.graph)
+        if self.search_limit is not None:
+            solver.set_search_limit(self.search_limit)
+        if self.search_stats is not None:
+            solver.set_search_stats(self.search_stats)
+        path, distance = solver.find_longest_path()
+
+        self.best_path = self.reduction.expand(path)
+        self.best_distance = distance
+        self.is_optimal = solver.is_optimal
+        self.upper_bound = solver.upper_bound
+        return self.best_path, self.best_distance
@@ -0,0 +1,175 @@
+from array import array
+from collections import Counter
+from itertools import accumulate, chain
+from operator import gt
+
+def as_array(values, typecode):
+    """array はそのまま、memoryview などのバッファは array に複製して返す"""
+    return values if isinstance(values, array) else array(typecode, values.tobytes())
+
+class CompiledGraph:
+    """変更不可のコンパクトなグラフ（CSR形式）
+
+    頂点IDを 0..V-1 の密なインデックスへ写像し、インデックス i の隣接は
+    targets[offsets[i]:offsets[i + 1]] と weights[同範囲] に頂点ID順で格納する。
+    1本の無向辺あたり (4 + 8) バイト × 2方向で済み、ワーカーへの転送も小さい。
+    Graph と同じ読み出しAPI（get_all_vertices, get_neighbors, is_forest）を持つ。
+    スナップショットから読み込んだ場合、配列はメモリマップ上の memoryview になる。
+    """
+
+    def __init__(self, vertex_ids, offsets, targets, weights):
+        self.vertex_ids = list(vertex_ids)
+        self.index = {vertex: i for i, vertex in enumerate(self.vertex_ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Graph から構築（インデックス順は get_all_vertices() の順序に従う）"""
+        vertex_ids = graph.get_all_vertices()
+        index = {vertex: i for i, vertex in enumerate(vertex_ids)}
+
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        for vertex in vertex_ids:
+            for neighbor, weight in graph.get_neighbors(vertex):
+                targets.append(index[neighbor])
+                weights.append(weight)
+            offsets.append(len(targets))
+        return cls(vertex_ids, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, us, vs, ws):
+        """辺の列（両端の頂点IDの配列 us, vs と重みの配列 ws）から直接構築
+
+        同じ順に Graph.add_edge した場合と同じ頂点順・隣接順になる。
+        次数からオフセットを求め、辺の順に各始点の範囲へ隣接を書き込んでから、
+        頂点ID順に並んでいない行だけを安定ソートする（ID順に並んだ辺リストでは
+        並べ替えが要らない）。作業領域は辺数に比例する array だけで済む。
+        """
+        # Graph.add_edge と同じ追加順で集合を作り、頂点の列挙順を揃える
+        vertices = set()
+        vertices.update(chain.from_iterable(zip(us, vs)))
+        vertex_ids = list(vertices)
+        n = len(vertex_ids)
+        index = dict(zip(vertex_ids, range(n)))
+
+        heads = array('i', map(index.__getitem__, us))
+        tails = array('i', map(index.__getitem__, vs))
+        degree = Counter(heads)
+        degree.update(tails)
+        offsets = array('i', [0])
+        offsets.extend(accumulate(map(degree.__getitem__, range(n))))
+        del degree
+
+        # Graph の隣接リストへの追加順（辺ごとに u -> v, v -> u）で各行を埋める
+        entries = offsets[-1]
+        targets = array('i', bytes(4 * entries))
+        weights = array('d', bytes(8 * entries))
+        cursor = offsets[:-1]
+        for u, v, w in zip(heads, tails, ws):
+            k = cursor[u]
+            targets[k] = v
+            weights[k] = w
+            cursor[u] = k + 1
+            k = cursor[v]
+            targets[k] = u
+            weights[k] = w
+            cursor[v] = k + 1
+        del heads, tails, cursor
+
+        # 行の中で隣接の頂点IDの順位が下がる箇所（行の境目を除く）があれば、
+        # その行を順位で安定ソートする（多重辺は追加順のまま）
+        rank = array('i', bytes(4 * n))
+        for r, i in enumerate(sorted(range(n), key=vertex_ids.__getitem__)):
+            rank[i] = r
+        ranks = array('i', map(rank.__getitem__, targets))
+        descents = sum(map(gt, ranks, ranks[1:]))
+        starts = offsets[1:-1]
+        descents -= sum(map(gt, map(ranks.__getitem__, [s - 1 for s in starts]),
+                            map(ranks.__getitem__, starts)))
+        if descents:
+            for i in range(n):
+                start, end = offsets[i], offsets[i + 1]
+                if end - start > 1:
+                    order = sorted(range(start, end), key=ranks.__getitem__)
+                    targets[start:end] = array('i', map(targets.__getitem__, order))
+                    weights[start:end] = array('d', map(weights.__getitem__, order))
+        return cls(vertex_ids, offsets, targets, weights)
+
+    def __getstate__(self):
+        # 逆引き辞書は復元時に作り直す。メモリマップ上の配列は array に複製して送る
+        return (self.vertex_ids, as_array(self.offsets, 'i'),
+                as_array(self.targets, 'i'), as_array(self.weights, 'd'))
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def freeze(self):
+        """既に変更不可のため自身を返す"""
+        return self
+
+    @property
+    def vertex_count(self):
+        return len(self.vertex_ids)
+
+    @property
+    def edge_count(self):
+        """無向辺の本数（自己ループは隣接に2回現れるため同様に数える）"""
+        return len(self.targets) // 2
+
+    def get_all_vertices(self):
+        """全頂点の取得"""
+        return list(self.vertex_ids)
+
+    def get_neighbors(self, vertex):
+        """指定した頂点の隣接頂点とその重みを取得（頂点ID順）"""
+        i = self.index.get(vertex)
+        if i is None:
+            return []
+        ids = self.vertex_ids
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return [(ids[j], w) for j, w in zip(self.targets[start:end], self.weights[start:end])]
+
+    def neighbor_rows(self, key=None, reverse=False):
+        """インデックスごとの (隣接インデックス, 重み) タプル列を作る
+
+        探索の内側のループでは配列の範囲走査よりタプルの走査の方が速いため、
+        探索直前に一度だけ展開して使う。key を渡すとその順に並べ替える。
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        rows = []
+        for i in range(len(self.vertex_ids)):
+            row = list(zip(targets[offsets[i]:offsets[i + 1]], weights[offsets[i]:offsets[i + 1]]))
+            if key is not None:
+                row.sort(key=key, reverse=reverse)
+            rows.append(tuple(row))
+        return tuple(rows)
+
+    def is_forest(self):
+        """自己ループと多重辺を除いた単純グラフが森（閉路を持たない）かを判定"""
+        parent = list(range(len(self.vertex_ids)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        offsets, targets = self.offsets, self.targets
+        for u in range(len(self.vertex_ids)):
+            previous = None
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                # 各辺は u < v の向きで一度だけ調べる（隣接はID順なので多重辺は連続する）
+                if v == previous or not u < v:
+                    previous = v
+                    continue
+                previous = v
+                ru, rv = find(u), find(v)
+                if ru == rv:
+                    return False
+                parent[ru] = rv
+        return True
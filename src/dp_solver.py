@@ -0,0 +1,142 @@
+from array import array
+from search_control import SearchInterrupted, graph_upper_bound
+
+# 状態表は 2^V * V 要素になるため、実用的な上限を設ける
+MAX_DP_VERTICES = 20
+
+class HeldKarpLongestPathSolver:
+    """(訪問済み集合, 終端頂点) 上の動的計画法による厳密ソルバー
+
+    Held-Karp と同様に、dp[mask][v] を「mask の頂点をちょうど一度ずつ通り
+    v で終わる単純パスの最大距離」として O(2^V * V^2) で計算する。
+    状態表は array('d') / array('b') の平坦な配列に格納する。
+    """
+
+    def __init__(self, graph, max_vertices=MAX_DP_VERTICES):
+        self.graph = graph
+        self.max_vertices = max_vertices
+        self.best_path = []
+        self.best_distance = 0.0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """計測値の記録先（SearchStats）を設定。到達可能な状態を (頂点数 - 1) の深さとして数える"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """部分集合DPによる最長パス探索"""
+        vertex_ids = self.graph.get_all_vertices()
+        n = len(vertex_ids)
+
+        if n == 0:
+            return [], 0.0
+        if n > self.max_vertices:
+            raise ValueError(
+                f"DPソルバーの対象は頂点数 {self.max_vertices} 以下です (頂点数: {n})")
+
+        index = {vertex: i for i, vertex in enumerate(vertex_ids)}
+        adjacency = self._build_adjacency(vertex_ids, index)
+
+        neg_inf = float('-inf')
+        size = (1 << n) * n
+        dp = array('d', [neg_inf]) * size
+        pred = array('b', [-1]) * size
+
+        # 単一頂点のパス
+        for v in range(n):
+            dp[(1 << v) * n + v] = 0.0
+
+        best_distance = 0.0
+        best_state = None
+        self.is_optimal = True
+        check = self.search_limit.check if self.search_limit is not None else None
+        stats = self.search_stats
+
+        # mask は昇順に処理すれば、遷移先 (mask | bit) は必ず後で処理される。
+        # 打ち切られても、処理済みの mask の値と先行頂点は確定している
+        for mask in range(1, 1 << n):
+            if check is not None:
+                try:
+                    check()
+                except SearchInterrupted:
+                    self.is_optimal = False
+                    break
+
+            base = mask * n
+            remaining = mask
+            if stats is not None:
+                depth = bin(mask).count('1') - 1
+            while remaining:
+                low = remaining & -remaining
+                remaining ^= low
+                v = low.bit_length() - 1
+
+                distance = dp[base + v]
+                if distance == neg_inf:
+                    continue
+
+                if stats is not None:
+                    stats.node(depth)
+                if distance > best_distance:
+                    best_distance = distance
+                    best_state = (mask, v)
+                    if stats is not None:
+                        stats.improve(distance)
+
+                for u, bit, weight in adjacency[v]:
+                    if mask & bit:
+                        continue
+                    state = (mask | bit) * n + u
+                    candidate = distance + weight
+                    if candidate > dp[state]:
+                        dp[state] = candidate
+                        pred[state] = v
+
+        if best_state is None:
+            self.best_path, self.best_distance = [], 0.0
+            self.upper_bound = 0.0 if self.is_optimal else graph_upper_bound(self.graph)
+            return self.best_path, self.best_distance
+
+        path = self._reconstruct(pred, n, *best_state)
+
+        # LongestPathSolver と同じ向き（始点の順位 < 終点の順位）に揃える
+        if path[0] > path[-1]:
+            path.reverse()
+
+        self.best_path = [vertex_ids[i] for i in path]
+        self.best_distance = best_distance
+        self.upper_bound = self.best_distance if self.is_optimal else max(
+            self.best_distance, graph_upper_bound(self.graph))
+        return self.best_path, self.best_distance
+
+    def _build_adjacency(self, vertex_ids, index):
+        """(隣接インデックス, ビット, 重み) の隣接配列を構築（多重辺は最大重みのみ）"""
+        adjacency = []
+        for vertex in vertex_ids:
+            heaviest = {}
+            for neighbor, weight in self.graph.get_neighbors(vertex):
+                j = index[neighbor]
+                if j not in heaviest or weight > heaviest[j]:
+                    heaviest[j] = weight
+            adjacency.append(tuple((j, 1 << j, w) for j, w in sorted(heaviest.items())))
+        return tuple(adjacency)
+
+    def _reconstruct(self, pred, n, mask, v):
+        """先行頂点表を辿ってパスを復元"""
+        path = [v]
+        while True:
+            prev = pred[mask * n + v]
+            if prev < 0:
+                break
+            mask ^= 1 << v
+            v = prev
+            path.append(v)
+        path.reverse()
+        return path
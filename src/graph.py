@@ -1,4 +1,5 @@
 from collections import defaultdict
+from compiled_graph import CompiledGraph
 
 class Graph:
     """無向グラフのデータ構造"""
@@ -14,6 +15,40 @@ class Graph:
         self.vertices.add(u)
         self.vertices.add(v)
 
+    def remove_edge(self, u, v, weight=None):
+        """エッジの削除（多重辺は1本だけ。weight を指定するとその重みの辺）
+
+        削除した辺の重みを返す。辺がなくなった頂点はグラフから取り除く。
+        """
+        index = self._find_edge(u, v, weight)
+        removed = self.edges[u].pop(index)[1]
+        # 相手側の隣接リストからも同じ辺を削除（自己ループは同じリストの2件目）
+        self.edges[v].remove((u, removed))
+        for vertex in (u, v):
+            if not self.edges.get(vertex):
+                self.edges.pop(vertex, None)
+                self.vertices.discard(vertex)
+        return removed
+
+    def set_weight(self, u, v, weight, old_weight=None):
+        """エッジの重みの変更（多重辺は先に追加された1本。old_weight で対象を指定できる）
+
+        変更前の重みを返す。
+        """
+        index = self._find_edge(u, v, old_weight)
+        previous = self.edges[u][index][1]
+        self.edges[u][index] = (v, weight)
+        other = self.edges[v]
+        other[other.index((u, previous))] = (u, weight)
+        return previous
+
+    def _find_edge(self, u, v, weight=None):
+        """u の隣接リストでの u-v 間の辺の位置"""
+        for i, (neighbor, w) in enumerate(self.edges.get(u, ())):
+            if neighbor == v and (weight is None or w == weight):
+                return i
+        raise KeyError((u, v))
+
     def get_neighbors(self, vertex):
         """指定した頂点の隣接頂点とその重みを取得"""
         # 安定した順序のため、頂点IDでソート
@@ -22,4 +57,34 @@ class Graph:
 
     def get_all_vertices(self):
         """全頂点の取得"""
-        return list(self.vertices)
\ No newline at end of file
+        return list(self.vertices)
+
+    def freeze(self):
+        """探索用の変更不可なコンパクト表現（CSR形式）に変換
+
+        以後の add_edge は変換済みの CompiledGraph には反映されない。
+        """
+        return CompiledGraph.from_graph(self)
+
+    def is_forest(self):
+        """自己ループと多重辺を除いた単純グラフが森（閉路を持たない）かを判定"""
+        parent = {}
+
+        def find(x):
+            root = x
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while parent.get(x, x) != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        for u in self.vertices:
+            for v in {n for n, _ in self.edges[u]}:
+                # 各辺は u < v の向きで一度だけ調べる
+                if not u < v:
+                    continue
+                ru, rv = find(u), find(v)
+                if ru == rv:
+                    return False
+                parent[ru] = rv
+        return True
\ No newline at end of file
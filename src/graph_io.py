@@ -0,0 +1,188 @@
+"""
+辺リスト入力の一括読み込み
+
+標準入力またはファイルを大きなチャンク単位で読み、`u, v, w` 形式の行を
+まとめて数値配列（array）へ変換してから、CSR形式のグラフ（CompiledGraph）を
+直接構築する。通常のファイルはメモリマップして一定サイズずつ切り出すため、
+入力全体を文字列や行のリストとして保持しない。
+
+チャンクが数字・区切り文字・空白だけからなり、全行が3つの欄を持つ場合は
+行ごとの処理を行わずに一括変換する。それ以外（不正な行・終了行・空行・
+コメントを含む場合）はそのチャンクだけ従来の正規表現で1行ずつ解析し、
+不正な行には警告を出す。
+"""
+
+import io
+import mmap
+import os
+import re
+import stat
+import sys
+from array import array
+from compiled_graph import CompiledGraph
+
+# 1回に読み込むバイト数
+CHUNK_SIZE = 1 << 20
+
+# この行で入力を終了する（大文字・小文字は区別しない）
+TERMINATORS = ('end', 'quit', 'exit')
+
+LINE_PATTERN = re.compile(r'^\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*$')
+
+_FAST_PATH_BYTES = b'0123456789.,\n \t\r'
+_FIELD_BYTES = b'0123456789.'
+
+def warn_invalid_line(line):
+    """不正な行の警告を標準エラー出力へ表示"""
+    print(f"Warning: Invalid input format: {line}", file=sys.stderr)
+
+def _parse_chunk_fast(chunk):
+    """改行で終わるチャンクを一括変換する（条件を満たさなければ None）"""
+    if chunk.translate(None, _FAST_PATH_BYTES):
+        return None
+
+    # 行内の空白を除いた形で、空行がなく全行のカンマがちょうど2個か、空欄がないかを確認
+    compact = chunk.translate(None, b' \t\r')
+    if compact.startswith(b'\n') or b'\n\n' in compact:
+        return None
+    if compact.translate(None, _FIELD_BYTES).replace(b',,\n', b''):
+        return None
+    if compact.startswith(b',') or b',,' in compact or b'\n,' in compact or b',\n' in compact:
+        return None
+
+    # 欄の中に空白があれば欄の数と語の数が合わない
+    tokens = chunk.replace(b',', b' ').split()
+    if len(tokens) != 3 * compact.count(b'\n'):
+        return None
+
+    try:
+        return (array('q', map(int, tokens[0::3])),
+                array('q', map(int, tokens[1::3])),
+                array('d', map(float, tokens[2::3])))
+    except (ValueError, OverflowError):
+        return None
+
+class EdgeListParser:
+    """バイト列を順に受け取り、辺を配列に蓄積するパーサ
+
+    行の途中で切れたチャンクの末尾は次の feed まで持ち越す。
+    comment を指定するとその文字列で始まる行を読み飛ばす。
+    """
+
+    def __init__(self, comment=None, warn=warn_invalid_line):
+        self.us = array('q')
+        self.vs = array('q')
+        self.ws = array('d')
+        self.comment = comment
+        self.warn = warn
+        self.finished = False  # 終了行を読んだか
+        self._pending = b''
+
+    def feed(self, data):
+        """バイト列を追加して、改行までの完全な行を解析"""
+        if self.finished:
+            return
+        if self._pending:
+            data = self._pending + data
+        cut = data.rfind(b'\n') + 1
+        self._pending = data[cut:]
+        if cut:
+            self._parse_chunk(data[:cut] if cut < len(data) else data)
+
+    def close(self):
+        """改行で終わらない最終行を解析"""
+        if self._pending and not self.finished:
+            self._parse_chunk(self._pending + b'\n')
+        self._pending = b''
+
+    def _parse_chunk(self, chunk):
+        if self.comment is None:
+            parsed = _parse_chunk_fast(chunk)
+            if parsed is not None:
+                us, vs, ws = parsed
+                self.us.extend(us)
+                self.vs.extend(vs)
+                self.ws.extend(ws)
+                return
+        self._parse_lines(chunk)
+
+    def _parse_lines(self, chunk):
+        """正規表現で1行ずつ解析（改行は \\n, \\r\\n, \\r のいずれも受け付ける）"""
+        for line in io.StringIO(chunk.decode('utf-8', errors='replace'), newline=None):
+            line = line.strip()
+            if not line:
+                continue
+            if self.comment is not None and line.startswith(self.comment):
+                continue
+            if line.lower() in TERMINATORS:
+                self.finished = True
+                return
+
+            match = LINE_PATTERN.match(line)
+            if match:
+                try:
+                    ends = array('q', (int(match.group(1)), int(match.group(2))))
+                    weight = float(match.group(3))
+                except (ValueError, OverflowError):
+                    match = None
+            if not match:
+                self.warn(line)
+                continue
+            self.us.append(ends[0])
+            self.vs.append(ends[1])
+            self.ws.append(weight)
+
+def _map_file(stream):
+    """通常のファイルを先頭から読む場合はメモリマップを返す（できなければ None）"""
+    try:
+        fd = stream.fileno()
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+            return None
+        if os.lseek(fd, 0, os.SEEK_CUR) != 0:
+            return None
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def _feed_stream(parser, stream, chunk_size):
+    mapped = _map_file(stream)
+    if mapped is not None:
+        with mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                parser.feed(mapped[offset:offset + chunk_size])
+                if parser.finished:
+                    break
+        return
+
+    # パイプや端末は届いた分だけ読む（対話入力でも終了行ですぐ止まる）
+    binary = getattr(stream, 'buffer', stream)
+    read = getattr(binary, 'read1', binary.read)
+    while not parser.finished:
+        data = read(chunk_size)
+        if not data:
+            break
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        parser.feed(data)
+
+def read_edges(source=None, comment=None, warn=warn_invalid_line, chunk_size=CHUNK_SIZE):
+    """辺の列を (us, vs, ws) の配列として読み込む
+
+    source はファイルパス、ストリーム（バイナリ・テキストのどちらでもよい）、
+    None（標準入力）のいずれか。
+    """
+    parser = EdgeListParser(comment, warn)
+    if source is None:
+        source = sys.stdin
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as f:
+            _feed_stream(parser, f, chunk_size)
+    else:
+        _feed_stream(parser, source, chunk_size)
+    parser.close()
+    return parser.us, parser.vs, parser.ws
+
+def load_graph(source=None, comment=None, warn=warn_invalid_line, chunk_size=CHUNK_SIZE):
+    """辺リストを読み込み、CSR形式のグラフ（CompiledGraph）を構築"""
+    return CompiledGraph.from_edges(*read_edges(source, comment, warn, chunk_size))
@@ -0,0 +1,185 @@
+"""
+厳密探索のウォームスタート用のヒューリスティック
+
+貪欲法（最も重い辺を選んでパスの両端を伸ばす）、乱択貪欲法、
+局所改善（端の延長・頂点の挿入・2-opt・端の付け替え）を制限時間内で繰り返し、
+見つかった最長のパスを返す。結果は分枝限定法の暫定解の初期値に使い、
+その距離に届かない部分木を探索の最初から枝刈りする。
+"""
+
+import random
+import time
+
+# 局所改善で改善とみなす最小の増分（浮動小数点の誤差で往復しないように）
+_MIN_GAIN = 1e-9
+
+# 2-opt の走査で制限時間を確認する間隔（パス上の位置の数）
+_CHECK_INTERVAL = 256
+
+class PathHeuristics:
+    """密なインデックスの隣接 rows（(隣接インデックス, 重み) の列）上のパス改善"""
+
+    def __init__(self, rows, rng=None):
+        self.rng = rng if rng is not None else random.Random(0)
+        # 頂点の組ごとの重み（多重辺は最大、自己ループは除く）
+        self.weights = [{} for _ in rows]
+        for u, row in enumerate(rows):
+            best = self.weights[u]
+            for v, weight in row:
+                if u != v and (v not in best or weight > best[v]):
+                    best[v] = weight
+        # 重い辺から順に試すための隣接の並び
+        self.ordered = [sorted(best, key=best.__getitem__, reverse=True) for best in self.weights]
+
+    def distance(self, path):
+        """パスの距離"""
+        weights = self.weights
+        return sum(weights[u][v] for u, v in zip(path, path[1:]))
+
+    def greedy(self, start, choices=1):
+        """start から両端を伸ばす貪欲法（choices > 1 なら上位候補から乱択）"""
+        path = [start]
+        visited = {start}
+        for _ in range(2):
+            self._extend_tail(path, visited, choices)
+            path.reverse()
+        return path
+
+    def _extend_tail(self, path, visited, choices=1):
+        """末尾を未訪問の頂点へ伸ばせるだけ伸ばす"""
+        ordered = self.ordered
+        while True:
+            candidates = []
+            for v in ordered[path[-1]]:
+                if v not in visited:
+                    candidates.append(v)
+                    if len(candidates) == choices:
+                        break
+            if not candidates:
+                return
+            v = candidates[0] if choices == 1 else self.rng.choice(candidates)
+            path.append(v)
+            visited.add(v)
+
+    def improve(self, path, deadline=None, search_limit=None):
+        """改善できなくなるまで局所改善を繰り返す（path を書き換えて返す）
+
+        deadline（time.perf_counter() の時刻）を過ぎるか search_limit が打ち切りを
+        求めれば、2-opt・端の付け替えの走査の途中でもその時点のパスで終える。
+        """
+        def out_of_time():
+            return (deadline is not None and time.perf_counter() >= deadline) or (
+                search_limit is not None and search_limit.should_stop())
+
+        visited = set(path)
+        while not out_of_time():
+            for _ in range(2):
+                self._extend_tail(path, visited)
+                path.reverse()
+            if not (self._insert_vertex(path, visited) or self._two_opt(path, out_of_time)
+                    or self._rotate_end(path, visited, out_of_time)):
+                break
+        return path
+
+    def _insert_vertex(self, path, visited):
+        """隣り合う2駅の間に未訪問の駅を挟んで距離が伸びれば挿入"""
+        weights = self.weights
+        for i in range(len(path) - 1):
+            a, b = path[i], path[i + 1]
+            direct = weights[a][b]
+            for x, wax in weights[a].items():
+                if x in visited:
+                    continue
+                wxb = weights[x].get(b)
+                if wxb is not None and wax + wxb - direct > _MIN_GAIN:
+                    path.insert(i + 1, x)
+                    visited.add(x)
+                    return True
+        return False
+
+    def _two_opt(self, path, out_of_time=None):
+        """2本の辺 (a, b), (c, d) を (a, c), (b, d) に付け替えて距離が伸びれば区間を反転
+
+        c は a の隣接駅に限られるため、パス上の位置を引いて O(パス長 × 次数) で走査する。
+        """
+        weights = self.weights
+        position = {v: i for i, v in enumerate(path)}
+        last = len(path) - 2
+        for i in range(len(path) - 3):
+            if out_of_time is not None and i % _CHECK_INTERVAL == 0 and out_of_time():
+                return False
+            a, b = path[i], path[i + 1]
+            wab = weights[a][b]
+            wb = weights[b]
+            # 元の走査順（j の昇順）で最初に見つかる改善を選ぶ
+            best_j = None
+            for c, wac in weights[a].items():
+                j = position.get(c)
+                if j is None or j < i + 2 or j > last or (best_j is not None and j >= best_j):
+                    continue
+                d = path[j + 1]
+                wbd = wb.get(d)
+                if wbd is not None and wac + wbd - wab - weights[c][d] > _MIN_GAIN:
+                    best_j = j
+            if best_j is not None:
+                path[i + 1:best_j + 1] = path[best_j:i:-1]
+                return True
+        return False
+
+    def _rotate_end(self, path, visited, out_of_time=None):
+        """末尾を途中の駅へつなぎ直し、新しい端から伸ばして距離が伸びれば採用"""
+        weights = self.weights
+        for _ in range(2):
+            last = path[-1]
+            position = {v: i for i, v in enumerate(path)}
+            # 末尾の隣接駅だけがつなぎ直し先になる（パス上の位置の順に試す）
+            pivots = sorted(i for i in map(position.get, weights[last])
+                            if i is not None and i < len(path) - 2)
+            for i in pivots:
+                if out_of_time is not None and out_of_time():
+                    return False
+                # 辺 (path[i], path[i + 1]) を外して (path[i], last) を加え、新しい端から伸ばす
+                gain = weights[path[i]][last] - weights[path[i]][path[i + 1]]
+                candidate = path[:i + 1] + path[:i:-1]
+                extended = set(visited)
+                self._extend_tail(candidate, extended)
+                gain += self.distance(candidate[len(path) - 1:])
+                if gain > _MIN_GAIN:
+                    path[:] = candidate
+                    visited.update(extended)
+                    return True
+            path.reverse()
+        return False
+
+def warm_start_path(graph, time_budget, search_limit=None, seed=0):
+    """制限時間 time_budget 秒でヒューリスティックに長いパスを求める
+
+    全始点からの貪欲法と局所改善の後、時間の残りで乱択貪欲法を
+    （頂点数の回数まで）繰り返す。(頂点IDのパス, 距離) を返す。
+    """
+    compiled = graph.freeze()
+    if not compiled.vertex_count:
+        return [], 0.0
+    heuristics = PathHeuristics(compiled.neighbor_rows(), random.Random(seed))
+    deadline = time.perf_counter() + time_budget
+
+    def out_of_time():
+        return time.perf_counter() >= deadline or (
+            search_limit is not None and search_limit.should_stop())
+
+    # 重い辺を多く持つ頂点から始める
+    starts = sorted(range(compiled.vertex_count),
+                    key=lambda v: sum(heuristics.weights[v].values()), reverse=True)
+    attempts = [(start, 1) for start in starts]
+    attempts += [(heuristics.rng.choice(starts), 3) for _ in starts]
+
+    best_path, best_distance = [], 0.0
+    for start, choices in attempts:
+        if out_of_time():
+            break
+        path = heuristics.improve(heuristics.greedy(start, choices), deadline, search_limit)
+        distance = heuristics.distance(path)
+        if distance > best_distance:
+            best_path, best_distance = path, distance
+
+    return [compiled.vertex_ids[i] for i in best_path], best_distance
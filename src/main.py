@@ -1,115 +1,197 @@
+import os
 import sys
-import re
 import time
+import signal
 import argparse
-from graph import Graph
-from solver import LongestPathSolver
-from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from graph_io import load_graph
+from snapshot import load_snapshot, load_or_build
+from solver import LongestPathSolver, REACH_INTERVAL
+from bitmask_solver import BitmaskLongestPathSolver
+from dp_solver import HeldKarpLongestPathSolver
+from block_solver import BlockCutTreeSolver
+from tree_solver import TreeDiameterSolver
+from chain_reduction import ChainContractedSolver
+from anneal_solver import AnnealingSolver
+from beam_solver import BeamSearchSolver
+from parallel_solver import (ParallelLongestPathSolver, AdvancedLongestPathSolver,
+                             WARM_START_BUDGET, START_ORDERING, NEIGHBOR_ORDERING,
+                             TRANSPOSITION_MB)
+from ordering import START_ORDERINGS, NEIGHBOR_ORDERINGS
+from search_control import SearchLimit
+from search_stats import SearchStats
+from result_cache import CachedSolver, ResultCache
+from planner import plan_solver
 
-def parse_input():
-    """標準入力からグラフデータを解析"""
-    graph = Graph()
+# 結果が近似解になりうるソルバー
+APPROXIMATE_SOLVERS = (AnnealingSolver, BeamSearchSolver)
 
-    try:
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-
-            # 空行で終了
-            if line.lower() in ['end', 'quit', 'exit']:
-                break
-
-            # 正規表現でパース（ホワイトスペースを考慮）
-            pattern = r'^\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*$'
-            match = re.match(pattern, line)
-
-            if match:
-                u = int(match.group(1))
-                v = int(match.group(2))
-                weight = float(match.group(3))
-                graph.add_edge(u, v, weight)
-            else:
-                print(f"Warning: Invalid input format: {line}", file=sys.stderr)
+def parse_input(source=None, snapshot=None):
+    """標準入力（source を指定した場合はそのファイル）からグラフデータを解析
 
+    大きな入力はチャンク単位で一括変換し、CSR形式のグラフを直接構築する。
+    snapshot を指定すると、元テキストが変わっていない限りバイナリの
+    スナップショットをメモリマップで読み、解析を省く。
+    """
+    try:
+        if snapshot is None:
+            return load_graph(source)
+        if source is None:
+            # 元テキストがなければ鮮度を確かめずにそのまま読む
+            return load_snapshot(snapshot)
+        graph, rebuilt = load_or_build(source, snapshot)
+        action = "作成しました" if rebuilt else "読み込みました"
+        print(f"スナップショットを{action}: {snapshot}", file=sys.stderr)
+        return graph
     except Exception as e:
         print(f"Error reading input: {e}", file=sys.stderr)
         sys.exit(1)
 
-    return graph
-
 def format_output(path):
     """結果を指定フォーマットで出力"""
     for vertex in path:
         print(vertex, end='\r\n')
 
+def report_optimality(solver, distance, approximate=False):
+    """最適性（証明済みか、上界と差）を表示。approximate なら近似解法の結果と明示"""
+    if solver.is_optimal:
+        print("最適性: 証明済み", file=sys.stderr)
+    else:
+        gap = solver.upper_bound - distance
+        kind = "近似解" if approximate else "未証明"
+        print(f"最適性: {kind}（上界: {solver.upper_bound:.3f}, ギャップ: {gap:.3f}）",
+              file=sys.stderr)
+
+def report_cache(solver):
+    """結果キャッシュのヒット・ミスを表示"""
+    if solver.cache_hit:
+        print(f"キャッシュ: ヒット（{solver.cached_solver_name} の結果, キー {solver.cache_key[:12]}）",
+              file=sys.stderr)
+    else:
+        print(f"キャッシュ: ミス（キー {solver.cache_key[:12]}）", file=sys.stderr)
+
+def write_stats(stats, destination, solver, distance, path):
+    """探索の計測値を JSON で書き出す（destination が "-" なら標準エラー出力）"""
+    inner = solver.solver if isinstance(solver, CachedSolver) else solver
+    report = stats.to_json(solver=type(inner).__name__, distance=distance,
+                           path_length=len(path), is_optimal=solver.is_optimal,
+                           upper_bound=solver.upper_bound)
+    if destination == "-":
+        print(report, file=sys.stderr)
+        return
+    try:
+        with open(destination, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    except OSError as e:
+        print(f"Warning: 計測値を書き出せません: {e}", file=sys.stderr)
+
 def progress_callback(message):
     """進捗表示用コールバック"""
     print(f"[進捗] {message}", file=sys.stderr)
 
-def analyze_graph(graph):
-    """グラフの特性を分析"""
-    vertices = graph.get_all_vertices()
-    if not vertices:
-        return "empty"
-
-    n = len(vertices)
-    total_edges = sum(len(graph.get_neighbors(v)) for v in vertices) // 2
-
-    print(f"グラフ分析:", file=sys.stderr)
-    print(f"  頂点数: {n}", file=sys.stderr)
-    print(f"  エッジ数: {total_edges}", file=sys.stderr)
-    print(f"  密度: {total_edges / (n * (n-1) / 2):.3f}" if n > 1 else "  密度: N/A", file=sys.stderr)
-
-    # グラフタイプの判定
-    if total_edges == n * (n - 1) // 2:
-        return "complete"
-    elif total_edges < n * 2:
-        return "sparse"
-    else:
-        return "general"
-
-def select_solver(graph, solver_type="auto", max_workers=None):
-    """グラフの特性に基づいてソルバーを選択"""
+def select_solver(graph, solver_type="auto", max_workers=None,
+                  warm_start_budget=WARM_START_BUDGET, anneal_time=10.0,
+                  anneal_iterations=None, seed=0, restarts=None, beam_width=64,
+                  time_budget=None, start_ordering=START_ORDERING,
+                  neighbor_ordering=NEIGHBOR_ORDERING, reach_interval=REACH_INTERVAL,
+                  transposition_mb=TRANSPOSITION_MB):
+    """ソルバーを選択（auto ならグラフの特徴量と制限時間 time_budget 秒から選ぶ）"""
     if solver_type == "auto":
-        graph_type = analyze_graph(graph)
-        vertices = graph.get_all_vertices()
-
-        if len(vertices) <= 4:
-            solver_type = "original"
-        elif graph_type == "complete" and len(vertices) > 6:
-            solver_type = "advanced"
-        elif len(vertices) > 8:
-            solver_type = "parallel"
-        else:
-            solver_type = "original"
-
-    print(f"選択されたソルバー: {solver_type}", file=sys.stderr)
+        # 制限時間に収まる最速の厳密解法を選び、収まらない場合だけ近似解法にする
+        plan = plan_solver(graph, time_budget, max_workers or os.cpu_count() or 1)
+        print(f"グラフ分析: {plan.features.describe()}", file=sys.stderr)
+        estimates = ", ".join(f"{engine} {seconds:.3g}秒"
+                              for engine, seconds in plan.estimates.items()
+                              if seconds != float('inf'))
+        print(f"  見積もり: {estimates}", file=sys.stderr)
+        print(f"選択されたソルバー: {plan.describe()}", file=sys.stderr)
+        solver_type = plan.engine
+        if plan.approximate:
+            anneal_time = min(anneal_time, time_budget)
+    else:
+        print(f"選択されたソルバー: {solver_type}", file=sys.stderr)
 
     if solver_type == "parallel":
-        solver = ParallelLongestPathSolver(graph, max_workers)
+        solver = ParallelLongestPathSolver(graph, max_workers,
+                                           warm_start_budget=warm_start_budget,
+                                           start_ordering=start_ordering,
+                                           neighbor_ordering=neighbor_ordering,
+                                           transposition_mb=transposition_mb)
+        solver.set_progress_callback(progress_callback)
+        return solver
+    elif solver_type == "anneal":
+        solver = AnnealingSolver(graph, anneal_time, anneal_iterations, seed, restarts,
+                                 max_workers)
         solver.set_progress_callback(progress_callback)
         return solver
+    elif solver_type == "beam":
+        return BeamSearchSolver(graph, beam_width)
     elif solver_type == "advanced":
-        return AdvancedLongestPathSolver(graph)
+        return AdvancedLongestPathSolver(graph, warm_start_budget=warm_start_budget,
+                                         start_ordering=start_ordering,
+                                         neighbor_ordering=neighbor_ordering,
+                                         transposition_mb=transposition_mb)
+    elif solver_type == "bitmask":
+        return BitmaskLongestPathSolver(graph)
+    elif solver_type == "dp":
+        return HeldKarpLongestPathSolver(graph)
+    elif solver_type == "blocks":
+        return BlockCutTreeSolver(graph)
+    elif solver_type == "tree":
+        return TreeDiameterSolver(graph)
     else:
-        return LongestPathSolver(graph)
+        return LongestPathSolver(graph, reach_interval=reach_interval)
 
 def main():
     """メイン処理"""
     parser = argparse.ArgumentParser(description="最長パス問題ソルバー")
-    parser.add_argument("--solver", choices=["auto", "original", "parallel", "advanced"],
+    parser.add_argument("--solver", choices=["auto", "original", "bitmask", "dp", "blocks", "tree", "parallel", "advanced",
+                                             "anneal", "beam"],
                        default="auto", help="使用するソルバー")
     parser.add_argument("--workers", type=int, default=None,
                        help="並列処理のワーカー数")
-    parser.add_argument("--timeout", type=int, default=300,
-                       help="タイムアウト時間（秒）")
+    parser.add_argument("--timeout", type=float, default=300,
+                       help="タイムアウト時間（秒）。0 で無制限。超過時はそれまでの最良解を出力")
+    parser.add_argument("--warm-start", type=float, default=WARM_START_BUDGET, metavar="SEC",
+                       help="分枝限定法の前にヒューリスティックで暫定解を作る制限時間（秒）。0 で行わない")
+    parser.add_argument("--start-order", choices=START_ORDERINGS, default=START_ORDERING,
+                       help="並列分枝限定法（parallel / advanced）で始点を試す順序")
+    parser.add_argument("--neighbor-order", choices=NEIGHBOR_ORDERINGS, default=NEIGHBOR_ORDERING,
+                       help="並列分枝限定法（parallel / advanced）で隣接頂点へ延ばす順序")
+    parser.add_argument("--reach-interval", type=int, default=REACH_INTERVAL, metavar="N",
+                       help="Original Solver で到達可能性による枝刈りを行う深さの間隔。0 で行わない")
+    parser.add_argument("--transposition-mb", type=float, default=TRANSPOSITION_MB, metavar="MB",
+                       help="並列分枝限定法（parallel / advanced）の置換表のメモリ量の上限（MB、"
+                            "ワーカーごと）。0 で使わない")
+    parser.add_argument("--anneal-time", type=float, default=10.0, metavar="SEC",
+                       help="焼きなまし法（--solver anneal）の制限時間（秒）")
+    parser.add_argument("--anneal-iterations", type=int, default=None, metavar="N",
+                       help="焼きなまし法の再出発1回あたりの反復回数の上限（省略時は時間のみ）")
+    parser.add_argument("--seed", type=int, default=0,
+                       help="焼きなまし法の乱数の種（再出発ごとに1ずつずらす）")
+    parser.add_argument("--restarts", type=int, default=None,
+                       help="焼きなまし法の独立な再出発の回数 (デフォルト: ワーカー数)")
+    parser.add_argument("--beam-width", type=int, default=64, metavar="K",
+                       help="ビームサーチ（--solver beam）の幅。大きいほど遅く解の質が高い")
+    parser.add_argument("--contract-chains", action="store_true",
+                       help="次数2の駅の鎖を縮約してから探索")
+    parser.add_argument("--input", metavar="FILE", default=None,
+                       help="辺リストのファイル（省略時は標準入力。ファイルはメモリマップで読む）")
+    parser.add_argument("--snapshot", metavar="FILE", default=None,
+                       help="グラフのバイナリスナップショット。--input と併用すると、"
+                            "なければ（元ファイルが変わっていれば）作り直す")
+    parser.add_argument("--cache-dir", metavar="DIR", default=None,
+                       help="最適解の結果キャッシュのディレクトリ。同じ路線網なら探索を省く")
+    parser.add_argument("--cache-max-mb", type=float, default=64,
+                       help="結果キャッシュの合計サイズの上限（MB）。超えたら古いものから削除")
+    parser.add_argument("--stats", metavar="FILE", nargs="?", const="-", default=None,
+                       help="展開ノード数・理由別の枝刈り数・暫定解の改善履歴・深さごとの展開数を"
+                            "JSONで書き出す（FILE 省略時は標準エラー出力）")
 
     args = parser.parse_args()
 
     # 入力解析
     print("グラフデータを読み込み中...", file=sys.stderr)
-    graph = parse_input()
+    graph = parse_input(args.input, args.snapshot)
 
     # グラフが空の場合の処理
     if not graph.get_all_vertices():
@@ -117,19 +199,79 @@ def main():
         return
 
     # ソルバー選択
-    solver = select_solver(graph, args.solver, args.workers)
+    time_budget = args.timeout if args.timeout > 0 else None
+    chosen = []
+
+    def choose_solver(target):
+        solver = select_solver(target, args.solver, args.workers, args.warm_start,
+                               args.anneal_time, args.anneal_iterations, args.seed,
+                               args.restarts, args.beam_width, time_budget,
+                               args.start_order, args.neighbor_order, args.reach_interval,
+                               args.transposition_mb)
+        chosen.append(solver)
+        return solver
+
+    chain_solver = None
+    if args.contract_chains:
+        # 鎖を縮約したグラフに対してソルバーを選択・実行し、結果を展開する
+        solver = chain_solver = ChainContractedSolver(graph, choose_solver)
+    else:
+        solver = choose_solver(graph)
+
+    if args.cache_dir:
+        # 同じ路線網の最適解がキャッシュにあれば探索を省く
+        try:
+            cache = ResultCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 2**20))
+            solver = CachedSolver(graph, solver, cache)
+        except OSError as e:
+            print(f"Warning: 結果キャッシュを使えません: {e}", file=sys.stderr)
 
     # 最長パス探索（タイムアウト付き）
+    # 制限時間の超過や Ctrl+C では探索を打ち切り、それまでの最良解を出力する
+    search_limit = SearchLimit(args.timeout if args.timeout > 0 else None)
+    solver.set_search_limit(search_limit)
+
+    def handle_interrupt(signum, frame):
+        search_limit.cancel()
+        # 2回目の Ctrl+C では即座に終了する
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, handle_interrupt)
+
+    # 計測は指定された場合だけ行う（未指定ならソルバーは何も記録しない）
+    stats = None
+    if args.stats is not None:
+        stats = SearchStats()
+        solver.set_search_stats(stats)
+
     print("最長パス探索開始...", file=sys.stderr)
     start_time = time.time()
+    search_limit.start()
+    if stats is not None:
+        stats.start()
 
     try:
         longest_path, max_distance = solver.find_longest_path()
+        if stats is not None:
+            stats.finish()
 
         elapsed_time = time.time() - start_time
-        print(f"探索完了: {elapsed_time:.2f}秒", file=sys.stderr)
+        if search_limit.cancelled:
+            print("\n計算が中断されました（それまでの最良解を出力します）", file=sys.stderr)
+        elif not solver.is_optimal and search_limit.stopped:
+            print(f"タイムアウト: {elapsed_time:.2f}秒で探索を打ち切りました", file=sys.stderr)
+        else:
+            print(f"探索完了: {elapsed_time:.2f}秒", file=sys.stderr)
+        if isinstance(solver, CachedSolver):
+            report_cache(solver)
+        if chain_solver is not None and chain_solver.reduction is not None:
+            print(f"鎖縮約: {chain_solver.reduction.contracted_vertices}駅を縮約", file=sys.stderr)
         print(f"最長距離: {max_distance:.3f}", file=sys.stderr)
         print(f"パス長: {len(longest_path)}", file=sys.stderr)
+        report_optimality(solver, max_distance,
+                          any(isinstance(s, APPROXIMATE_SOLVERS) for s in chosen))
+        if stats is not None:
+            write_stats(stats, args.stats, solver, max_distance, longest_path)
 
         # 結果出力
         if longest_path:
@@ -137,8 +279,14 @@ def main():
         else:
             print("No path found", file=sys.stderr)
 
+        if search_limit.cancelled:
+            sys.exit(1)
+
     except KeyboardInterrupt:
         print("\n計算が中断されました", file=sys.stderr)
+        if solver.best_path:
+            print(f"暫定解の距離: {solver.best_distance:.3f}", file=sys.stderr)
+            format_output(solver.best_path)
         sys.exit(1)
     except Exception as e:
         print(f"エラーが発生しました: {e}", file=sys.stderr)
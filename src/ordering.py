@@ -0,0 +1,87 @@
+"""
+探索順序のヒューリスティック（始点の順序・隣接頂点の順序）
+
+分枝限定法では良い暫定解を早く見つけるほど枝刈りが効くため、探索の前に一度だけ
+始点と各頂点の隣接頂点を並べ替えておく。始点の順序は対称性の除去で使う順位も兼ねる
+（最初の始点から見ると他の全頂点が「後の順位」なので、端点になりやすい頂点を先にすると
+最長パスの向きの片方をすぐに見つけられる）。
+
+始点の順序:
+  degree     次数の高い順（部分木が大きいものを先に投入して並列処理の負荷を均す）
+  peripheral 端点になりやすい順（次数が低く、離心数の推定値が大きいもの）
+  index      頂点インデックス順
+
+隣接頂点の順序:
+  weight     辺の重みの大きい順
+  reach      辺の重み + 延長先の頂点から先へ伸ばせる見込み（重い2辺の和の半分）の大きい順
+  index      頂点インデックス順
+
+同順位はいずれも頂点インデックス順（多重辺は元の順）で、結果は決定的。
+"""
+
+from collections import deque
+
+START_ORDERINGS = ("degree", "peripheral", "index")
+NEIGHBOR_ORDERINGS = ("weight", "reach", "index")
+
+def _bfs_hops(rows, source):
+    """source からの辺の本数による距離（到達できない頂点は含まない）"""
+    hops = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v, _ in rows[u]:
+            if v not in hops:
+                hops[v] = hops[u] + 1
+                queue.append(v)
+    return hops
+
+def eccentricity_estimate(rows):
+    """各頂点の離心数（辺の本数）の下界
+
+    連結成分ごとに幅優先探索を3回行う（任意の頂点 → 最遠の頂点 a → a から最遠の頂点 b）。
+    a と b は直径の両端に近い周縁の頂点で、max(a からの距離, b からの距離) は周縁の頂点ほど大きい。
+    """
+    eccentricity = [0] * len(rows)
+    seen = [False] * len(rows)
+    for root in range(len(rows)):
+        if seen[root]:
+            continue
+        first = _bfs_hops(rows, root)
+        a = max(first, key=lambda v: (first[v], -v))
+        from_a = _bfs_hops(rows, a)
+        b = max(from_a, key=lambda v: (from_a[v], -v))
+        from_b = _bfs_hops(rows, b)
+        for v, hops in from_a.items():
+            seen[v] = True
+            eccentricity[v] = max(hops, from_b[v])
+    return eccentricity
+
+def order_starts(rows, strategy="degree"):
+    """始点（頂点インデックス）を strategy の順に並べたリスト
+
+    rows は各頂点の (隣接インデックス, 重み) の列。
+    """
+    if strategy == "degree":
+        return sorted(range(len(rows)), key=lambda v: len(rows[v]), reverse=True)
+    if strategy == "peripheral":
+        eccentricity = eccentricity_estimate(rows)
+        return sorted(range(len(rows)), key=lambda v: (len(rows[v]), -eccentricity[v]))
+    if strategy == "index":
+        return list(range(len(rows)))
+    raise ValueError(f"未知の始点の順序です: {strategy}（{', '.join(START_ORDERINGS)}）")
+
+def order_neighbors(rows, strategy="weight"):
+    """各頂点の (隣接インデックス, 重み) の列を strategy の順に並べ替えたリスト"""
+    if strategy == "weight":
+        return [sorted(row, key=lambda x: x[1], reverse=True) for row in rows]
+    if strategy == "reach":
+        # 延長先 v から先へ伸ばせる見込み: v の重い2辺（負の重みは 0）の和の半分
+        potential = []
+        for row in rows:
+            top = sorted((max(0.0, w) for _, w in row), reverse=True)[:2]
+            potential.append(sum(top) / 2.0)
+        return [sorted(row, key=lambda x: x[1] + potential[x[0]], reverse=True) for row in rows]
+    if strategy == "index":
+        return [list(row) for row in rows]
+    raise ValueError(f"未知の隣接頂点の順序です: {strategy}（{', '.join(NEIGHBOR_ORDERINGS)}）")
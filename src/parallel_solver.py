@@ -1,334 +1,735 @@
+import os
 import sys
 import time
-import threading
+import signal
+import ctypes
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
 from collections import deque
+from bounds import (IncrementalPathBound, inflate, max_spanning_forest_bound,
+                    reachable_mask)
+from block_solver import BlockCutTreeSolver
+from dp_solver import HeldKarpLongestPathSolver
+from heuristics import warm_start_path
+from ordering import order_neighbors, order_starts
+from planner import DP_AUTO_MAX_VERTICES, GraphFeatures, estimate_costs
+from search_control import SearchInterrupted, SearchLimit, graph_upper_bound
+from search_stats import SearchStats
+from symmetry import CanonicalIncumbent, lower_threshold, reverse_sum
+from transposition import TranspositionTable
+
+# 探索前にヒューリスティックで暫定解を作る既定の制限時間（秒）
+WARM_START_BUDGET = 0.05
+
+# 既定の始点の順序・隣接頂点の順序（ordering モジュールの戦略名）
+START_ORDERING = "degree"
+NEIGHBOR_ORDERING = "weight"
+
+# 置換表の既定のメモリ量の上限（MB、ワーカーごと）。上界による枝刈りで劣った到達の
+# 大半は既に打ち切られ、参照の手間が上回るため既定では使わない
+TRANSPOSITION_MB = 0
+
+# ワーカープロセス側で保持する探索カーネル（initializerで一度だけ設定）
+_WORKER_KERNEL = None
+
+def _init_worker(compiled, shared_best, shared_limit=None, start_order=None,
+                 symmetry_breaking=True, collect_stats=False, neighbor_ordering="weight",
+                 transposition_mb=0):
+    """ワーカープロセスの初期化: CSR形式のグラフと共有暫定解を受け取る"""
+    global _WORKER_KERNEL
+    # Ctrl+C は親プロセスが受け取り、共有中断フラグ経由でワーカーへ伝える
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    search_limit = SearchLimit.from_shared(shared_limit) if shared_limit is not None else None
+    _WORKER_KERNEL = _SearchKernel(_kernel_adjacency(compiled, neighbor_ordering),
+                                   shared_best.get_obj(), shared_best.get_lock(),
+                                   search_limit, start_order, symmetry_breaking)
+    if collect_stats:
+        _WORKER_KERNEL.stats = SearchStats()
+    if transposition_mb > 0:
+        _WORKER_KERNEL.table = TranspositionTable.from_megabytes(transposition_mb)
+
+def _search_prefix(prefix):
+    """ワーカープロセスで1つの作業単位（パスの接頭辞）を探索
+
+    結果の末尾に作業単位ごとの計測値と置換表の回数（使わなければ None）を付けて返す。
+    """
+    result = _WORKER_KERNEL.search(prefix)
+    stats = _WORKER_KERNEL.stats
+    if stats is not None:
+        _WORKER_KERNEL.stats = SearchStats()
+    table = _WORKER_KERNEL.table
+    return result + (stats, table.take_counters() if table is not None else None)
+
+def _kernel_adjacency(compiled, neighbor_ordering="weight", rows=None):
+    """CSR形式のグラフから探索カーネル用の (隣接, ビット, 重み) タプルを作成
+
+    隣接頂点は neighbor_ordering の順（既定は重みの大きい順）に並べ、有望な経路を優先探索する。
+    """
+    if rows is None:
+        rows = compiled.neighbor_rows()
+    return tuple(tuple((neighbor, 1 << neighbor, weight) for neighbor, weight in row)
+                 for row in order_neighbors(rows, neighbor_ordering))
+
+class _SearchKernel:
+    """密なインデックスとビットマスクによる部分木探索（ワーカーと逐次処理で共用）
+
+    shared_best は全作業単位で共有する暫定解の距離（ctypes.c_double 互換）。
+    各ノードで読み出して枝刈りに使い、改善時は lock の下で引き上げる。
+    search_limit を渡すと、打ち切り後はそれまでの最良解を返す。
+    stats に SearchStats を設定すると、展開数・共有下界以外の理由の枝刈り・改善履歴を記録する。
+    table に TranspositionTable を設定すると、同じ状態へ短いか同じ距離で再び到達した枝を
+    打ち切る（表は始点が変わるたびに消去する）。
+
+    無向パスを両端から二重に数えないよう、start_order（省略時はインデックス順）で
+    始点より後の順位の頂点で終わるパスだけを採用する。候補の距離は
+    浮動小数点の加算順序による差を避けるため両方の向きの大きい方を使う。
+    """
+
+    def __init__(self, adjacency, shared_best=None, lock=None, search_limit=None,
+                 start_order=None, symmetry_breaking=True):
+        self.adjacency = adjacency
+        self.shared_best = shared_best if shared_best is not None else ctypes.c_double(0.0)
+        self.lock = lock
+        self.search_limit = search_limit
+        self.shared_bound_prunes = 0
+        self.nodes_explored = 0
+        self.stats = None
+        self.table = None
+        self._table_start = None
+        self.bound = IncrementalPathBound(adjacency)
+
+        # later_masks[v] = 始点 v より後の順位の頂点のビット集合
+        full = (1 << len(adjacency)) - 1
+        self.later_masks = [full] * len(adjacency)
+        if symmetry_breaking:
+            later = 0
+            for v in reversed(start_order if start_order is not None else range(len(adjacency))):
+                self.later_masks[v] = later
+                later |= 1 << v
+        self._later = self._full = full
+        self._threshold = 0.0
+        self._weights = []
+
+        self.neighbor_masks = [0] * len(adjacency)
+        for v, neighbors in enumerate(adjacency):
+            for _, bit, _ in neighbors:
+                self.neighbor_masks[v] |= bit
+
+        # 最大全域森の上界用に辺を重み降順に並べておく
+        self.sorted_edges = sorted(
+            ((max(0.0, weight), v, u)
+             for v, neighbors in enumerate(adjacency)
+             for u, _, weight in neighbors if v < u),
+            reverse=True)
+
+    def search(self, prefix):
+        """接頭辞 prefix から始まるパスを全て探索する
+
+        (最良パス, 距離, 共有下界による枝刈り数, 探索ノード数, 打ち切られたか) を返す。
+        """
+        self.shared_bound_prunes = 0
+        self.nodes_explored = 0
+        if self.search_limit is not None and self.search_limit.should_stop():
+            return [], 0.0, 0, 0, True
+        if self.table is not None and prefix[0] != self._table_start:
+            # 終点にできる頂点は始点で決まるため、置換表は同じ始点の作業単位でだけ共有する
+            self.table.clear()
+            self._table_start = prefix[0]
+
+        visited = 0
+        weights = self._weights
+        weights.clear()
+        for i, v in enumerate(prefix):
+            visited |= 1 << v
+            if i > 0:
+                weights.append(self._edge_weight(prefix[i - 1], v))
+        total_distance = 0.0
+        for weight in weights:
+            total_distance += weight
 
-class ParallelLongestPathSolver:
-    """並列処理対応の最長パス問題ソルバー"""
+        path = list(prefix)
+        best_path = []
+        best_distance = [0.0]
+        self._threshold = lower_threshold(0.0)
+        self._later = later = self.later_masks[prefix[0]]
+        if len(path) > 1 and (1 << path[-1]) & later:
+            self._offer(path, total_distance, best_path, best_distance)
+
+        # 終点にできる頂点が未訪問に残っていなければ探索不要
+        stats = self.stats
+        if not later & ~visited:
+            if stats is not None:
+                stats.node(len(path) - 1)
+            return best_path, best_distance[0], 0, 1, False
+
+        current = prefix[-1]
+        self.bound.reset(current, visited)
+
+        # 作業単位の根では、到達可能集合と最大全域森による強い上界で丸ごと枝刈りを試みる
+        upper_bound = total_distance + self._root_bound(current, visited)
+        if upper_bound <= best_distance[0] or upper_bound < self.shared_best.value:
+            shared = upper_bound > best_distance[0]
+            if stats is not None:
+                stats.node(len(path) - 1)
+                if not shared:
+                    stats.prune("root_bound")
+            return best_path, best_distance[0], int(shared), 1, False
+
+        try:
+            self._dfs_optimized(current, visited, path, total_distance,
+                                best_path, best_distance)
+        except SearchInterrupted:
+            return (best_path, best_distance[0], self.shared_bound_prunes,
+                    self.nodes_explored, True)
+        return (best_path, best_distance[0], self.shared_bound_prunes,
+                self.nodes_explored, False)
+
+    def _offer(self, path, distance, best_path, best_distance):
+        """終点が始点より後の順位のパスを候補として暫定解と比較"""
+        reverse = reverse_sum(self._weights)
+        if reverse > distance:
+            distance, path = reverse, path[::-1]
+        if distance > best_distance[0]:
+            best_distance[0] = distance
+            best_path[:] = path
+            self._threshold = lower_threshold(distance)
+            self._raise_shared_best(distance)
+            if self.stats is not None:
+                self.stats.improve(distance)
+
+    def _root_bound(self, current, visited):
+        """到達可能な未訪問頂点に限定した上界（次数ベースと最大全域森の小さい方）"""
+        reached = reachable_mask(self.neighbor_masks, current, visited)
+        if not reached:
+            return 0.0
+        degree_bound = self.bound.reachable_value(self.neighbor_masks, current, visited)
+        forest_bound = inflate(max_spanning_forest_bound(self.sorted_edges, current, reached))
+        return min(degree_bound, forest_bound)
+
+    def _raise_shared_best(self, distance):
+        """共有暫定解を（より良い場合のみ）原子的に引き上げる"""
+        shared_best = self.shared_best
+        if self.lock is None:
+            if distance > shared_best.value:
+                shared_best.value = distance
+            return
+        with self.lock:
+            if distance > shared_best.value:
+                shared_best.value = distance
+
+    def _edge_weight(self, u, v):
+        """u-v 間の辺の重み（多重辺は探索順で先頭のもの）"""
+        for neighbor, _, weight in self.adjacency[u]:
+            if neighbor == v:
+                return weight
+        raise KeyError((u, v))
+
+    def _dfs_optimized(self, current, visited, path, total_distance,
+                       best_path, best_distance):
+        """最適化された深さ優先探索"""
+        shared_best = self.shared_best
+        bound = self.bound
+        later = self._later
+        weights = self._weights
+        stats = self.stats
+        table = self.table
+        if self.search_limit is not None:
+            self.search_limit.check()
+        self.nodes_explored += 1
+        if stats is not None:
+            stats.node(len(path) - 1)
+
+        for neighbor, bit, weight in self.adjacency[current]:
+            if visited & bit:
+                continue
+
+            next_visited = visited | bit
+            next_distance = total_distance + weight
+
+            # 同じ状態（訪問済み集合・現在の頂点）へ以前の作業単位か枝で同じ距離以上で
+            # 到達していれば、その先の延長は既に調べたものより長くならない
+            if table is not None and table.visit((next_visited, neighbor), next_distance,
+                                                 len(path)):
+                continue
+
+            # 枝刈り: 未訪問集合に対する許容的な上界で残りの最大可能距離を見積もる
+            mark = bound.advance(current, neighbor, next_visited)
+            upper_bound = next_distance + bound.value(neighbor, next_visited)
+            if upper_bound <= best_distance[0]:
+                if stats is not None:
+                    stats.prune("bound")
+                bound.retreat(mark)
+                continue
+
+            # 他の作業単位が見つけた暫定解でも枝刈りする。同距離のパスは
+            # 作業単位の順序で決定的に選ぶため、共有値とは厳密に小さい場合のみ
+            if upper_bound < shared_best.value:
+                self.shared_bound_prunes += 1
+                bound.retreat(mark)
+                continue
+
+            path.append(neighbor)
+            weights.append(weight)
+            if bit & later and next_distance >= self._threshold:
+                self._offer(path, next_distance, best_path, best_distance)
+
+            # 終点にできる頂点が未訪問に残っていなければ先へ進まない
+            if later & ~next_visited:
+                self._dfs_optimized(neighbor, next_visited, path, next_distance,
+                                    best_path, best_distance)
+            elif stats is not None and next_visited != self._full:
+                stats.prune("symmetry")
+            weights.pop()
+            path.pop()
+            bound.retreat(mark)
 
-    def __init__(self, graph, max_workers=None):
+class ParallelLongestPathSolver:
+    """並列処理対応の最長パス問題ソルバー
+
+    探索はプロセスプールで行う。グラフはCSR形式のコンパクトな表現として
+    各ワーカーへ一度だけ送り、始点（および深さ split_depth までの接頭辞）を
+    作業単位として配布し、結果を作業単位の順序で統合する。
+    探索の前に warm_start_budget 秒までヒューリスティックで長いパスを求め、
+    共有暫定解の初期値にする（0 なら行わない）。
+    始点と隣接頂点の順序は start_ordering / neighbor_ordering（ordering モジュールの
+    戦略名）で選ぶ。transposition_mb > 0 ならワーカーごとにその MB までの置換表を使い、
+    参照・枝刈り・格納・追い出しの回数を table_lookups / table_hits / table_stores /
+    table_evictions に集計する（ヒット率は table_hit_rate）。
+    """
+
+    def __init__(self, graph, max_workers=None, split_depth=2, symmetry_breaking=True,
+                 warm_start_budget=WARM_START_BUDGET, start_ordering=START_ORDERING,
+                 neighbor_ordering=NEIGHBOR_ORDERING, transposition_mb=TRANSPOSITION_MB):
         self.graph = graph
         self.best_path = []
         self.best_distance = 0.0
-        self.max_workers = max_workers or min(4, 8)  # CPU数ではなく固定値
+        self.shared_bound_prunes = 0
+        self.nodes_explored = 0
+        self.symmetry_breaking = symmetry_breaking
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.split_depth = split_depth
         self.progress_callback = None
-        self.lock = threading.Lock()
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+        self.initial_path = []
+        self.initial_distance = 0.0
+        self.warm_start_budget = warm_start_budget
+        self.warm_start_distance = 0.0
+        self.start_ordering = start_ordering
+        self.neighbor_ordering = neighbor_ordering
+        self.transposition_mb = transposition_mb
+        self.table_lookups = 0
+        self.table_hits = 0
+        self.table_stores = 0
+        self.table_evictions = 0
+        self._incumbent_path = []
+        self._incumbent_distance = 0.0
 
     def set_progress_callback(self, callback):
         """進捗表示用コールバックを設定"""
         self.progress_callback = callback
 
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先（SearchStats）を設定。None なら記録しない
+
+        共有暫定解による枝刈りは "shared_bound" として作業単位の結果から集計する。
+        """
+        self.search_stats = search_stats
+
+    def set_initial_incumbent(self, path, distance):
+        """既知のパス（頂点IDの列）とその距離を暫定解として与える
+
+        共有暫定解の初期値に使い、その距離に届かない部分木を最初から枝刈りする。
+        距離が暫定解以上のパスは従来どおり探索するため出力は変わらない。
+        打ち切られて暫定解を超えられなかった場合はこのパスを返す。
+        """
+        self.initial_path = list(path)
+        self.initial_distance = distance
+
+    def _warm_start(self, compiled):
+        """与えられた暫定解とヒューリスティックの解のうち長い方を探索前の暫定解にする"""
+        self._incumbent_path, self._incumbent_distance = self.initial_path, self.initial_distance
+        self.warm_start_distance = 0.0
+        if self.warm_start_budget <= 0:
+            return
+        path, distance = warm_start_path(compiled, self.warm_start_budget, self.search_limit)
+        self.warm_start_distance = distance
+        if distance > self._incumbent_distance or not self._incumbent_path:
+            self._incumbent_path, self._incumbent_distance = path, distance
+        if self.search_stats is not None and path:
+            self.search_stats.improve(distance)
+        if self.progress_callback:
+            self.progress_callback(f"ヒューリスティックによる暫定解: {distance}")
+
+    def _initial_shared_best(self):
+        """共有暫定解の初期値（加算順序による誤差の分だけ低めにする）"""
+        return lower_threshold(self._incumbent_distance) if self._incumbent_path else 0.0
+
     def find_longest_path(self):
         """並列処理による最長パス探索"""
-        vertices = self.graph.get_all_vertices()
-
-        if not vertices:
+        self.best_path = []
+        self.best_distance = 0.0
+        self.shared_bound_prunes = 0
+        self.nodes_explored = 0
+        self.table_lookups = self.table_hits = self.table_stores = self.table_evictions = 0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+        # ワーカーへはCSR形式のグラフを一度だけ送り、各ワーカーで隣接タプルへ展開する
+        compiled = self.graph.freeze()
+        vertex_ids = compiled.vertex_ids
+        rows = compiled.neighbor_rows()
+        adjacency = _kernel_adjacency(compiled, self.neighbor_ordering, rows)
+
+        if not vertex_ids:
             return [], 0.0
+        self._warm_start(compiled)
+        start_vertices = self._select_start_vertices(rows)
 
-        # 頂点数が少ない場合は逐次処理
-        if len(vertices) <= 4:
-            return self._sequential_search(vertices)
+        # 頂点数が少ない場合やワーカーが1つの場合は逐次処理
+        if len(vertex_ids) <= 4 or self.max_workers <= 1:
+            self._sequential_search(vertex_ids, adjacency, start_vertices)
+            self._finish_bound()
+            return self.best_path, self.best_distance
 
         # 並列処理の準備
-        start_vertices = self._select_start_vertices(vertices)
+        work_items = self._split_work(adjacency, start_vertices)
 
         if self.progress_callback:
-            self.progress_callback(f"探索開始: {len(start_vertices)}個の始点で並列処理")
-
-        # スレッドベースの並列処理
-        threads = []
-        results = []
-
-        # 結果を格納するリスト
-        thread_results = [None] * len(start_vertices)
-
-        def search_worker(vertex, index):
-            """個別のスレッドで実行する探索"""
-            visited = set()
-            path = []
-            best_local_path = []
-            best_local_distance = [0.0]
-
-            self._dfs_optimized(vertex, visited, path, 0.0,
-                               best_local_path, best_local_distance)
-
-            thread_results[index] = (best_local_path, best_local_distance[0])
-
-        # スレッド作成と開始
-        for i, vertex in enumerate(start_vertices):
-            thread = threading.Thread(target=search_worker, args=(vertex, i))
-            threads.append(thread)
-            thread.start()
-
-        # 全スレッドの完了を待機
-        for thread in threads:
-            thread.join()
-
-        # 結果の統合
-        for result in thread_results:
-            if result:
-                path, distance = result
-                if distance > self.best_distance:
-                    self.best_distance = distance
-                    self.best_path = path
-
-        # 並列処理で最適解が見つからない場合は、全探索を実行
-        if len(self.best_path) < len(vertices) and len(vertices) <= 6:
-            exhaustive_path, exhaustive_distance = self._exhaustive_search(vertices)
-            if exhaustive_distance > self.best_distance:
-                self.best_distance = exhaustive_distance
-                self.best_path = exhaustive_path
-
+            self.progress_callback(
+                f"探索開始: {len(start_vertices)}個の始点を{len(work_items)}個の作業単位に分割し、"
+                f"{self.max_workers}プロセスで並列処理")
+
+        chunksize = max(1, len(work_items) // (self.max_workers * 8))
+        report_every = max(1, len(work_items) // 10)
+
+        # 全ワーカーで共有する暫定解の距離と、打ち切り条件（残り時間・中断フラグ）
+        shared_best = multiprocessing.Value('d', self._initial_shared_best())
+        shared_limit = self.search_limit.share() if self.search_limit is not None else None
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(compiled, shared_best, shared_limit,
+                                           start_vertices, self.symmetry_breaking,
+                                           self.search_stats is not None,
+                                           self.neighbor_ordering,
+                                           self.transposition_mb)) as executor:
+            # 結果は作業単位の順序で統合するため、同距離の場合も決定的
+            results = executor.map(_search_prefix, work_items, chunksize=chunksize)
+            for i, (path, distance, prunes, nodes, interrupted,
+                    stats, table_counters) in enumerate(results):
+                self._merge_result(vertex_ids, path, distance)
+                self._count_work_item(prunes, nodes)
+                if stats is not None:
+                    self.search_stats.merge(stats)
+                if table_counters is not None:
+                    self._count_table(table_counters)
+                if interrupted:
+                    self.is_optimal = False
+                if self.progress_callback and (i + 1) % report_every == 0:
+                    self.progress_callback(f"並列処理進捗: {i+1}/{len(work_items)}")
+
+        self._report_shared_bound_prunes()
+        self._finish_bound()
         return self.best_path, self.best_distance
 
-    def _select_start_vertices(self, vertices):
-        """効率的な始点選択"""
-        n = len(vertices)
-
-        # 頂点数が多い場合は、次数の高い頂点を優先
-        if n > 10:
-            degree_vertices = [(v, len(self.graph.get_neighbors(v))) for v in vertices]
-            degree_vertices.sort(key=lambda x: x[1], reverse=True)
-            # 上位50%の頂点を始点として使用
-            top_count = max(1, min(self.max_workers * 2, n // 2))
-            return [v for v, _ in degree_vertices[:top_count]]
-        else:
-            return vertices
-
-    def _dfs_optimized(self, current, visited, path, total_distance,
-                      best_path, best_distance):
-        """最適化された深さ優先探索"""
-        visited.add(current)
-        path.append(current)
-
-        # 現在のパスが最長か確認
-        if total_distance > best_distance[0]:
-            best_distance[0] = total_distance
-            best_path[:] = path.copy()
-
-        # 隣接頂点を効率的に探索
-        neighbors = self.graph.get_neighbors(current)
-
-        # 重みでソートして有望な経路を優先探索
-        neighbors.sort(key=lambda x: x[1], reverse=True)
-
-        for neighbor, weight in neighbors:
-            if neighbor not in visited:
-                # 枝刈り: 残りの最大可能距離を計算
-                remaining_max = self._estimate_remaining_distance(neighbor, visited)
-                if total_distance + weight + remaining_max > best_distance[0]:
-                    self._dfs_optimized(neighbor, visited, path,
-                                      total_distance + weight, best_path, best_distance)
-
-        visited.remove(current)
-        path.pop()
-
-    def _estimate_remaining_distance(self, vertex, visited):
-        """残りの最大可能距離を推定"""
-        neighbors = self.graph.get_neighbors(vertex)
-        unvisited_neighbors = [n for n, _ in neighbors if n not in visited]
-
-        if not unvisited_neighbors:
-            return 0.0
-
-        # 最大重みのエッジを残り頂点数分推定
-        max_weights = sorted([w for _, w in neighbors], reverse=True)
-        return sum(max_weights[:len(unvisited_neighbors)])
-
-    def _sequential_search(self, vertices):
+    def _finish_bound(self):
+        """打ち切られた場合は（探索前の暫定解も含めた）最良解と距離の上界を計算"""
+        if self.is_optimal:
+            self.upper_bound = self.best_distance
+            return
+        if self._incumbent_path and self._incumbent_distance > self.best_distance:
+            self.best_path = list(self._incumbent_path)
+            self.best_distance = self._incumbent_distance
+        self.upper_bound = max(self.best_distance, graph_upper_bound(self.graph))
+
+    def _count_work_item(self, prunes, nodes):
+        """作業単位の探索ノード数と共有暫定解による枝刈り数を集計"""
+        self.shared_bound_prunes += prunes
+        self.nodes_explored += nodes
+        if self.search_stats is not None and prunes:
+            self.search_stats.prune("shared_bound", prunes)
+
+    def _count_table(self, counters):
+        """置換表の (参照, 枝刈り, 格納, 追い出し) の回数を集計"""
+        lookups, hits, stores, evictions = counters
+        self.table_lookups += lookups
+        self.table_hits += hits
+        self.table_stores += stores
+        self.table_evictions += evictions
+        if self.search_stats is not None:
+            self.search_stats.table(lookups, hits, stores, evictions)
+            if hits:
+                self.search_stats.prune("transposition", hits)
+
+    @property
+    def table_hit_rate(self):
+        """置換表の参照のうち枝刈りになった割合（参照していなければ None）"""
+        return self.table_hits / self.table_lookups if self.table_lookups else None
+
+    def _report_shared_bound_prunes(self):
+        """共有暫定解・置換表による枝刈り数を報告"""
+        if self.progress_callback:
+            self.progress_callback(f"共有暫定解による枝刈り: {self.shared_bound_prunes}ノード")
+            if self.table_lookups:
+                self.progress_callback(
+                    f"置換表: 参照 {self.table_lookups}回, ヒット率 {self.table_hit_rate:.1%}, "
+                    f"追い出し {self.table_evictions}回")
+
+    def _select_start_vertices(self, rows):
+        """始点の順序（対称性の除去で使う順位を兼ねる）"""
+        # 全始点を探索しないと最適解を取りこぼすため、間引きはしない
+        return order_starts(rows, self.start_ordering)
+
+    def _split_work(self, adjacency, start_vertices):
+        """始点から深さ split_depth までの接頭辞を作業単位として列挙"""
+        work_items = []
+        frontier = [(v,) for v in start_vertices]
+
+        for _ in range(self.split_depth - 1):
+            next_frontier = []
+            for prefix in frontier:
+                extended = False
+                seen = set()
+                for neighbor, _, _ in adjacency[prefix[-1]]:
+                    # 多重辺で同じ接頭辞が重複しないようにする
+                    if neighbor not in prefix and neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(prefix + (neighbor,))
+                        extended = True
+                if not extended:
+                    # これ以上伸ばせない接頭辞はそのまま作業単位にする
+                    work_items.append(prefix)
+            frontier = next_frontier
+
+        work_items.extend(frontier)
+        return work_items
+
+    def _merge_result(self, vertex_ids, path, distance):
+        """作業単位の結果を統合"""
+        if distance > self.best_distance:
+            self.best_distance = distance
+            self.best_path = [vertex_ids[i] for i in path]
+
+    def _sequential_search(self, vertex_ids, adjacency, start_vertices):
         """逐次処理による探索（小規模グラフ用）"""
-        self.best_path = []
-        self.best_distance = 0.0
-
-        for i, start_vertex in enumerate(vertices):
-            if self.progress_callback and i % max(1, len(vertices) // 10) == 0:
-                self.progress_callback(f"逐次処理進捗: {i+1}/{len(vertices)}")
-
-            visited = set()
-            path = []
-            self._dfs_optimized(start_vertex, visited, path, 0.0,
-                               self.best_path, [self.best_distance])
+        kernel = _SearchKernel(adjacency, shared_best=ctypes.c_double(self._initial_shared_best()),
+                               search_limit=self.search_limit, start_order=start_vertices,
+                               symmetry_breaking=self.symmetry_breaking)
+        kernel.stats = self.search_stats
+        if self.transposition_mb > 0:
+            kernel.table = TranspositionTable.from_megabytes(self.transposition_mb)
+        n = len(vertex_ids)
+
+        for i, start in enumerate(start_vertices):
+            if self.progress_callback and i % max(1, n // 10) == 0:
+                self.progress_callback(f"逐次処理進捗: {i+1}/{n}")
+
+            path, distance, prunes, nodes, interrupted = kernel.search((start,))
+            self._merge_result(vertex_ids, path, distance)
+            self._count_work_item(prunes, nodes)
+            if kernel.table is not None:
+                self._count_table(kernel.table.take_counters())
+            if interrupted:
+                self.is_optimal = False
+                break
 
+        self._report_shared_bound_prunes()
         return self.best_path, self.best_distance
 
 class AdvancedLongestPathSolver:
-    """高度な最適化を適用したソルバー"""
+    """高度な最適化を適用したソルバー
 
-    def __init__(self, graph):
+    一般のグラフの分枝限定法では transposition_mb MB（ワーカーごと、0 なら使わない）までの
+    置換表で同じ状態への劣った到達を打ち切り、参照・枝刈り・格納・追い出しの回数を
+    table_lookups / table_hits / table_stores / table_evictions に引き継ぐ（ヒット率は
+    table_hit_rate）。
+    """
+
+    def __init__(self, graph, symmetry_breaking=True, warm_start_budget=WARM_START_BUDGET,
+                 start_ordering=START_ORDERING, neighbor_ordering=NEIGHBOR_ORDERING,
+                 transposition_mb=TRANSPOSITION_MB):
         self.graph = graph
+        self.symmetry_breaking = symmetry_breaking
+        self.warm_start_budget = warm_start_budget
+        self.start_ordering = start_ordering
+        self.neighbor_ordering = neighbor_ordering
         self.best_path = []
         self.best_distance = 0.0
-        self.memo = {}  # メモ化用
+        self.nodes_explored = 0
+        self.transposition_mb = transposition_mb
+        self.table_lookups = 0
+        self.table_hits = 0
+        self.table_stores = 0
+        self.table_evictions = 0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先（SearchStats）を設定（戦略で使うソルバーへ引き継ぐ）"""
+        self.search_stats = search_stats
 
     def find_longest_path(self):
         """高度な最適化による最長パス探索"""
-        vertices = self.graph.get_all_vertices()
+        # 探索はCSR形式のコンパクト表現上で密なインデックスを使って行う
+        self.compiled = self.graph.freeze()
+        self._index = self.compiled.index
+        self._rows = self.compiled.neighbor_rows()
+        vertices = self.compiled.get_all_vertices()
+        self.nodes_explored = 0
+        self.table_lookups = self.table_hits = self.table_stores = self.table_evictions = 0
+        self.is_optimal = True
+        self.upper_bound = 0.0
 
         if not vertices:
             return [], 0.0
 
         # 小規模グラフの場合は全探索
         if len(vertices) <= 6:
-            return self._exhaustive_search(vertices)
+            path, distance = self._exhaustive_search(vertices)
 
         # グラフの特性に基づいて戦略を選択
-        if self._is_complete_graph(vertices):
-            return self._complete_graph_strategy(vertices)
+        elif self._is_complete_graph(vertices):
+            path, distance = self._complete_graph_strategy(vertices)
         elif self._is_sparse_graph(vertices):
-            return self._sparse_graph_strategy(vertices)
+            path, distance = self._sparse_graph_strategy(vertices)
         else:
-            return self._general_strategy(vertices)
+            path, distance = self._general_strategy(vertices)
+
+        self.best_path, self.best_distance = path, distance
+        self.upper_bound = distance if self.is_optimal else max(
+            distance, graph_upper_bound(self.graph))
+        return path, distance
 
     def _is_complete_graph(self, vertices):
         """完全グラフかどうかを判定"""
         n = len(vertices)
         expected_edges = n * (n - 1) // 2
-        actual_edges = sum(len(self.graph.get_neighbors(v)) for v in vertices) // 2
+        actual_edges = sum(len(self._rows[self._index[v]]) for v in vertices) // 2
         return actual_edges == expected_edges
 
     def _is_sparse_graph(self, vertices):
         """疎グラフかどうかを判定"""
         n = len(vertices)
-        actual_edges = sum(len(self.graph.get_neighbors(v)) for v in vertices) // 2
+        actual_edges = sum(len(self._rows[self._index[v]]) for v in vertices) // 2
         return actual_edges < n * 2
 
     def _complete_graph_strategy(self, vertices):
         """完全グラフ用の戦略"""
-        # 完全グラフでは、最長パスは全頂点を含む可能性が高い
-        # 貪欲法で近似解を求める
-        return self._greedy_longest_path(vertices)
+        # DFSが階乗オーダーで爆発するため部分集合DPで厳密に解き、
+        # 状態表が大きすぎる場合は分枝限定法で探索する
+        if len(vertices) <= DP_AUTO_MAX_VERTICES:
+            return self._run_exact(HeldKarpLongestPathSolver(self.compiled))
+        return self._general_strategy(vertices)
 
     def _sparse_graph_strategy(self, vertices):
         """疎グラフ用の戦略"""
-        # 疎グラフでは、連結成分ごとに探索
-        components = self._find_connected_components(vertices)
-        best_path = []
-        best_distance = 0.0
-
-        for component in components:
-            path, distance = self._search_component(component)
-            if distance > best_distance:
-                best_distance = distance
-                best_path = path
-
-        return best_path, best_distance
+        # 小さなブロックに分かれるならブロック分解で指数部を最大ブロックの大きさまで抑える。
+        # ブロック内の全対探索は上界で枝刈りしないため、格子のように大きなブロックが残る
+        # 場合は実行計画の見積もりに従って分枝限定法に回す
+        estimates = estimate_costs(GraphFeatures(self.compiled), os.cpu_count() or 1)
+        if estimates["blocks"] > estimates["parallel"]:
+            return self._general_strategy(vertices)
+        return self._run_exact(BlockCutTreeSolver(self.compiled))
 
     def _general_strategy(self, vertices):
         """一般的なグラフ用の戦略"""
         # 並列処理と逐次処理を組み合わせ
-        parallel_solver = ParallelLongestPathSolver(self.graph)
-        return parallel_solver.find_longest_path()
-
-    def _greedy_longest_path(self, vertices):
-        """貪欲法による最長パス近似"""
-        if not vertices:
-            return [], 0.0
-
-        best_path = []
-        best_distance = 0.0
-
-        # 各頂点を始点として貪欲探索
-        for start in vertices:
-            path, distance = self._greedy_search_from(start, vertices)
-            if distance > best_distance:
-                best_distance = distance
-                best_path = path
-
-        # 貪欲法の結果が不十分な場合は、全探索を実行
-        if len(best_path) < len(vertices):
-            # 小規模グラフの場合は全探索
-            if len(vertices) <= 6:
-                exhaustive_path, exhaustive_distance = self._exhaustive_search(vertices)
-                if exhaustive_distance > best_distance:
-                    return exhaustive_path, exhaustive_distance
-
-        return best_path, best_distance
-
-    def _greedy_search_from(self, start, all_vertices):
-        """指定頂点からの貪欲探索"""
-        path = [start]
-        visited = {start}
-        total_distance = 0.0
-
-        current = start
-        while len(visited) < len(all_vertices):
-            neighbors = self.graph.get_neighbors(current)
-            best_neighbor = None
-            best_weight = 0.0
-
-            for neighbor, weight in neighbors:
-                if neighbor not in visited and weight > best_weight:
-                    best_neighbor = neighbor
-                    best_weight = weight
-
-            if best_neighbor is None:
-                break
-
-            path.append(best_neighbor)
-            visited.add(best_neighbor)
-            total_distance += best_weight
-            current = best_neighbor
-
-        return path, total_distance
-
-    def _find_connected_components(self, vertices):
-        """連結成分を発見"""
-        visited = set()
-        components = []
-
-        for vertex in vertices:
-            if vertex not in visited:
-                component = []
-                self._dfs_component(vertex, visited, component)
-                components.append(component)
-
-        return components
-
-    def _dfs_component(self, vertex, visited, component):
-        """連結成分を発見するためのDFS"""
-        visited.add(vertex)
-        component.append(vertex)
-
-        for neighbor, _ in self.graph.get_neighbors(vertex):
-            if neighbor not in visited:
-                self._dfs_component(neighbor, visited, component)
-
-    def _search_component(self, component):
-        """連結成分内での最長パス探索"""
-        if len(component) <= 4:
-            # 小規模成分は全探索
-            return self._exhaustive_search(component)
-        else:
-            # 大規模成分は貪欲法
-            return self._greedy_longest_path(component)
+        parallel_solver = ParallelLongestPathSolver(
+            self.compiled, symmetry_breaking=self.symmetry_breaking,
+            warm_start_budget=self.warm_start_budget, start_ordering=self.start_ordering,
+            neighbor_ordering=self.neighbor_ordering, transposition_mb=self.transposition_mb)
+        result = self._run_exact(parallel_solver)
+        self.nodes_explored += parallel_solver.nodes_explored
+        self.table_lookups += parallel_solver.table_lookups
+        self.table_hits += parallel_solver.table_hits
+        self.table_stores += parallel_solver.table_stores
+        self.table_evictions += parallel_solver.table_evictions
+        return result
+
+    @property
+    def table_hit_rate(self):
+        """置換表の参照のうち枝刈りになった割合（参照していなければ None）"""
+        return self.table_hits / self.table_lookups if self.table_lookups else None
+
+    def _run_exact(self, solver):
+        """厳密ソルバーを打ち切り条件付きで実行し、最適性を引き継ぐ"""
+        if self.search_limit is not None:
+            solver.set_search_limit(self.search_limit)
+        if self.search_stats is not None:
+            solver.set_search_stats(self.search_stats)
+        result = solver.find_longest_path()
+        self.is_optimal = solver.is_optimal
+        return result
 
     def _exhaustive_search(self, vertices):
-        """全探索（小規模グラフ用）"""
-        best_path = []
-        best_distance = 0.0
-
-        for start in vertices:
-            visited = set()
-            path = []
-            self._dfs_exhaustive(start, visited, path, 0.0, best_path, [best_distance])
-
-        return best_path, best_distance
-
-    def _dfs_exhaustive(self, current, visited, path, total_distance,
-                       best_path, best_distance):
-        """全探索用DFS"""
-        visited.add(current)
+        """全探索（小規模グラフ用）
+
+        始点は vertices の順に試し、終点の順位が始点より後のパスだけを採用する。
+        """
+        # インデックス -> vertices 内での順位
+        self._rank = [0] * len(self._rows)
+        for position, vertex in enumerate(vertices):
+            self._rank[self._index[vertex]] = position
+        incumbent = CanonicalIncumbent(self.compiled.vertex_ids, self._rank)
+        self._weights = []
+
+        try:
+            for position, start in enumerate(vertices):
+                # 対称性の除去を行わない場合は全頂点を「後の順位」として扱う
+                self._start_rank = position if self.symmetry_breaking else -1
+                self._later_left = len(vertices) - self._start_rank - 1
+                visited = bytearray(len(self._rows))
+                path = []
+                self._dfs_exhaustive(self._index[start], visited, path, 0.0, incumbent)
+        except SearchInterrupted:
+            self.is_optimal = False
+
+        return incumbent.path, incumbent.distance
+
+    def _dfs_exhaustive(self, current, visited, path, total_distance, incumbent):
+        """全探索用DFS（頂点は密なインデックスで扱う）"""
+        if self.search_limit is not None:
+            self.search_limit.check()
+
+        stats = self.search_stats
+        if stats is not None:
+            stats.node(len(path))
+        self.nodes_explored += 1
+        visited[current] = 1
         path.append(current)
-
-        if total_distance > best_distance[0]:
-            best_distance[0] = total_distance
-            best_path[:] = path.copy()
-
-        for neighbor, weight in self.graph.get_neighbors(current):
-            if neighbor not in visited:
-                self._dfs_exhaustive(neighbor, visited, path,
-                                   total_distance + weight, best_path, best_distance)
-
-        visited.remove(current)
+        later = self._rank[current] > self._start_rank
+        if later:
+            self._later_left -= 1
+            if total_distance >= incumbent.threshold:
+                if incumbent.offer(path, self._weights, total_distance) and stats is not None:
+                    stats.improve(incumbent.distance)
+
+        # 終点にできる頂点が未訪問に残っていなければ打ち切る
+        if self._later_left:
+            for neighbor, weight in self._rows[current]:
+                if not visited[neighbor]:
+                    self._weights.append(weight)
+                    self._dfs_exhaustive(neighbor, visited, path,
+                                         total_distance + weight, incumbent)
+                    self._weights.pop()
+        elif stats is not None and len(path) < len(visited):
+            stats.prune("symmetry")
+
+        if later:
+            self._later_left += 1
+        visited[current] = 0
         path.pop()
\ No newline at end of file
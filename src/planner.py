@@ -0,0 +1,174 @@
+"""
+グラフの特徴量に基づくソルバーの選択（実行計画）
+
+連結成分・ブロック（二重連結成分）・最大ブロックの大きさ・次数分布などの
+安価な特徴量を求め、厳密解法ごとの実行時間を見積もる。制限時間に収まる厳密解法のうち
+最も速いものを選び、どれも収まらないときに限り近似解法（焼きなまし法）へ切り替えて、
+結果が近似であることを明示する。
+
+見積もりは始点ごとの単純パスの数を「実効的な分岐数の深さ乗」と「階乗」の小さい方で
+近似したもので、係数は乱択グラフでの計測値。選ばれる解法の見積もりは実測の0.1〜30倍程度、
+上界を使わない全探索（bitmask・blocks）の見積もりは格子や密なグラフで数百倍過大になりうる。
+解法の順位付けにだけ使い、実行時間の予測として扱わないこと。
+"""
+
+import math
+from block_solver import biconnected_components, build_simple_adjacency
+
+# 自動選択でDPソルバーに回す頂点数の上限（状態表は 2^V * V 要素で、メモリが支配的になる）
+DP_AUTO_MAX_VERTICES = 16
+
+# 見積もりの係数（1単位あたりの秒数）
+LINEAR_SECONDS = 2e-6        # 木DP・ブロック分解の頂点と辺1つあたり
+DFS_NODE_SECONDS = 1e-6      # 上界を使わないDFSの1ノード（Bitmask・ブロック内の全対探索）
+BNB_NODE_SECONDS = 1e-5      # 分枝限定法の1ノード（上界の計算を含む）
+BNB_SETUP_SECONDS = 1e-3     # 分枝限定法の準備（ウォームスタートなど）
+DP_STEP_SECONDS = 1e-7       # 部分集合DPの1遷移
+POOL_STARTUP_SECONDS = 0.1   # プロセスプールの起動
+
+# 単純パスは行き止まりで途切れるため、1段あたりの分岐は平均次数 - 1 より少ない
+BRANCHING_FACTOR = 0.8
+
+# 分枝限定法の探索ノード数は、上界と暫定解による枝刈りでおおよそ
+# exp(頂点数 * (BNB_LOG_BASE + BNB_LOG_PER_DEGREE * 平均次数) + 1) になる（乱択グラフでの計測値）
+BNB_LOG_BASE = 0.15
+BNB_LOG_PER_DEGREE = 0.05
+
+# 厳密解法の候補（見積もりが同じなら先のものを選ぶ）
+EXACT_ENGINES = ("tree", "bitmask", "dp", "blocks", "parallel")
+
+def _log_dfs_nodes(n, m):
+    """全始点から上界なしでDFSしたときの探索ノード数の対数の見積もり"""
+    if n <= 1:
+        return 0.0
+    branching = max(1.0, BRANCHING_FACTOR * (2.0 * m / n - 1.0))
+    per_start = min(math.lgamma(n) + 1.0, math.log(n) + (n - 1) * math.log(branching))
+    return math.log(n) + per_start
+
+def _log_bnb_nodes(n, m):
+    """分枝限定法の探索ノード数の対数の見積もり"""
+    mean_degree = 2.0 * m / n if n else 0.0
+    return n * (BNB_LOG_BASE + BNB_LOG_PER_DEGREE * mean_degree) + 1.0
+
+def _log_sum(values):
+    """対数の列 log x_i から log(Σ x_i) を求める"""
+    values = list(values)
+    if not values:
+        return float('-inf')
+    top = max(values)
+    return top + math.log(sum(math.exp(v - top) for v in values))
+
+def _seconds(log_count, per_unit):
+    """log(回数) と1回あたりの秒数から秒数を求める（桁あふれは無限大）"""
+    log_seconds = log_count + math.log(per_unit)
+    return math.exp(log_seconds) if log_seconds < 700 else float('inf')
+
+class GraphFeatures:
+    """ソルバーの選択に使うグラフの特徴量（自己ループを除き、多重辺は1本と数える）"""
+
+    def __init__(self, graph):
+        adjacency = build_simple_adjacency(graph)
+        self.vertex_count = len(adjacency)
+        self.edge_count = sum(len(neighbors) for neighbors in adjacency.values()) // 2
+
+        degrees = sorted(len(neighbors) for neighbors in adjacency.values())
+        self.max_degree = degrees[-1] if degrees else 0
+        self.mean_degree = 2.0 * self.edge_count / self.vertex_count if degrees else 0.0
+        self.median_degree = degrees[len(degrees) // 2] if degrees else 0
+
+        # 連結成分ごとの (頂点数, 辺数)
+        self.components = []
+        seen = set()
+        for root in adjacency:
+            if root in seen:
+                continue
+            seen.add(root)
+            members = [root]
+            for u in members:
+                for v in adjacency[u]:
+                    if v not in seen:
+                        seen.add(v)
+                        members.append(v)
+            edges = sum(len(adjacency[u]) for u in members) // 2
+            self.components.append((len(members), edges))
+
+        # ブロックごとの (頂点数, 辺数)。2つのブロックは高々1頂点しか共有しないため、
+        # 両端がブロック内にある辺はそのブロックに属する
+        blocks = biconnected_components(adjacency)
+        self.blocks = []
+        for block in blocks:
+            members = set(block)
+            edges = sum(1 for u in block for v in adjacency[u] if v in members) // 2
+            self.blocks.append((len(block), edges))
+        self.max_block_size = max((size for size, _ in self.blocks), default=0)
+
+        n = self.vertex_count
+        self.is_forest = self.max_block_size <= 2
+        self.is_complete = n > 1 and self.edge_count == n * (n - 1) // 2
+
+    def describe(self):
+        """表示用の1行の要約"""
+        return (f"頂点数 {self.vertex_count}, 辺数 {self.edge_count}, "
+                f"連結成分 {len(self.components)}, ブロック {len(self.blocks)}"
+                f"（最大 {self.max_block_size} 頂点）, "
+                f"次数 最大 {self.max_degree} / 平均 {self.mean_degree:.2f} / "
+                f"中央値 {self.median_degree}")
+
+def estimate_costs(features, workers=1):
+    """厳密解法ごとの実行時間の見積もり（秒）。使えない解法は無限大"""
+    inf = float('inf')
+    n, m = features.vertex_count, features.edge_count
+    linear = (n + m) * LINEAR_SECONDS
+    log_dfs = _log_sum(_log_dfs_nodes(size, edges) for size, edges in features.components)
+
+    estimates = {}
+    estimates["tree"] = linear if features.is_forest else inf
+    estimates["bitmask"] = _seconds(log_dfs, DFS_NODE_SECONDS)
+    if n <= DP_AUTO_MAX_VERTICES:
+        estimates["dp"] = (1 << n) * (n / 2.0) * (1.0 + features.mean_degree) * DP_STEP_SECONDS
+    else:
+        estimates["dp"] = inf
+    if features.is_forest:
+        # 森なら木DPの方が常に速い
+        estimates["blocks"] = inf
+    else:
+        log_blocks = _log_sum(_log_dfs_nodes(size, edges) for size, edges in features.blocks)
+        estimates["blocks"] = linear + _seconds(log_blocks, DFS_NODE_SECONDS)
+    log_bnb = _log_sum(min(_log_dfs_nodes(size, edges), _log_bnb_nodes(size, edges))
+                       for size, edges in features.components)
+    parallel = BNB_SETUP_SECONDS + _seconds(log_bnb, BNB_NODE_SECONDS) / max(1, workers)
+    if workers > 1 and n > 4:
+        parallel += POOL_STARTUP_SECONDS
+    estimates["parallel"] = parallel
+    return estimates
+
+class SolverPlan:
+    """選んだソルバーと、その根拠（特徴量・見積もり）"""
+
+    def __init__(self, features, estimates, engine, approximate, time_budget):
+        self.features = features
+        self.estimates = estimates
+        self.engine = engine
+        self.approximate = approximate
+        self.time_budget = time_budget
+
+    def describe(self):
+        """表示用の1行の要約"""
+        if not self.approximate:
+            return f"{self.engine}（見積もり {self.estimates[self.engine]:.3g}秒）"
+        fastest = min(self.estimates.values())
+        return (f"{self.engine}（近似: 厳密解法の見積もり {fastest:.3g}秒 が"
+                f"制限時間 {self.time_budget:g}秒 を超えるため）")
+
+def plan_solver(graph, time_budget=None, workers=1):
+    """制限時間 time_budget 秒（None なら無制限）に収まる最速の厳密解法を選ぶ
+
+    どの厳密解法も収まらない場合は焼きなまし法（engine は "anneal"）を選び、
+    approximate を True にする。
+    """
+    features = GraphFeatures(graph)
+    estimates = estimate_costs(features, workers)
+    engine = min(EXACT_ENGINES, key=estimates.__getitem__)
+    if time_budget is not None and estimates[engine] > time_budget:
+        return SolverPlan(features, estimates, "anneal", True, time_budget)
+    return SolverPlan(features, estimates, engine, False, time_budget)
@@ -0,0 +1,168 @@
+"""
+最長パスの結果キャッシュ
+
+グラフの辺の多重集合（端点の組と重み）から入力順によらないハッシュ値を求め、
+それをキーに最適性が証明済みの結果（ソルバー名・パス・距離）をディレクトリへ
+1件1ファイルの JSON として保存する。同じ路線網を再び解くときは探索を省く。
+件数と合計サイズの上限を超えたら、最後に使われた時刻（ファイルの更新時刻）が
+古いものから削除する。
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+# キャッシュの形式を変えたら上げる（ハッシュ値にも含める）
+CACHE_VERSION = 1
+
+_ENTRY_FIELDS = {'solver', 'path', 'distance', 'is_optimal'}
+
+def graph_fingerprint(graph):
+    """辺の向き・順序によらないグラフのハッシュ値（16進文字列）"""
+    compiled = graph.freeze()
+    vertex_ids = compiled.vertex_ids
+    offsets, targets, weights = compiled.offsets, compiled.targets, compiled.weights
+
+    # 各辺を (小さい方のID, 大きい方のID, 重み) で表す（自己ループは2回ずつ現れる）
+    edges = []
+    for i, vertex in enumerate(vertex_ids):
+        start, end = offsets[i], offsets[i + 1]
+        for j, weight in zip(targets[start:end], weights[start:end]):
+            neighbor = vertex_ids[j]
+            if vertex <= neighbor:
+                edges.append((vertex, neighbor, weight))
+    edges.sort()
+
+    digest = hashlib.sha256(f"longest-path-v{CACHE_VERSION}\n".encode())
+    for u, v, weight in edges:
+        digest.update(f"{u},{v},{weight.hex()}\n".encode())
+    return digest.hexdigest()
+
+class ResultCache:
+    """ディレクトリに保存する結果キャッシュ（最終使用時刻による LRU）"""
+
+    def __init__(self, directory, max_entries=1000, max_bytes=64 * 2**20):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def lookup(self, key):
+        """キーに対応する結果の辞書を返す（なければ None）"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            entry = None
+        if (not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION
+                or not _ENTRY_FIELDS <= entry.keys()):
+            # 壊れたエントリ・古い形式のエントリは捨ててミスとして扱う
+            self._remove(path)
+            return None
+
+        # 使用時刻を更新して LRU の順序に反映する
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, solver_name, path, distance, is_optimal=True):
+        """結果を保存し、上限を超えた分を古いものから削除"""
+        entry = {'version': CACHE_VERSION, 'solver': solver_name, 'path': list(path),
+                 'distance': distance, 'is_optimal': is_optimal}
+        target = self._path(key)
+        temporary = f"{target}.tmp{os.getpid()}"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temporary, target)
+        self._evict()
+
+    def _entries(self):
+        """(更新時刻, 大きさ, パス) のリスト"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith('.json'):
+                    try:
+                        info = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((info.st_mtime_ns, info.st_size, item.path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._remove(path)
+            count -= 1
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class CachedSolver:
+    """結果キャッシュを引いてから任意のソルバーを実行するラッパー
+
+    キャッシュにあれば探索を省いてその結果を返す。なければソルバーを実行し、
+    最適性が証明された結果だけを保存する（打ち切り・近似の結果は保存しない）。
+    """
+
+    def __init__(self, graph, solver, cache):
+        self.graph = graph
+        self.solver = solver
+        self.cache = cache
+        self.cache_key = None
+        self.cache_hit = False
+        self.cached_solver_name = None
+        self.best_path = []
+        self.best_distance = 0.0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件を設定（内側のソルバーへ引き継ぐ）"""
+        self.solver.set_search_limit(search_limit)
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先を設定（内側のソルバーへ引き継ぐ。ヒット時は何も記録しない）"""
+        self.solver.set_search_stats(search_stats)
+
+    def find_longest_path(self):
+        """キャッシュを引き、なければ探索して結果を保存"""
+        self.cache_key = graph_fingerprint(self.graph)
+        entry = self.cache.lookup(self.cache_key)
+        self.cache_hit = entry is not None
+        if self.cache_hit:
+            self.cached_solver_name = entry['solver']
+            self.best_path = entry['path']
+            self.best_distance = entry['distance']
+            self.is_optimal = entry['is_optimal']
+            self.upper_bound = self.best_distance
+            return self.best_path, self.best_distance
+
+        path, distance = self.solver.find_longest_path()
+        self.best_path, self.best_distance = path, distance
+        self.is_optimal = self.solver.is_optimal
+        self.upper_bound = self.solver.upper_bound
+        if self.is_optimal:
+            try:
+                self.cache.store(self.cache_key, type(self.solver).__name__, path, distance)
+            except OSError as e:
+                print(f"Warning: 結果をキャッシュに保存できません: {e}", file=sys.stderr)
+        return path, distance
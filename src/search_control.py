@@ -0,0 +1,87 @@
+import time
+import multiprocessing
+
+from bounds import max_spanning_forest_bound
+
+class SearchInterrupted(Exception):
+    """制限時間切れ・中断要求で探索を打ち切ったことを示す（ソルバー内部で使用）"""
+
+class SearchLimit:
+    """探索の打ち切り条件（制限時間と中断要求）
+
+    check() は探索の内側のループから呼ばれるため、時計と中断フラグは
+    check_interval 回に1回だけ確認する。
+    """
+
+    def __init__(self, time_limit=None, check_interval=1024):
+        self.time_limit = time_limit
+        self.check_interval = check_interval
+        self.cancelled = False
+        self.stopped = False
+        self.deadline = None
+        self._countdown = check_interval
+        self._shared_flag = None
+        self.start()
+
+    def start(self):
+        """制限時間の計測を開始（やり直し）"""
+        self.stopped = False
+        self._countdown = self.check_interval
+        if self.time_limit is None:
+            self.deadline = None
+        else:
+            self.deadline = time.monotonic() + self.time_limit
+
+    def cancel(self):
+        """中断を要求（シグナルハンドラから呼んでもよい）"""
+        self.cancelled = True
+        if self._shared_flag is not None:
+            self._shared_flag.value = 1
+
+    def should_stop(self):
+        """打ち切るべきかを直ちに判定"""
+        if self.cancelled or (self._shared_flag is not None and self._shared_flag.value):
+            self.stopped = True
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stopped = True
+        return self.stopped
+
+    def check(self):
+        """一定回数ごとに打ち切り条件を確認し、満たしていれば SearchInterrupted を送出"""
+        self._countdown -= 1
+        if self._countdown > 0:
+            return
+        self._countdown = self.check_interval
+        if self.should_stop():
+            raise SearchInterrupted()
+
+    def remaining(self):
+        """残り時間（秒）。制限がなければ None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def share(self):
+        """ワーカープロセスへ渡す (残り時間, 共有中断フラグ) を返す"""
+        if self._shared_flag is None:
+            self._shared_flag = multiprocessing.Value('b', 1 if self.cancelled else 0, lock=False)
+        return self.remaining(), self._shared_flag
+
+    @classmethod
+    def from_shared(cls, shared, check_interval=1024):
+        """share() の戻り値からワーカー側の打ち切り条件を復元"""
+        remaining, flag = shared
+        limit = cls(remaining, check_interval)
+        limit._shared_flag = flag
+        return limit
+
+def graph_upper_bound(graph):
+    """グラフ全体の最長パス距離の上界（最大全域森の重み）"""
+    vertex_ids = graph.get_all_vertices()
+    index = {vertex: i for i, vertex in enumerate(vertex_ids)}
+    edges = sorted(((max(0.0, weight), index[u], index[v])
+                    for u in vertex_ids for v, weight in graph.get_neighbors(u)
+                    if index[u] < index[v]),
+                   reverse=True)
+    # -1 は全頂点を含むビット集合（頂点数ぶんの大きな整数のシフトを避ける）
+    return max_spanning_forest_bound(edges, 0, -1)
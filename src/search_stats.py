@@ -0,0 +1,125 @@
+"""
+探索の計測（展開ノード数・理由別の枝刈り数・暫定解の改善履歴・深さごとの展開数・置換表の回数）
+
+ソルバーは set_search_stats() で SearchStats を渡された場合だけ記録する。
+渡されていなければ探索の内側のループでの追加処理は None との比較1回だけで済む。
+"""
+
+import json
+import time
+
+class SearchStats:
+    """1回の探索の計測値
+
+    depth_counts[d] は深さ d（始点からの辺の数）で展開したノード数、prunes は
+    理由ごとの枝刈り数、improvements は (時刻, 距離) の暫定解の改善履歴。
+    時刻は time.monotonic() の値で、ワーカープロセスの記録とも比較できる。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """計測値を消去"""
+        self.depth_counts = []
+        self.prunes = {}
+        self.improvements = []
+        self.best_distance = float('-inf')
+        self.table_counts = [0, 0, 0, 0]
+        self.started = None
+        self.finished = None
+
+    def start(self):
+        """計測を開始（それまでの計測値は消去する）"""
+        self.reset()
+        self.started = time.monotonic()
+
+    def finish(self):
+        """計測を終了"""
+        self.finished = time.monotonic()
+
+    def node(self, depth, count=1):
+        """深さ depth のノードを count 個展開したことを記録"""
+        counts = self.depth_counts
+        if depth >= len(counts):
+            counts.extend([0] * (depth + 1 - len(counts)))
+        counts[depth] += count
+
+    def prune(self, reason, count=1):
+        """理由 reason による枝刈りを count 回記録"""
+        self.prunes[reason] = self.prunes.get(reason, 0) + count
+
+    def table(self, lookups, hits, stores, evictions):
+        """置換表の参照・枝刈り・格納・追い出しの回数を加算"""
+        counts = self.table_counts
+        counts[0] += lookups
+        counts[1] += hits
+        counts[2] += stores
+        counts[3] += evictions
+
+    def improve(self, distance, when=None):
+        """暫定解の距離が distance に改善したことを記録（改善でなければ無視）"""
+        if distance > self.best_distance:
+            self.best_distance = distance
+            self.improvements.append((time.monotonic() if when is None else when, distance))
+
+    def merge(self, other):
+        """別の計測値（ワーカープロセスの記録など）を合算"""
+        for depth, count in enumerate(other.depth_counts):
+            if count:
+                self.node(depth, count)
+        for reason, count in other.prunes.items():
+            self.prune(reason, count)
+        self.table(*other.table_counts)
+        # 改善履歴は時刻順に並べ、全体として改善になっているものだけを残す
+        events = sorted(self.improvements + other.improvements)
+        self.improvements = []
+        self.best_distance = float('-inf')
+        for when, distance in events:
+            self.improve(distance, when)
+
+    @property
+    def nodes_expanded(self):
+        """展開したノードの総数"""
+        return sum(self.depth_counts)
+
+    @property
+    def max_depth(self):
+        """展開したノードの最大の深さ（展開していなければ None）"""
+        return len(self.depth_counts) - 1 if self.depth_counts else None
+
+    @property
+    def elapsed(self):
+        """計測時間（秒）。終了していなければ現在まで"""
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def to_dict(self):
+        """JSONに変換できる辞書（改善時刻は計測開始からの秒数。置換表を使わなければ transposition は None）"""
+        elapsed = self.elapsed
+        origin = self.started if self.started is not None else (
+            self.improvements[0][0] if self.improvements else 0.0)
+        lookups, hits, stores, evictions = self.table_counts
+        transposition = None
+        if lookups:
+            transposition = {"lookups": lookups, "hits": hits, "hit_rate": hits / lookups,
+                             "stores": stores, "evictions": evictions}
+        return {
+            "elapsed_seconds": elapsed,
+            "nodes_expanded": self.nodes_expanded,
+            "expansions_per_second": self.nodes_expanded / elapsed if elapsed > 0 else None,
+            "max_depth": self.max_depth,
+            "prunes": dict(sorted(self.prunes.items())),
+            "improvements": [{"seconds": max(0.0, when - origin), "distance": distance}
+                             for when, distance in self.improvements],
+            "depth_histogram": list(self.depth_counts),
+            "transposition": transposition,
+        }
+
+    def to_json(self, **extra):
+        """to_dict() に extra の項目を加えたJSON文字列"""
+        report = self.to_dict()
+        report.update(extra)
+        return json.dumps(report, ensure_ascii=False, indent=2)
@@ -0,0 +1,192 @@
+"""
+辺の変更を受け付けて解き直すセッション
+
+路線の追加・廃止・距離の再測定のたびにグラフ全体を作り直して探索し直さないよう、
+前回の結果を次のように再利用する。
+
+- 最長パスは連結成分ごとの最長パスの最大なので、成分ごとの結果を成分の
+  ハッシュ値（辺の多重集合）をキーに保持し、変わっていない成分は探索しない
+- 辺の削除と重みの減少は最長距離を増やさないため、前回の最長パスが通らない
+  辺への変更なら探索自体を省く（前回のパスは残っており最適のまま）
+- 解き直す成分に前回の最長パスが残っていれば、その距離を暫定解として与える
+
+同距離のパスが複数ある場合、どれを返すかはグラフ全体を一度に解いた場合と
+異なりうる（距離は同じ）。
+"""
+
+from collections import OrderedDict
+from graph import Graph
+from parallel_solver import ParallelLongestPathSolver
+from result_cache import graph_fingerprint
+from tree_solver import TreeDiameterSolver
+
+def default_solver(graph):
+    """成分ごとの既定のソルバー（森は線形時間、それ以外は暫定解を使える分枝限定法）"""
+    if graph.is_forest():
+        return TreeDiameterSolver(graph)
+    return ParallelLongestPathSolver(graph, max_workers=1)
+
+def path_distance(graph, path):
+    """パスの距離（多重辺は重い方を通る）。辺が欠けていれば None"""
+    if len(path) < 2:
+        return None
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        weights = [weight for neighbor, weight in graph.get_neighbors(u) if neighbor == v]
+        if not weights:
+            return None
+        total += max(weights)
+    return total
+
+def _copy_edges(target, vertices, neighbors):
+    """neighbors(u) の隣接から各辺を一度だけ target へ追加（自己ループは隣接に2回ずつ現れる）"""
+    for u in vertices:
+        loops = 0
+        for v, weight in neighbors(u):
+            if u == v:
+                loops += 1
+                if loops % 2 == 0:
+                    continue
+            elif not u < v:
+                continue
+            target.add_edge(u, v, weight)
+
+class SolverSession:
+    """辺の追加・削除・重みの変更を受け付け、前回の結果を再利用して解き直すセッション
+
+    solver_factory は連結成分のグラフからソルバーを作る関数。ソルバーが
+    set_initial_incumbent を持てば、前回の最長パスを暫定解として与える。
+    """
+
+    def __init__(self, graph=None, solver_factory=default_solver, max_cached_components=256):
+        self.graph = Graph()
+        if graph is not None:
+            _copy_edges(self.graph, graph.get_all_vertices(), graph.get_neighbors)
+        self.solver_factory = solver_factory
+        self.max_cached_components = max_cached_components
+        self.search_limit = None
+        self.search_stats = None
+
+        self.best_path = []
+        self.best_distance = 0.0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+        # 直前の solve の内訳
+        self.skipped = False
+        self.components_searched = 0
+        self.components_reused = 0
+
+        self._components = OrderedDict()  # 成分のハッシュ値 -> (パス, 距離)
+        self._needs_search = True
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件を設定（成分ごとのソルバーへ引き継ぐ）"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先を設定（解き直す成分のソルバーへ引き継ぐ）"""
+        self.search_stats = search_stats
+
+    def add_edge(self, u, v, weight):
+        """路線の追加"""
+        self.graph.add_edge(u, v, weight)
+        self._needs_search = True
+
+    def remove_edge(self, u, v, weight=None):
+        """路線の廃止（多重辺は1本だけ）。削除した辺の重みを返す"""
+        removed = self.graph.remove_edge(u, v, weight)
+        if self._on_best_path(u, v):
+            self._needs_search = True
+        return removed
+
+    def set_weight(self, u, v, weight, old_weight=None):
+        """距離の再測定。変更前の重みを返す"""
+        previous = self.graph.set_weight(u, v, weight, old_weight)
+        if weight > previous or self._on_best_path(u, v):
+            self._needs_search = True
+        return previous
+
+    def _on_best_path(self, u, v):
+        """前回の最長パスが u-v 間を通るか"""
+        path = self.best_path
+        return any({a, b} == {u, v} for a, b in zip(path, path[1:]))
+
+    def solve(self):
+        """変更を反映した最長パスを返す"""
+        self.skipped = not self._needs_search
+        if self.skipped:
+            return self.best_path, self.best_distance
+
+        self.components_searched = 0
+        self.components_reused = 0
+        previous_path = self.best_path
+        best_path, best_distance = [], 0.0
+        is_optimal, upper_bound = True, 0.0
+
+        for component in self._split_components():
+            key = graph_fingerprint(component)
+            if key in self._components:
+                self._components.move_to_end(key)
+                path, distance = self._components[key]
+                component_optimal, component_bound = True, distance
+                self.components_reused += 1
+            else:
+                path, distance, component_optimal, component_bound = self._search(
+                    component, previous_path)
+                self.components_searched += 1
+                if component_optimal:
+                    self._remember(key, path, distance)
+
+            if distance > best_distance:
+                best_path, best_distance = path, distance
+            is_optimal = is_optimal and component_optimal
+            upper_bound = max(upper_bound, component_bound)
+
+        self.best_path, self.best_distance = best_path, best_distance
+        self.is_optimal = is_optimal
+        self.upper_bound = max(upper_bound, best_distance)
+        # 打ち切られた結果は次回の削除で省略の根拠にできない
+        self._needs_search = not is_optimal
+        return self.best_path, self.best_distance
+
+    def _search(self, component, previous_path):
+        """成分を探索する（前回の最長パスが残っていれば暫定解として与える）"""
+        solver = self.solver_factory(component)
+        if self.search_limit is not None:
+            solver.set_search_limit(self.search_limit)
+        if self.search_stats is not None:
+            solver.set_search_stats(self.search_stats)
+        if previous_path and previous_path[0] in component.vertices and \
+                hasattr(solver, 'set_initial_incumbent'):
+            seed = path_distance(component, previous_path)
+            if seed is not None:
+                solver.set_initial_incumbent(previous_path, seed)
+        path, distance = solver.find_longest_path()
+        return path, distance, solver.is_optimal, solver.upper_bound
+
+    def _remember(self, key, path, distance):
+        self._components[key] = (path, distance)
+        while len(self._components) > self.max_cached_components:
+            self._components.popitem(last=False)
+
+    def _split_components(self):
+        """連結成分ごとの Graph（頂点の列挙順に最初に現れる成分から）"""
+        edges = self.graph.edges
+        seen = set()
+        components = []
+        for root in self.graph.get_all_vertices():
+            if root in seen:
+                continue
+            seen.add(root)
+            members = [root]
+            for u in members:
+                for v, _ in edges[u]:
+                    if v not in seen:
+                        seen.add(v)
+                        members.append(v)
+
+            component = Graph()
+            _copy_edges(component, members, edges.__getitem__)
+            components.append(component)
+        return components
@@ -4,42 +4,17 @@
 """
 
 import sys
-import re
-from graph import Graph
+from graph_io import load_graph
 from simple_solver import SimpleLongestPathSolver
 
 def parse_input():
     """標準入力からグラフデータを解析"""
-    graph = Graph()
-
     try:
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-
-            # 空行で終了
-            if line.lower() in ['end', 'quit', 'exit']:
-                break
-
-            # 正規表現でパース（ホワイトスペースを考慮）
-            pattern = r'^\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*$'
-            match = re.match(pattern, line)
-
-            if match:
-                u = int(match.group(1))
-                v = int(match.group(2))
-                weight = float(match.group(3))
-                graph.add_edge(u, v, weight)
-            else:
-                print(f"Warning: Invalid input format: {line}", file=sys.stderr)
-
+        return load_graph()
     except Exception as e:
         print(f"Error reading input: {e}", file=sys.stderr)
         sys.exit(1)
 
-    return graph
-
 def format_output(path):
     """結果を指定フォーマットで出力"""
     for vertex in path:
@@ -10,7 +10,10 @@ class SimpleLongestPathSolver:
 
     def __init__(self, graph: Graph):
         self.graph = graph
-        self.vertices = graph.get_all_vertices()
+        # 探索はCSR形式のコンパクト表現上で密なインデックスを使って行う
+        self.compiled = graph.freeze()
+        self.vertices = self.compiled.get_all_vertices()
+        self.rows = self.compiled.neighbor_rows()
 
     def find_longest_path(self):
         """最長パスを探索"""
@@ -20,35 +23,59 @@ class SimpleLongestPathSolver:
         max_distance = 0.0
         longest_path = []
 
+        # 訪問フラグとパスのバッファは全始点で使い回す
+        visited = bytearray(len(self.vertices))
+        path = []
+
         # すべての頂点を始点として探索
-        for start_vertex in self.vertices:
-            path, distance = self._dfs(start_vertex, set(), 0.0, [start_vertex])
+        for start_index in range(len(self.vertices)):
+            best_path, distance = self._dfs(start_index, visited, path)
+            best_path = [self.vertices[i] for i in best_path]
             if distance > max_distance:
                 max_distance = distance
-                longest_path = path.copy()
-            elif distance == max_distance and path:
+                longest_path = best_path
+            elif distance == max_distance and best_path:
                 # 同じ距離の場合、辞書順で最小のパスを選択
-                if not longest_path or path < longest_path:
-                    longest_path = path.copy()
+                if not longest_path or best_path < longest_path:
+                    longest_path = best_path
 
         return longest_path, max_distance
 
-    def _dfs(self, current_vertex, visited, current_distance, current_path):
-        """深さ優先探索"""
-        visited.add(current_vertex)
-        max_distance = current_distance
-        best_path = current_path.copy()
-
-        # 隣接頂点を探索
-        for neighbor, weight in self.graph.get_neighbors(current_vertex):
-            if neighbor not in visited:
-                new_distance = current_distance + weight
-                new_path = current_path + [neighbor]
-
-                path, distance = self._dfs(neighbor, visited, new_distance, new_path)
-                if distance > max_distance:
-                    max_distance = distance
-                    best_path = path
-
-        visited.remove(current_vertex)
-        return best_path, max_distance
\ No newline at end of file
+    def _dfs(self, start, visited, path):
+        """明示的なスタックによる深さ優先探索（頂点は密なインデックスで扱う）
+
+        パスは1本のバッファを伸縮させて表し、最長距離を更新したときだけコピーする。
+        同じ距離のパスは先に見つけたものを残す。
+        """
+        rows = self.rows
+        visited[start] = 1
+        path.append(start)
+        distances = [0.0]
+        stack = [iter(rows[start])]
+
+        max_distance = 0.0
+        best_path = [start]
+
+        while stack:
+            # 未訪問の隣接頂点を1つ進める
+            for neighbor, weight in stack[-1]:
+                if not visited[neighbor]:
+                    break
+            else:
+                # 隣接頂点を調べ尽くしたらバックトラッキング
+                stack.pop()
+                visited[path.pop()] = 0
+                distances.pop()
+                continue
+
+            distance = distances[-1] + weight
+            visited[neighbor] = 1
+            path.append(neighbor)
+            distances.append(distance)
+            stack.append(iter(rows[neighbor]))
+
+            if distance > max_distance:
+                max_distance = distance
+                best_path = path[:]
+
+        return best_path, max_distance
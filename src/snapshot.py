@@ -0,0 +1,133 @@
+"""
+CSR形式グラフのバイナリスナップショット
+
+テキストの辺リストを毎回解析し直さないよう、CompiledGraph の配列を
+そのままの形でファイルに書き出し、読み込み時はメモリマップした領域を
+memoryview として複製せずに参照する。
+
+ファイルの構成（リトルエンディアン、各区画は8バイト境界に揃える）:
+    ヘッダ        マジック, 版, 頂点数 V, 隣接エントリ数 M, 元テキストの SHA-256
+    頂点ID        int64 × V
+    オフセット    int32 × (V + 1)
+    隣接          int32 × M
+    重み          float64 × M
+
+ヘッダの SHA-256 を元テキストのものと比べ、古いスナップショットを検出する。
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from compiled_graph import CompiledGraph, as_array
+from graph_io import CHUNK_SIZE, load_graph
+
+MAGIC = b'LPGRAPH\x00'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIIQQ32s')
+
+class SnapshotError(Exception):
+    """スナップショットとして読めないファイル"""
+
+class StaleSnapshotError(SnapshotError):
+    """元テキストが変わっており、スナップショットが古い"""
+
+def source_checksum(path):
+    """元テキストのファイルの SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(data)
+    return digest.digest()
+
+def _align(size):
+    return (size + 7) & ~7
+
+def _layout(vertex_count, entry_count):
+    """各区画の開始位置とファイル全体の大きさ"""
+    ids = _HEADER.size
+    offsets = ids + 8 * vertex_count
+    targets = _align(offsets + 4 * (vertex_count + 1))
+    weights = _align(targets + 4 * entry_count)
+    return ids, offsets, targets, weights, weights + 8 * entry_count
+
+def _little_endian(values, typecode):
+    if sys.byteorder == 'little':
+        return values
+    values = array(typecode, values)
+    values.byteswap()
+    return values
+
+def save_snapshot(graph, path, checksum=bytes(32)):
+    """グラフ（Graph または CompiledGraph）をスナップショットとして書き出す
+
+    書き込み途中のファイルを読まないよう、一時ファイルに書いてから置き換える。
+    """
+    compiled = graph.freeze()
+    arrays = [array('q', compiled.vertex_ids), as_array(compiled.offsets, 'i'),
+              as_array(compiled.targets, 'i'), as_array(compiled.weights, 'd')]
+    vertex_count, entry_count = len(arrays[0]), len(arrays[2])
+    positions = _layout(vertex_count, entry_count)
+
+    temporary = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, vertex_count, entry_count, checksum))
+            for start, values in zip(positions, arrays):
+                f.write(bytes(start - f.tell()))
+                f.write(_little_endian(values, values.typecode))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def load_snapshot(path, checksum=None):
+    """スナップショットをメモリマップして CompiledGraph として読み込む
+
+    checksum を渡すとヘッダの元テキストの SHA-256 と比べ、異なれば
+    StaleSnapshotError を送出する。配列はメモリマップ上の memoryview で、
+    ビッグエンディアン環境でのみ複製して並べ替える。
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise SnapshotError(f"not a graph snapshot: {path}")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _, vertex_count, entry_count, stored = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError(f"not a graph snapshot: {path}")
+    if checksum is not None and stored != checksum:
+        raise StaleSnapshotError(f"snapshot is out of date: {path}")
+    positions = _layout(vertex_count, entry_count)
+    if positions[-1] != len(buffer):
+        raise SnapshotError(f"truncated graph snapshot: {path}")
+
+    view = memoryview(buffer)
+    vertex_ids, offsets, targets, weights = [
+        _little_endian(view[start:end].cast(typecode), typecode) for start, end, typecode in
+        zip(positions, positions[1:], ('q', 'i', 'i', 'd'))]
+    offsets, targets = offsets[:vertex_count + 1], targets[:entry_count]
+    return CompiledGraph(vertex_ids, offsets, targets, weights)
+
+def load_or_build(source, path):
+    """元テキスト source に対応するスナップショットを読み、なければ作り直す
+
+    スナップショットがない・壊れている・古い場合はテキストを解析して
+    書き出す。(グラフ, 作り直したか) を返す。
+    """
+    checksum = source_checksum(source)
+    try:
+        return load_snapshot(path, checksum), False
+    except (OSError, SnapshotError):
+        pass
+
+    graph = load_graph(source)
+    try:
+        save_snapshot(graph, path, checksum)
+    except (OSError, OverflowError) as e:
+        print(f"Warning: スナップショットを書き込めません: {e}", file=sys.stderr)
+    return graph, True
@@ -1,44 +1,159 @@
 import sys
+from bounds import inflate, reachable_mask
+from search_control import SearchInterrupted, graph_upper_bound
+from symmetry import CanonicalIncumbent
+
+# 到達可能性による枝刈りを行う深さの間隔（0 なら行わない）
+REACH_INTERVAL = 2
 
 class LongestPathSolver:
-    """最長パス問題のソルバー"""
+    """最長パス問題のソルバー
+
+    無向パスは両端のどちらからも列挙されるため、symmetry_breaking が有効な場合は
+    始点より後の順位の頂点で終わるパスだけを採用し、そのような頂点が
+    未訪問に残っていない枝は打ち切る（出力と同距離時の選択は変わらない）。
+
+    reach_interval > 0 なら深さがその倍数の頂点で、現在の頂点から未訪問頂点だけを
+    通って到達できる集合をビットセットの塗りつぶしで求め、その集合の重い辺の和で
+    残り距離を上から抑える。暫定解に届かない枝と、終点にできる頂点に到達できない
+    枝を打ち切る（どちらも暫定解の候補にならない枝なので、出力は変わらない）。
+    """
 
-    def __init__(self, graph):
+    def __init__(self, graph, symmetry_breaking=True, reach_interval=REACH_INTERVAL):
         self.graph = graph
+        self.symmetry_breaking = symmetry_breaking
+        self.reach_interval = reach_interval
         self.best_path = []
         self.best_distance = 0.0
+        self.nodes_explored = 0
+        self.search_limit = None
+        self.search_stats = None
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件（制限時間・中断要求）を設定"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """探索の計測値の記録先（SearchStats）を設定。None なら記録しない"""
+        self.search_stats = search_stats
 
     def find_longest_path(self):
         """全頂点から開始して最長パスを探索"""
         self.best_path = []
         self.best_distance = 0.0
+        self.nodes_explored = 0
+        self.is_optimal = True
 
-        vertices = self.graph.get_all_vertices()
+        # 探索はCSR形式のコンパクト表現上で密なインデックスを使って行う
+        compiled = self.graph.freeze()
+        self._rows = compiled.neighbor_rows()
+        self._incumbent = CanonicalIncumbent(compiled.vertex_ids)
+        self._weights = []
+        if self.reach_interval > 0:
+            self._prepare_reach_bound()
 
-        # 各頂点を始点として探索
-        for start_vertex in vertices:
-            visited = set()
-            path = []
-            self._dfs(start_vertex, visited, path, 0.0)
+        # 各頂点を始点として探索（打ち切られた場合はそれまでの最良解を返す）
+        full = (1 << compiled.vertex_count) - 1
+        try:
+            for start_vertex in range(compiled.vertex_count):
+                # 対称性の除去を行わない場合は全頂点を「後の順位」として扱う
+                self._start = start_vertex if self.symmetry_breaking else -1
+                self._later_left = compiled.vertex_count - self._start - 1
+                self._later_mask = full & ~((1 << (self._start + 1)) - 1)
+                visited = bytearray(compiled.vertex_count)
+                path = []
+                self._dfs(start_vertex, visited, path, 0.0)
+        except SearchInterrupted:
+            self.is_optimal = False
 
+        self.upper_bound = self.best_distance if self.is_optimal else max(
+            self.best_distance, graph_upper_bound(self.graph))
         return self.best_path, self.best_distance
 
     def _dfs(self, current, visited, path, total_distance):
-        """深さ優先探索による最長パス探索"""
+        """深さ優先探索による最長パス探索（頂点は密なインデックスで扱う）"""
+        if self.search_limit is not None:
+            self.search_limit.check()
+
+        stats = self.search_stats
+        if stats is not None:
+            stats.node(len(path))
+
         # 現在の頂点を訪問
-        visited.add(current)
+        self.nodes_explored += 1
+        visited[current] = 1
         path.append(current)
+        later = current > self._start
+        if later:
+            self._later_left -= 1
 
-        # 現在のパスが最長か確認
-        if total_distance > self.best_distance:
-            self.best_distance = total_distance
-            self.best_path = path[:]  # 深いコピー
+            # 現在のパスが最長か確認（終点が始点より後の順位の場合のみ）
+            incumbent = self._incumbent
+            if total_distance >= incumbent.threshold and incumbent.offer(
+                    path, self._weights, total_distance):
+                self.best_distance = incumbent.distance
+                self.best_path = incumbent.path
+                if stats is not None:
+                    stats.improve(incumbent.distance)
 
-        # 隣接頂点を探索
-        for neighbor, weight in self.graph.get_neighbors(current):
-            if neighbor not in visited:
-                self._dfs(neighbor, visited, path, total_distance + weight)
+        # 隣接頂点を探索（頂点ID順）。終点にできる頂点が残っていなければ打ち切る
+        interval = self.reach_interval
+        if self._later_left and interval and (len(path) - 1) % interval == 0 and \
+                self._reach_pruned(current, path, total_distance):
+            if stats is not None:
+                stats.prune("reach")
+        elif self._later_left:
+            weights = self._weights
+            for neighbor, weight in self._rows[current]:
+                if not visited[neighbor]:
+                    weights.append(weight)
+                    self._dfs(neighbor, visited, path, total_distance + weight)
+                    weights.pop()
+        elif stats is not None and len(path) < len(visited):
+            stats.prune("symmetry")
 
         # バックトラッキング
-        visited.remove(current)
-        path.pop()
\ No newline at end of file
+        if later:
+            self._later_left += 1
+        visited[current] = 0
+        path.pop()
+
+    def _prepare_reach_bound(self):
+        """塗りつぶし用の隣接ビット集合と、各頂点の重い辺（負の重みは 0）を求める"""
+        self._neighbor_masks = []
+        self._top1 = []
+        self._top2 = []
+        for row in self._rows:
+            mask = 0
+            for neighbor, _ in row:
+                mask |= 1 << neighbor
+            heaviest = sorted((max(0.0, weight) for _, weight in row), reverse=True)[:2]
+            self._neighbor_masks.append(mask)
+            self._top1.append(heaviest[0] if heaviest else 0.0)
+            self._top2.append(sum(heaviest))
+
+    def _reach_pruned(self, current, path, total_distance):
+        """到達可能な未訪問頂点の集合から見て、この先の枝が候補を生まないか
+
+        延長パス current = x0, x1, ..., xk の距離は、各頂点へ入る辺の和 sum(top1[xi]) と、
+        各頂点に接する2辺の和の半分 (top1[x0] + sum(top2[xi])) / 2 のどちらも超えない。
+        """
+        visited = 0
+        for v in path:
+            visited |= 1 << v
+        reached = reachable_mask(self._neighbor_masks, current, visited)
+        if not reached & self._later_mask:
+            return True
+
+        top1, top2 = self._top1, self._top2
+        sum1 = sum2 = 0.0
+        while reached:
+            low = reached & -reached
+            reached ^= low
+            u = low.bit_length() - 1
+            sum1 += top1[u]
+            sum2 += top2[u]
+        bound = inflate(min(sum1, (top1[current] + sum2) * 0.5))
+        return total_distance + bound < self._incumbent.threshold
\ No newline at end of file
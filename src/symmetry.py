@@ -0,0 +1,65 @@
+"""
+無向パスの向きの正規化（対称性の除去）
+
+無向パスは両端のどちらを始点にしても列挙されるため、探索では
+「始点の順位 < 終点の順位」の向きだけを採用する。ただしパスの距離は
+浮動小数点の加算順序により向きごとにわずかに異なりうるので、最良解に
+届きうる候補に限り逆向きの距離も計算し、両方の向きを列挙した場合と
+同じパスを選ぶ。
+"""
+
+# 逆向きの加算で距離が変わりうる幅（bounds.inflate と同じ余裕）
+_RELATIVE_SLACK = 1e-12
+_ABSOLUTE_SLACK = 1e-9
+
+def reverse_sum(weights):
+    """辺の重みの列を終点側から足し合わせた距離（逆向きに辿った場合の加算順序）"""
+    total = 0.0
+    for weight in reversed(weights):
+        total += weight
+    return total
+
+def lower_threshold(distance):
+    """逆向きの距離が distance に届きうる最小の距離"""
+    return distance - (abs(distance) * _RELATIVE_SLACK + _ABSOLUTE_SLACK)
+
+class CanonicalIncumbent:
+    """向きを正規化した探索での暫定解
+
+    両方の向きを列挙する探索は (始点の順位, 頂点IDの列) の順にパスを調べ、
+    距離が真に大きい場合だけ更新する。ここでは各候補の2つの向きのうち
+    距離の大きい方（同距離なら順位の小さい始点から見た向き）を取り、
+    距離が同じなら上の列挙順で先のものを残すことで同じ結果を得る。
+    探索側は distance >= threshold の候補だけを offer に渡せばよい。
+    """
+
+    def __init__(self, vertex_ids, rank=None):
+        self.vertex_ids = vertex_ids
+        self.rank = rank  # インデックス -> 始点としての順位（None はインデックス順）
+        self.distance = 0.0
+        self.path = []
+        self.threshold = lower_threshold(0.0)
+        self._start_rank = None
+
+    def offer(self, path, weights, distance):
+        """インデックス列 path（始点の順位 < 終点の順位）と辺の重み列の候補を提示"""
+        reverse = reverse_sum(weights)
+        if reverse > distance:
+            distance, start, ordered = reverse, path[-1], path[::-1]
+        else:
+            start, ordered = path[0], path
+        if distance < self.distance:
+            return False
+
+        start_rank = start if self.rank is None else self.rank[start]
+        vertex_ids = self.vertex_ids
+        ids = [vertex_ids[i] for i in ordered]
+        if distance == self.distance and (
+                not self.path or (start_rank, ids) >= (self._start_rank, self.path)):
+            return False
+
+        self.distance = distance
+        self.path = ids
+        self._start_rank = start_rank
+        self.threshold = lower_threshold(distance)
+        return True
@@ -0,0 +1,90 @@
+"""
+探索状態の置換表（訪問済み集合と現在の頂点 → その状態に到達した接頭辞の最長距離）
+
+同じ始点からの探索で、訪問済み集合と現在の頂点が同じ状態から先の延長は同じなので、
+既に到達した接頭辞より短いか同じ距離で再び到達した枝は候補を改善できない。
+表は固定サイズで、溢れた状態は忘れる（枝刈りの機会が減るだけで結果は変わらない）。
+"""
+
+# 1エントリあたりのおおよそのメモリ量（キーのタプル・ビット集合・距離・スロット）
+ENTRY_BYTES = 160
+
+class TranspositionTable:
+    """固定サイズの置換表
+
+    バケット数は 2 の冪で、各バケットは2つのスロットを持つ。1つ目は最も浅い
+    （未訪問頂点が多く、先の部分木が大きい）状態を残す深さ優先のスロット、2つ目は
+    常に置き換えるスロット。clear() は世代番号を進めるだけで、古い世代のエントリは空として扱う。
+    lookups / hits / stores / evictions は参照・枝刈り・格納・追い出しの回数。
+    """
+
+    def __init__(self, max_entries):
+        buckets = 1
+        while buckets * 4 <= max_entries:
+            buckets *= 2
+        self.capacity = buckets * 2
+        self._mask = buckets - 1
+        self._keys = [None] * self.capacity
+        self._distances = [0.0] * self.capacity
+        self._depths = [0] * self.capacity
+        self._generations = [0] * self.capacity
+        self._generation = 1
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_megabytes(cls, megabytes):
+        """おおよそ megabytes MB に収まる置換表"""
+        return cls(int(megabytes * 1024 * 1024) // ENTRY_BYTES)
+
+    def clear(self):
+        """全エントリを無効にする（始点が変わったとき）"""
+        self._generation += 1
+
+    def visit(self, key, distance, depth):
+        """深さ depth の状態 key に距離 distance の接頭辞で到達したことを記録
+
+        同じ状態に distance 以上の接頭辞で到達済みなら True（枝刈りしてよい）を返す。
+        """
+        self.lookups += 1
+        keys = self._keys
+        distances = self._distances
+        generations = self._generations
+        generation = self._generation
+        slot = (hash(key) & self._mask) << 1
+        for s in (slot, slot + 1):
+            if generations[s] == generation and keys[s] == key:
+                if distance <= distances[s]:
+                    self.hits += 1
+                    return True
+                distances[s] = distance
+                return False
+
+        self.stores += 1
+        depths = self._depths
+        replace = slot + 1
+        if generations[slot] != generation or depth <= depths[slot]:
+            # 深さ優先のスロットに入れ、元のエントリは常に置き換えるスロットへ移す
+            if generations[slot] == generation:
+                if generations[replace] == generation:
+                    self.evictions += 1
+                keys[replace] = keys[slot]
+                distances[replace] = distances[slot]
+                depths[replace] = depths[slot]
+                generations[replace] = generation
+            replace = slot
+        elif generations[replace] == generation:
+            self.evictions += 1
+        keys[replace] = key
+        distances[replace] = distance
+        depths[replace] = depth
+        generations[replace] = generation
+        return False
+
+    def take_counters(self):
+        """(参照, 枝刈り, 格納, 追い出し) の回数を返して 0 に戻す"""
+        counters = (self.lookups, self.hits, self.stores, self.evictions)
+        self.lookups = self.hits = self.stores = self.evictions = 0
+        return counters
@@ -0,0 +1,108 @@
+from block_solver import build_simple_adjacency
+
+class TreeDiameterSolver:
+    """木・森に対する線形時間の厳密ソルバー
+
+    木では最長単純パスは重み付き直径に一致するため、各頂点について
+    「子孫側へ下る最長の鎖」を上位2本だけ保持する1回の後順走査DPで
+    O(V + E) で求める。負の重みがあっても正しく動作する。
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.best_path = []
+        self.best_distance = 0.0
+        self.search_limit = None
+        self.search_stats = None
+        # 線形時間で必ず最後まで解くため、常に最適解
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        """探索の打ち切り条件を設定（線形時間のため打ち切りは行わない）"""
+        self.search_limit = search_limit
+
+    def set_search_stats(self, search_stats):
+        """計測値の記録先（SearchStats）を設定。木DPは各頂点を深さ0で1回ずつ展開したと数える"""
+        self.search_stats = search_stats
+
+    def find_longest_path(self):
+        """木DPによる最長パス（直径）探索"""
+        self.best_path = []
+        self.best_distance = 0.0
+
+        if not self.graph.is_forest():
+            raise ValueError("TreeDiameterSolver は木・森のグラフにのみ使用できます")
+
+        vertex_ids = self.graph.get_all_vertices()
+        adjacency = build_simple_adjacency(self.graph)
+
+        # down[v] = (v から子孫側へ下る最長の鎖の距離, その鎖の次の頂点)
+        down = {}
+        best_distance = 0.0
+        best_center = None
+
+        visited = set()
+        for root in vertex_ids:
+            if root in visited:
+                continue
+            for v in self._postorder(root, adjacency, visited):
+                first = second = (0.0, None)
+                for child, weight in adjacency[v].items():
+                    if child not in down:
+                        continue
+                    candidate = (down[child][0] + weight, child)
+                    if candidate[0] > first[0]:
+                        first, second = candidate, first
+                    elif candidate[0] > second[0]:
+                        second = candidate
+                down[v] = first
+                if first[0] + second[0] > best_distance:
+                    best_distance = first[0] + second[0]
+                    best_center = (v, first[1], second[1])
+                    if self.search_stats is not None:
+                        self.search_stats.improve(best_distance)
+
+        if self.search_stats is not None:
+            self.search_stats.node(0, len(vertex_ids))
+
+        if best_center is None:
+            return self.best_path, self.best_distance
+
+        center, first_child, second_child = best_center
+        head = self._follow(center, first_child, down)
+        tail = self._follow(center, second_child, down)
+        path = head[::-1] + tail[1:]
+
+        # 他の厳密ソルバーと同じ向き（始点の順位 < 終点の順位）に揃える
+        rank = {vertex: i for i, vertex in enumerate(vertex_ids)}
+        if rank[path[0]] > rank[path[-1]]:
+            path.reverse()
+
+        self.best_path = path
+        self.best_distance = sum(adjacency[u][v] for u, v in zip(path, path[1:]))
+        self.upper_bound = self.best_distance
+        return self.best_path, self.best_distance
+
+    def _postorder(self, root, adjacency, visited):
+        """root を根とする木の頂点を後順（子が先）で列挙（再帰を使わない）"""
+        order = []
+        visited.add(root)
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            order.append(v)
+            for child in adjacency[v]:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+        order.reverse()
+        return order
+
+    def _follow(self, start, child, down):
+        """start から child 方向へ最長の鎖を辿る"""
+        path = [start]
+        while child is not None:
+            path.append(child)
+            child = down[child][1]
+        return path
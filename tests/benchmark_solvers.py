@@ -5,119 +5,497 @@
 
 import sys
 import os
+import json
 import time
+import argparse
+import random
+import tracemalloc
 import subprocess
+import tempfile
 from pathlib import Path
 
 # プロジェクトルートを追加
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from graph import Graph
+from graph_io import load_graph, read_edges, LINE_PATTERN
+from snapshot import load_snapshot, save_snapshot
+from session import SolverSession
 from solver import LongestPathSolver
+from simple_solver import SimpleLongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
 from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from heuristics import PathHeuristics
+from ordering import START_ORDERINGS, NEIGHBOR_ORDERINGS
+from anneal_solver import AnnealingSolver
+from beam_solver import BeamSearchSolver
+from block_solver import BlockCutTreeSolver
+from chain_reduction import ChainContractedSolver
+from dp_solver import HeldKarpLongestPathSolver
+from tree_solver import TreeDiameterSolver
+from planner import plan_solver
+from benchmark_suite import (SUITES, gnp_graph, grid_graph, chain_heavy_graph, run_suite,
+                             compare_results, format_regression)
 
 def load_graph_from_file(file_path):
-    """ファイルからグラフを読み込み"""
+    """ファイルからグラフを読み込み（'#' で始まる行はコメント）"""
     graph = Graph()
+    for u, v, weight in zip(*read_edges(file_path, comment='#')):
+        graph.add_edge(u, v, weight)
+    return graph
 
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
+def generate_dense_graph(n, density=0.8, seed=0):
+    """スケーリング測定用の密なランダムグラフを生成"""
+    return gnp_graph(n, density, seed)
 
-            # カンマ区切りの形式を解析
-            parts = [p.strip() for p in line.split(',')]
-            if len(parts) == 3:
-                u = int(parts[0])
-                v = int(parts[1])
-                weight = float(parts[2])
-                graph.add_edge(u, v, weight)
+def benchmark_parallel_scaling():
+    """並列ソルバーのワーカー数に対するスケーリングを測定"""
+    print(f"\n{'='*60}")
+    print("並列ソルバー スケーリング測定")
+    print(f"{'='*60}")
 
-    return graph
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpu_count})
+
+    cases = [("performance_killer.txt",
+              load_graph_from_file("tests/sample_inputs/performance_killer.txt")),
+             ("dense_random_n12", generate_dense_graph(12))]
+
+    for name, graph in cases:
+        print(f"\n{name} (CPU数: {cpu_count})")
+        baseline = None
+        for workers in worker_counts:
+            solver = ParallelLongestPathSolver(graph, max_workers=workers)
+            start_time = time.perf_counter()
+            _, distance = solver.find_longest_path()
+            elapsed_time = time.perf_counter() - start_time
+            if baseline is None:
+                baseline = elapsed_time
+            print(f"  ワーカー数 {workers:2d}: {elapsed_time:.3f}秒, "
+                  f"速度向上 x{baseline / elapsed_time:.2f}, 距離={distance:.3f}")
+
+def benchmark_chain_contraction():
+    """鎖縮約の有無による性能比較（鎖の多い合成路線網）"""
+    print(f"\n{'='*60}")
+    print("鎖縮約ベンチマーク（ブロック分解ソルバー）")
+    print(f"{'='*60}")
 
-def benchmark_solver(solver, graph, name):
-    """ソルバーの性能を測定"""
-    print(f"\n=== {name} ===")
+    # (分岐駅数, 鎖の本数, 鎖の最大長, 縮約なしでも測定するか)
+    cases = [(8, 12, 10, True), (8, 12, 20, True), (10, 16, 250, False), (10, 16, 500, False)]
+
+    for hubs, chains, max_length, compare in cases:
+        graph = chain_heavy_graph(hubs, chains, max_length, seed=hubs + max_length)
+        n = len(graph.get_all_vertices())
+
+        solver = ChainContractedSolver(graph, BlockCutTreeSolver)
+        start_time = time.perf_counter()
+        _, distance = solver.find_longest_path()
+        contracted_time = time.perf_counter() - start_time
+        reduced = len(solver.reduction.graph.get_all_vertices())
+
+        print(f"\n駅数 {n} → 縮約後 {reduced}")
+        print(f"  縮約あり: {contracted_time:.3f}秒, 距離={distance:.3f}")
+
+        if compare:
+            start_time = time.perf_counter()
+            _, full_distance = BlockCutTreeSolver(graph).find_longest_path()
+            full_time = time.perf_counter() - start_time
+            print(f"  縮約なし: {full_time:.3f}秒, 距離={full_distance:.3f} "
+                  f"(x{full_time / contracted_time:.1f})")
+        else:
+            print("  縮約なし: ブロックが数千駅になり現実的な時間で終わらないため省略")
+
+def _count_expansions(get_neighbors, vertices):
+    """全始点からの素朴なDFSを行い、展開したノード数を返す"""
+    expansions = 0
+
+    def dfs(current, visited):
+        nonlocal expansions
+        expansions += 1
+        visited.add(current)
+        for neighbor, _ in get_neighbors(current):
+            if neighbor not in visited:
+                dfs(neighbor, visited)
+        visited.remove(current)
+
+    for start in vertices:
+        dfs(start, set())
+    return expansions
+
+def benchmark_compiled_graph():
+    """Graph と CSR形式の CompiledGraph のメモリ量とDFS展開時間を比較"""
+    print(f"\n{'='*60}")
+    print("CSR形式グラフ ベンチマーク")
+    print(f"{'='*60}")
 
-    start_time = time.time()
-    try:
-        path, distance = solver.find_longest_path()
-        elapsed_time = time.time() - start_time
+    # 辺1本あたりのメモリ量（構築時に確保されたバイト数）
+    n = 400
+    tracemalloc.start()
+    graph = generate_dense_graph(n, density=0.5)
+    graph_bytes = tracemalloc.get_traced_memory()[0]
+    compiled = graph.freeze()
+    compiled_bytes = tracemalloc.get_traced_memory()[0] - graph_bytes
+    tracemalloc.stop()
+    edges = compiled.edge_count
+    print(f"\n辺1本あたりのメモリ（頂点数 {n}, 辺数 {edges}）")
+    print(f"  Graph:         {graph_bytes / edges:.1f} バイト")
+    print(f"  CompiledGraph: {compiled_bytes / edges:.1f} バイト")
+
+    # DFSの1展開あたりの時間
+    cases = [("performance_killer.txt",
+              load_graph_from_file("tests/sample_inputs/performance_killer.txt")),
+             ("dense_random_n9", generate_dense_graph(9))]
+    for name, graph in cases:
+        compiled = graph.freeze()
+        rows = compiled.neighbor_rows()
+        print(f"\n{name}")
+        for label, get_neighbors, vertices in [
+                ("Graph.get_neighbors", graph.get_neighbors, graph.get_all_vertices()),
+                ("CompiledGraph (CSR)", rows.__getitem__, range(compiled.vertex_count))]:
+            start_time = time.perf_counter()
+            expansions = _count_expansions(get_neighbors, vertices)
+            elapsed_time = time.perf_counter() - start_time
+            print(f"  {label}: {elapsed_time / expansions * 1e6:.2f}マイクロ秒/展開 "
+                  f"({expansions}展開)")
+
+class _RecursiveSimpleSolver(SimpleLongestPathSolver):
+    """比較用: 各ノードでパスのリストを作り直す従来の再帰版"""
+
+    def _dfs(self, start, visited, path):
+        return self._dfs_recursive(start, visited, 0.0, [start])
+
+    def _dfs_recursive(self, current_vertex, visited, current_distance, current_path):
+        visited[current_vertex] = 1
+        max_distance = current_distance
+        best_path = current_path.copy()
+
+        for neighbor, weight in self.rows[current_vertex]:
+            if not visited[neighbor]:
+                new_distance = current_distance + weight
+                new_path = current_path + [neighbor]
+
+                path, distance = self._dfs_recursive(neighbor, visited, new_distance, new_path)
+                if distance > max_distance:
+                    max_distance = distance
+                    best_path = path
+
+        visited[current_vertex] = 0
+        return best_path, max_distance
+
+def benchmark_simple_solver_allocations():
+    """Simple Solver の再帰版と明示的スタック版のメモリ確保量を比較"""
+    print(f"\n{'='*60}")
+    print("Simple Solver メモリ確保ベンチマーク")
+    print(f"{'='*60}")
 
-        print(f"実行時間: {elapsed_time:.3f}秒")
-        print(f"最長距離: {distance:.3f}")
-        print(f"パス長: {len(path)}")
-        print(f"パス: {path}")
+    line = Graph()
+    for v in range(1, 400):
+        line.add_edge(v, v + 1, 1.0)
+    cases = [("line_400", line),
+             ("performance_killer.txt",
+              load_graph_from_file("tests/sample_inputs/performance_killer.txt"))]
+
+    for name, graph in cases:
+        print(f"\n{name}")
+        for label, solver_class in [("再帰版", _RecursiveSimpleSolver),
+                                    ("明示的スタック版", SimpleLongestPathSolver)]:
+            solver = solver_class(graph)
+            tracemalloc.start()
+            start_time = time.perf_counter()
+            _, distance = solver.find_longest_path()
+            elapsed_time = time.perf_counter() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {label}: ピークメモリ {peak / 1024:.1f}KiB, "
+                  f"{elapsed_time:.3f}秒（計測込み）, 距離={distance:.3f}")
+
+def _load_graph_line_by_line(file_path):
+    """比較用: 1行ずつ正規表現で解析して Graph を作り、CSR形式へ変換する従来の読み込み"""
+    graph = Graph()
+    with open(file_path) as f:
+        for line in f:
+            match = LINE_PATTERN.match(line.strip())
+            if match:
+                graph.add_edge(int(match.group(1)), int(match.group(2)), float(match.group(3)))
+    return graph.freeze()
 
-        return elapsed_time, distance, len(path)
+def benchmark_bulk_loader(edges=200000, seed=0):
+    """辺リストの読み込み（解析のみ・グラフ構築込み・スナップショット）の時間とピークメモリを比較"""
+    print(f"\n{'='*60}")
+    print("辺リスト一括読み込みベンチマーク")
+    print(f"{'='*60}")
 
-    except Exception as e:
-        print(f"エラー: {e}")
-        return None, None, None
+    rng = random.Random(seed)
+    vertices = max(edges // 5, 2)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        for _ in range(edges):
+            f.write(f"{rng.randint(1, vertices)}, {rng.randint(1, vertices)}, "
+                    f"{rng.uniform(0.0, 100.0):.3f}\n")
+        file_path = f.name
+    snapshot_path = file_path + '.snap'
 
-def run_benchmarks():
-    """全テストケースでベンチマーク実行"""
-    test_files = [
-        "tests/sample_inputs/example1.txt",
-        "tests/sample_inputs/simple_line.txt",
-        "tests/sample_inputs/difficult_case1.txt",
-        "tests/sample_inputs/performance_killer.txt",
-        "tests/sample_inputs/large_graph.txt"
+    try:
+        print(f"\n辺数 {edges}, ファイルサイズ {os.path.getsize(file_path) / 2**20:.1f}MiB")
+        save_snapshot(load_graph(file_path), snapshot_path)
+        for label, load, path in [("1行ずつ（Graph 経由）", _load_graph_line_by_line, file_path),
+                                  ("一括（解析のみ）", read_edges, file_path),
+                                  ("一括（CSR構築込み）", load_graph, file_path),
+                                  ("スナップショット（mmap）", load_snapshot, snapshot_path)]:
+            start_time = time.perf_counter()
+            load(path)
+            elapsed_time = time.perf_counter() - start_time
+            tracemalloc.start()
+            load(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {label}: {elapsed_time:.2f}秒 "
+                  f"({edges / elapsed_time / 1e6:.2f}M辺/秒), ピークメモリ {peak / 2**20:.1f}MiB")
+    finally:
+        os.unlink(file_path)
+        if os.path.exists(snapshot_path):
+            os.unlink(snapshot_path)
+
+def benchmark_incremental_session(components=4, n=14):
+    """辺の変更後の解き直し（SolverSession）と全体の解き直しの時間を比較"""
+    print(f"\n{'='*60}")
+    print("差分の解き直しベンチマーク")
+    print(f"{'='*60}")
+
+    # 密なランダムグラフを頂点IDをずらして並べた複数成分の路線網
+    graph = Graph()
+    for c in range(components):
+        part = generate_dense_graph(n, density=0.6, seed=c)
+        for u in part.get_all_vertices():
+            for v, weight in part.get_neighbors(u):
+                if u < v:
+                    graph.add_edge(c * 100 + u, c * 100 + v, weight)
+
+    session = SolverSession(graph)
+    start_time = time.perf_counter()
+    session.solve()
+    full_time = time.perf_counter() - start_time
+    print(f"\n{components}成分 × {n}頂点, 全体の求解: {full_time:.3f}秒")
+
+    path = session.best_path
+    on_path = (path[0], path[1])
+    off_path = next((u, v) for u in session.graph.get_all_vertices()
+                    for v, _ in session.graph.get_neighbors(u)
+                    if u < v and not session._on_best_path(u, v))
+    other = next(v for v in session.graph.get_all_vertices() if v // 100 != path[0] // 100)
+    other_edge = (other, session.graph.get_neighbors(other)[-1][0])
+
+    deltas = [
+        ("最長パス外の辺の削除", lambda: session.remove_edge(*off_path)),
+        ("別成分の重みの増加", lambda: session.set_weight(*other_edge, 25.0)),
+        ("最長パス上の重みの増加", lambda: session.set_weight(*on_path, 30.0)),
+        ("最長パス上の辺の削除", lambda: session.remove_edge(*on_path)),
+        ("辺の追加", lambda: session.add_edge(path[0], path[-1], 1.0)),
     ]
+    for label, apply in deltas:
+        apply()
+        start_time = time.perf_counter()
+        _, distance = session.solve()
+        delta_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        _, expected = SolverSession(session.graph).solve()
+        rebuild_time = time.perf_counter() - start_time
+        status = "省略" if session.skipped else (
+            f"{session.components_searched}成分を探索, {session.components_reused}成分を再利用")
+        print(f"  {label}: 差分 {delta_time:.3f}秒（{status}）, 全体 {rebuild_time:.3f}秒, "
+              f"距離一致={abs(distance - expected) < 1e-9}")
+
+def benchmark_symmetry_breaking():
+    """向きの正規化（対称性の除去）の有無による探索ノード数の比較"""
+    print(f"\n{'='*60}")
+    print("対称性の除去ベンチマーク（探索ノード数）")
+    print(f"{'='*60}")
 
-    results = {}
+    cases = [(name, load_graph_from_file(f"tests/sample_inputs/{name}"))
+             for name in ("difficult_case1.txt", "performance_killer.txt", "large_graph.txt")]
+    solvers = [
+        ("Original", lambda g, symmetry_breaking: LongestPathSolver(
+            g, symmetry_breaking=symmetry_breaking, reach_interval=0)),
+        ("Bitmask", BitmaskLongestPathSolver),
+        ("Advanced", AdvancedLongestPathSolver),
+        ("Parallel(1)", lambda g, symmetry_breaking: ParallelLongestPathSolver(
+            g, max_workers=1, symmetry_breaking=symmetry_breaking)),
+    ]
 
-    for test_file in test_files:
-        if not os.path.exists(test_file):
-            print(f"警告: {test_file} が見つかりません")
-            continue
+    for name, graph in cases:
+        print(f"\n{name}")
+        for label, factory in solvers:
+            counts = []
+            for symmetry_breaking in (False, True):
+                solver = factory(graph, symmetry_breaking=symmetry_breaking)
+                start_time = time.perf_counter()
+                solver.find_longest_path()
+                counts.append((solver.nodes_explored, time.perf_counter() - start_time))
+            (before, before_time), (after, after_time) = counts
+            if before == 0:
+                # 完全グラフの部分集合DPやブロック分解の経路は探索ノード数を数えない
+                print(f"  {label}: 探索ノード数を数えない戦略（DP・ブロック分解）のため対象外")
+                continue
+            print(f"  {label}: {before} → {after}ノード ({after / before:.0%}), "
+                  f"{before_time:.3f}秒 → {after_time:.3f}秒")
 
-        print(f"\n{'='*50}")
-        print(f"テストケース: {test_file}")
-        print(f"{'='*50}")
+def benchmark_warm_start():
+    """ヒューリスティックの暫定解の有無による探索ノード数の比較"""
+    print(f"\n{'='*60}")
+    print("ウォームスタートベンチマーク（探索ノード数）")
+    print(f"{'='*60}")
 
-        # グラフ読み込み
-        graph = load_graph_from_file(test_file)
-        vertices = graph.get_all_vertices()
+    for name in ("performance_killer.txt", "large_graph.txt"):
+        graph = load_graph_from_file(f"tests/sample_inputs/{name}")
+        results = []
+        for budget in (0, 0.05):
+            solver = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=budget)
+            start_time = time.perf_counter()
+            _, distance = solver.find_longest_path()
+            results.append((solver.nodes_explored, time.perf_counter() - start_time))
+        (before, before_time), (after, after_time) = results
+        print(f"  {name}: {before} → {after}ノード ({after / before:.0%}), "
+              f"{before_time:.3f}秒 → {after_time:.3f}秒 "
+              f"(暫定解 {solver.warm_start_distance:.2f} / 最長 {distance:.2f})")
+
+def benchmark_reach_pruning(intervals=(0, 1, 2, 4)):
+    """Original Solver の到達可能性による枝刈りの間隔ごとの探索ノード数・時間の比較"""
+    print(f"\n{'='*60}")
+    print("到達可能性による枝刈りベンチマーク（Original Solver、間隔 0 は枝刈りなし）")
+    print(f"{'='*60}")
 
-        if not vertices:
-            print("グラフが空です")
-            continue
+    cases = [(name, load_graph_from_file(f"tests/sample_inputs/{name}"))
+             for name in ("performance_killer.txt", "large_graph.txt")]
+    cases += [("grid 5x5", grid_graph(5, 5)), ("gnp n18 p0.25", gnp_graph(18, 0.25))]
+    for name, graph in cases:
+        results = []
+        for interval in intervals:
+            solver = LongestPathSolver(graph, reach_interval=interval)
+            start_time = time.perf_counter()
+            solver.find_longest_path()
+            results.append(f"{interval}: {solver.nodes_explored}ノード "
+                           f"{time.perf_counter() - start_time:.3f}秒")
+        print(f"  {name}: " + ", ".join(results))
+
+def benchmark_transposition(megabytes=(0, 16, 0.05)):
+    """置換表のメモリ量ごとの探索ノード数・時間・ヒット率の比較（逐次処理）"""
+    print(f"\n{'='*60}")
+    print("置換表ベンチマーク（Parallel(1)、0 MB は置換表なし）")
+    print(f"{'='*60}")
 
-        print(f"頂点数: {len(vertices)}")
-        print(f"エッジ数: {sum(len(graph.get_neighbors(v)) for v in vertices) // 2}")
+    cases = [(name, load_graph_from_file(f"tests/sample_inputs/{name}"))
+             for name in ("performance_killer.txt", "large_graph.txt")]
+    cases += [("grid 5x6", grid_graph(5, 6)), ("gnp n26 p0.2 seed2", gnp_graph(26, 0.2, seed=2))]
+    for name, graph in cases:
+        results = []
+        for size in megabytes:
+            solver = ParallelLongestPathSolver(graph, max_workers=1, transposition_mb=size)
+            start_time = time.perf_counter()
+            solver.find_longest_path()
+            elapsed = time.perf_counter() - start_time
+            hit_rate = solver.table_hit_rate
+            results.append(f"{size}MB: {solver.nodes_explored}ノード {elapsed:.3f}秒"
+                           + (f" ヒット率 {hit_rate:.1%}" if hit_rate is not None else ""))
+        print(f"  {name}: " + ", ".join(results))
+
+def benchmark_orderings():
+    """始点の順序・隣接頂点の順序の組み合わせごとの探索ノード数の比較
+
+    暫定解の見つかりやすさだけを比べるため、逐次処理・ウォームスタートなしで測る。
+    """
+    print(f"\n{'='*60}")
+    print("探索順序ベンチマーク（探索ノード数、逐次・ウォームスタートなし）")
+    print(f"{'='*60}")
 
-        # 各ソルバーでテスト
-        solvers = [
-            (LongestPathSolver(graph), "Original Solver"),
-            (ParallelLongestPathSolver(graph, max_workers=4), "Parallel Solver"),
-            (AdvancedLongestPathSolver(graph), "Advanced Solver")
-        ]
+    cases = [("large_graph.txt", load_graph_from_file("tests/sample_inputs/large_graph.txt")),
+             ("grid 5x6", grid_graph(5, 6)), ("gnp n24 p0.2", gnp_graph(24, 0.2)),
+             ("gnp n30 p0.12", gnp_graph(30, 0.12)), ("gnp n22 p0.25 seed1", gnp_graph(22, 0.25, seed=1))]
+    print(f"  {'グラフ':<22}{'始点':<12}" + "".join(f"{name:>12}" for name in NEIGHBOR_ORDERINGS))
+    for name, graph in cases:
+        for start_ordering in START_ORDERINGS:
+            counts = []
+            for neighbor_ordering in NEIGHBOR_ORDERINGS:
+                solver = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=0,
+                                                   start_ordering=start_ordering,
+                                                   neighbor_ordering=neighbor_ordering)
+                solver.find_longest_path()
+                counts.append(solver.nodes_explored)
+            print(f"  {name:<22}{start_ordering:<12}" + "".join(f"{count:>12}" for count in counts))
+
+def random_large_graph(n, seed=5):
+    """全域木に 2n 本の辺を加えた n 頂点の連結なランダムグラフ"""
+    rng = random.Random(seed)
+    graph = Graph()
+    for v in range(1, n):
+        graph.add_edge(v, rng.randrange(v), float(rng.randint(1, 100)))
+    for _ in range(2 * n):
+        graph.add_edge(rng.randrange(n), rng.randrange(n), float(rng.randint(1, 100)))
+    return graph
 
-        test_results = {}
+def benchmark_anneal(n=2000, budgets=(1.0, 4.0)):
+    """厳密解法が届かない規模での貪欲法と焼きなまし法の距離の比較"""
+    print(f"\n{'='*60}")
+    print(f"焼きなまし法ベンチマーク（{n}頂点・{3 * n}辺のランダムグラフ）")
+    print(f"{'='*60}")
 
-        for solver, name in solvers:
-            time_taken, distance, path_length = benchmark_solver(solver, graph, name)
-            if time_taken is not None:
-                test_results[name] = {
-                    'time': time_taken,
-                    'distance': distance,
-                    'path_length': path_length
-                }
+    graph = random_large_graph(n)
+
+    # 全始点から最も重い辺を選んで両端を伸ばす貪欲法（局所改善なし）
+    heuristics = PathHeuristics(graph.freeze().neighbor_rows())
+    start_time = time.perf_counter()
+    distance = max(heuristics.distance(heuristics.greedy(start))
+                   for start in range(len(heuristics.weights)))
+    print(f"  貪欲法: {distance:.1f} ({time.perf_counter() - start_time:.2f}秒)")
+
+    for budget in budgets:
+        solver = AnnealingSolver(graph, time_budget=budget, max_workers=1)
+        _, distance = solver.find_longest_path()
+        checkpoints = [f"{elapsed:.2f}秒 {value:.0f}" for elapsed, value in
+                       solver.history[::max(1, len(solver.history) // 4)]]
+        print(f"  焼きなまし法 {budget}秒: {distance:.1f} (上界 {solver.upper_bound:.1f}, "
+              f"{solver.iterations}反復) 推移: {', '.join(checkpoints)}")
+
+def benchmark_beam_width(n=2000, widths=(1, 4, 16, 64)):
+    """ビームサーチの幅による時間と距離の比較"""
+    print(f"\n{'='*60}")
+    print(f"ビームサーチベンチマーク（{n}頂点・{3 * n}辺のランダムグラフ）")
+    print(f"{'='*60}")
 
-        results[test_file] = test_results
+    graph = random_large_graph(n)
+    for width in widths:
+        solver = BeamSearchSolver(graph, beam_width=width)
+        start_time = time.perf_counter()
+        _, distance = solver.find_longest_path()
+        print(f"  幅 {width}: {distance:.1f} ({time.perf_counter() - start_time:.2f}秒, "
+              f"{solver.states_expanded}状態を展開)")
 
-    # 結果サマリー
+def benchmark_planner():
+    """実行計画の見積もり時間と、選ばれたソルバーの実測時間の比較"""
     print(f"\n{'='*60}")
-    print("性能比較サマリー")
+    print("実行計画ベンチマーク（見積もり / 実測）")
     print(f"{'='*60}")
 
-    for test_file, test_results in results.items():
-        print(f"\n{test_file}:")
-        for solver_name, result in test_results.items():
-            print(f"  {solver_name}: {result['time']:.3f}秒, "
-                  f"距離={result['distance']:.3f}, パス長={result['path_length']}")
+    exact_solvers = {
+        "tree": TreeDiameterSolver,
+        "bitmask": BitmaskLongestPathSolver,
+        "dp": HeldKarpLongestPathSolver,
+        "blocks": BlockCutTreeSolver,
+        "parallel": lambda g: ParallelLongestPathSolver(g, max_workers=1),
+    }
+    graphs = [(name, load_graph_from_file(f"tests/sample_inputs/{name}"))
+              for name in ("difficult_case1.txt", "performance_killer.txt", "large_graph.txt")]
+    graphs.append(("密 14頂点", generate_dense_graph(14, density=0.5)))
+    graphs.append(("疎 20頂点", generate_dense_graph(20, density=0.25)))
+    graphs.append(("鎖の多いグラフ", chain_heavy_graph(hubs=8, chains=16, max_chain_length=4)))
+    graphs += [(f"格子 {n}x{n}", grid_graph(n, n)) for n in (4, 5, 6)]
+    for name, graph in graphs:
+        plan = plan_solver(graph, workers=1)
+        solver = exact_solvers[plan.engine](graph)
+        start_time = time.perf_counter()
+        solver.find_longest_path()
+        elapsed = time.perf_counter() - start_time
+        print(f"  {name}: {plan.engine} 見積もり {plan.estimates[plan.engine]:.4f}秒 / "
+              f"実測 {elapsed:.4f}秒")
 
 def test_command_line():
     """コマンドライン実行のテスト"""
@@ -143,7 +521,7 @@ def test_command_line():
             print(f"\n--- {solver} solver ---")
 
             try:
-                start_time = time.time()
+                start_time = time.perf_counter()
 
                 # コマンドライン実行
                 cmd = [
@@ -160,7 +538,7 @@ def test_command_line():
                         timeout=60  # 60秒タイムアウト
                     )
 
-                elapsed_time = time.time() - start_time
+                elapsed_time = time.perf_counter() - start_time
 
                 if result.returncode == 0:
                     print(f"実行時間: {elapsed_time:.3f}秒")
@@ -173,12 +551,78 @@ def test_command_line():
             except Exception as e:
                 print(f"エラー: {e}")
 
-if __name__ == "__main__":
+def run_feature_benchmarks():
+    """機能ごとの個別ベンチマーク（並列スケーリング・鎖縮約・読み込みなど）"""
+    benchmark_parallel_scaling()
+    benchmark_chain_contraction()
+    benchmark_compiled_graph()
+    benchmark_simple_solver_allocations()
+    benchmark_symmetry_breaking()
+    benchmark_reach_pruning()
+    benchmark_bulk_loader()
+    benchmark_incremental_session()
+    benchmark_warm_start()
+    benchmark_orderings()
+    benchmark_transposition()
+    benchmark_anneal()
+    benchmark_beam_width()
+    benchmark_planner()
+
+def main():
+    """ベンチマークスイートを実行し、結果の保存・基準との比較を行う
+
+    距離の不一致か基準からの回帰があれば終了コード1を返す。
+    """
+    parser = argparse.ArgumentParser(description="最長パス問題ソルバー性能ベンチマーク")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick",
+                        help="実行するケースの集合 (デフォルト: quick)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="ソルバーごとの実行回数 (デフォルト: 5)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="合成グラフの乱数の種 (デフォルト: 0)")
+    parser.add_argument("--output", metavar="FILE", default=None,
+                        help="結果を JSON で保存するファイル")
+    parser.add_argument("--baseline", metavar="FILE", default=None,
+                        help="比較する基準の結果（--output で保存した JSON）")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="回帰とみなす実行時間の悪化の割合 (デフォルト: 0.25)")
+    parser.add_argument("--features", action="store_true",
+                        help="機能ごとの個別ベンチマークも実行")
+    parser.add_argument("--command-line", action="store_true",
+                        help="コマンドライン実行テストも実行")
+    args = parser.parse_args()
+
     print("最長パス問題ソルバー性能ベンチマーク")
     print("=" * 60)
+    print(f"スイート: {args.suite}, 実行回数: {args.repeat}, 種: {args.seed}")
+
+    report = run_suite(SUITES[args.suite], repeat=args.repeat, seed=args.seed)
+    failed = bool(report["mismatches"])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を保存しました: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.tolerance)
+        print(f"\n基準との比較（{args.baseline}, 許容 +{args.tolerance:.0%}）")
+        for regression in regressions:
+            print(f"  回帰: {format_regression(regression)}")
+        if not regressions:
+            print("  回帰なし")
+        failed = failed or bool(regressions)
+
+    if report["mismatches"]:
+        print(f"\n距離・パスの不一致: {len(report['mismatches'])}件")
+
+    if args.features:
+        run_feature_benchmarks()
+    if args.command_line:
+        test_command_line()
+    return 1 if failed else 0
 
-    # ライブラリベンチマーク
-    run_benchmarks()
-
-    # コマンドライン実行テスト
-    test_command_line()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+再現可能なベンチマークスイート
+
+種を固定した合成グラフ（格子・分岐駅のある木構造の路線網・G(n, p)・完全グラフ・
+鎖の多い路線網）を大きさを変えて生成し、各ソルバーを複数回実行して
+time.perf_counter() による実行時間の統計とピークメモリを計測する。
+厳密解法どうしの距離・パスの妥当性を突き合わせ、結果は JSON に保存して
+基準となる過去の結果と比較できる（実行時間の悪化・距離の変化を回帰として報告）。
+"""
+
+import sys
+import time
+import random
+import platform
+import statistics
+import tracemalloc
+from pathlib import Path
+
+# プロジェクトルートを追加
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from graph import Graph
+from session import path_distance
+from solver import LongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from dp_solver import HeldKarpLongestPathSolver
+from block_solver import BlockCutTreeSolver
+from tree_solver import TreeDiameterSolver
+from beam_solver import BeamSearchSolver
+from anneal_solver import AnnealingSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+
+# 結果ファイルの形式の版（項目を変えたら上げる）
+RESULT_VERSION = 1
+
+# 距離を同じとみなす相対誤差（浮動小数点の加算順序による差）
+DISTANCE_TOLERANCE = 1e-9
+
+def grid_graph(rows, cols, seed=0):
+    """rows × cols の格子（頂点IDは 1 から行優先）"""
+    rng = random.Random(seed)
+    graph = Graph()
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c + 1
+            if c + 1 < cols:
+                graph.add_edge(v, v + 1, round(rng.uniform(1.0, 10.0), 1))
+            if r + 1 < rows:
+                graph.add_edge(v, v + cols, round(rng.uniform(1.0, 10.0), 1))
+    return graph
+
+def rail_network(n, hubs=4, branch_probability=0.15, seed=0):
+    """幹線で結んだ hubs 個の分岐駅から支線が伸びる木構造の路線網（頂点数 n）"""
+    rng = random.Random(seed)
+    graph = Graph()
+    for hub in range(1, hubs):
+        graph.add_edge(hub, hub + 1, round(rng.uniform(5.0, 20.0), 1))
+    # 支線は直前の駅から1駅ずつ伸ばし、一定の確率で別の駅から新しい支線を始める
+    current = rng.randint(1, hubs)
+    for v in range(hubs + 1, n + 1):
+        if rng.random() < branch_probability:
+            current = rng.randint(1, hubs) if rng.random() < 0.5 else rng.randint(1, v - 1)
+        graph.add_edge(current, v, round(rng.uniform(1.0, 8.0), 1))
+        current = v
+    return graph
+
+def gnp_graph(n, p, seed=0):
+    """各頂点対を確率 p で結ぶ G(n, p) ランダムグラフ"""
+    rng = random.Random(seed)
+    graph = Graph()
+    for u in range(1, n + 1):
+        for v in range(u + 1, n + 1):
+            if rng.random() < p:
+                graph.add_edge(u, v, round(rng.uniform(1.0, 20.0), 1))
+    return graph
+
+def complete_graph(n, seed=0):
+    """n 頂点の完全グラフ"""
+    return gnp_graph(n, 1.0, seed)
+
+def chain_heavy_graph(hubs, chains, max_chain_length, seed=0):
+    """分岐駅の間を次数2の駅の長い鎖で結んだ路線網"""
+    rng = random.Random(seed)
+    graph = Graph()
+    next_id = hubs
+    for i in range(chains):
+        # 最初の hubs 本で分岐駅を環状につなぎ、残りはランダムに張る
+        if i < hubs:
+            a, b = i + 1, (i + 1) % hubs + 1
+        else:
+            a, b = rng.randint(1, hubs), rng.randint(1, hubs)
+        previous = a
+        for _ in range(rng.randint(max_chain_length // 2, max_chain_length)):
+            next_id += 1
+            graph.add_edge(previous, next_id, round(rng.uniform(0.5, 5.0), 1))
+            previous = next_id
+        graph.add_edge(previous, b, round(rng.uniform(0.5, 5.0), 1))
+    return graph
+
+GENERATORS = {
+    "grid": grid_graph,
+    "rail": rail_network,
+    "gnp": gnp_graph,
+    "complete": complete_graph,
+    "chain": chain_heavy_graph,
+}
+
+# ソルバー名 -> (グラフからソルバーを作る関数, 厳密解法か)
+# 並列ソルバーはピークメモリを同じプロセスで測れるよう1ワーカーで実行する
+SOLVERS = {
+    "original": (LongestPathSolver, True),
+    "bitmask": (BitmaskLongestPathSolver, True),
+    "dp": (HeldKarpLongestPathSolver, True),
+    "blocks": (BlockCutTreeSolver, True),
+    "tree": (TreeDiameterSolver, True),
+    "parallel": (lambda g: ParallelLongestPathSolver(g, max_workers=1), True),
+    "advanced": (AdvancedLongestPathSolver, True),
+    "beam": (lambda g: BeamSearchSolver(g, beam_width=64), False),
+    "anneal": (lambda g: AnnealingSolver(g, time_budget=1.0, max_iterations=20000,
+                                         restarts=1, max_workers=1), False),
+}
+
+# (系列, 生成の引数, 実行するソルバー)。大きさごとに現実的な時間で終わるソルバーだけを選ぶ
+QUICK_CASES = [
+    ("grid", {"rows": 3, "cols": 3}, ["original", "bitmask", "dp", "blocks", "parallel", "advanced"]),
+    ("grid", {"rows": 4, "cols": 4}, ["bitmask", "dp", "blocks", "parallel", "advanced", "beam"]),
+    ("rail", {"n": 40}, ["tree", "blocks", "bitmask", "parallel", "advanced"]),
+    ("rail", {"n": 400}, ["tree", "blocks", "beam"]),
+    ("gnp", {"n": 10, "p": 0.4}, ["original", "bitmask", "dp", "blocks", "parallel", "advanced"]),
+    ("gnp", {"n": 14, "p": 0.4}, ["bitmask", "dp", "parallel", "advanced", "beam"]),
+    ("complete", {"n": 7}, ["original", "bitmask", "dp", "parallel", "advanced"]),
+    ("complete", {"n": 9}, ["bitmask", "dp", "parallel", "advanced", "beam"]),
+    ("chain", {"hubs": 6, "chains": 10, "max_chain_length": 6}, ["blocks", "advanced", "beam"]),
+]
+
+FULL_CASES = QUICK_CASES + [
+    ("grid", {"rows": 5, "cols": 5}, ["blocks", "parallel", "advanced", "beam"]),
+    ("rail", {"n": 4000}, ["tree", "blocks", "beam", "anneal"]),
+    ("gnp", {"n": 16, "p": 0.5}, ["dp", "parallel", "advanced", "beam"]),
+    ("gnp", {"n": 24, "p": 0.2}, ["parallel", "beam", "anneal"]),
+    ("gnp", {"n": 30, "p": 0.12}, ["parallel", "beam", "anneal"]),
+    ("complete", {"n": 12}, ["dp", "parallel", "advanced", "beam"]),
+    ("complete", {"n": 15}, ["dp", "advanced", "beam"]),
+    ("chain", {"hubs": 8, "chains": 12, "max_chain_length": 20}, ["blocks", "advanced", "beam"]),
+]
+
+SUITES = {"quick": QUICK_CASES, "full": FULL_CASES}
+
+def case_name(family, params):
+    """結果の照合に使うケース名（例: gnp-n14-p0.4）"""
+    return "-".join([family] + [f"{key}{value}" for key, value in params.items()])
+
+def measure(factory, graph, repeat):
+    """repeat 回実行した実行時間の列と、別の1回で測ったピークメモリを返す
+
+    tracemalloc は実行を遅くするため、時間の計測とは別に実行する。
+    戻り値は (最後の実行のソルバー, パス, 距離, 時間の列, ピークメモリのバイト数)。
+    """
+    times = []
+    for _ in range(repeat):
+        solver = factory(graph)
+        start_time = time.perf_counter()
+        path, distance = solver.find_longest_path()
+        times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    factory(graph).find_longest_path()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return solver, path, distance, times, peak
+
+def summarize_times(times):
+    """実行時間の統計（最小・中央値・平均・標準偏差）"""
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "runs": len(times),
+    }
+
+def same_distance(a, b):
+    return abs(a - b) <= DISTANCE_TOLERANCE * max(1.0, abs(a), abs(b))
+
+def check_result(graph, path, distance, optimum, exact):
+    """パスの妥当性と最長距離との突き合わせ。問題があればその説明を返す"""
+    if path:
+        if len(set(path)) != len(path):
+            return "パスに同じ駅が複数回現れる"
+        actual = path_distance(graph, path)
+        if actual is None or not same_distance(actual, distance):
+            return f"パスの距離 {actual} が報告された距離 {distance} と一致しない"
+    elif distance != 0.0:
+        return f"空のパスに距離 {distance} が報告された"
+    if optimum is not None:
+        if exact and not same_distance(distance, optimum):
+            return f"距離 {distance} が他の厳密解法の {optimum} と一致しない"
+        if not exact and distance > optimum and not same_distance(distance, optimum):
+            return f"近似解の距離 {distance} が最長距離 {optimum} を超える"
+    return None
+
+def run_suite(cases, repeat=5, seed=0, progress=print):
+    """ケースの列を実行し、結果（JSONに変換できる辞書）を返す"""
+    results = []
+    mismatches = []
+    for family, params, solver_names in cases:
+        name = case_name(family, params)
+        graph = GENERATORS[family](**params, seed=seed)
+        vertices = graph.get_all_vertices()
+        edges = sum(len(graph.get_neighbors(v)) for v in vertices) // 2
+        progress(f"\n{name}（頂点数 {len(vertices)}, 辺数 {edges}）")
+
+        # 厳密解法を先に実行し、その距離を近似解法の検査にも使う
+        ordered = sorted(solver_names, key=lambda s: not SOLVERS[s][1])
+        optimum = None
+        for solver_name in ordered:
+            factory, exact = SOLVERS[solver_name]
+            solver, path, distance, times, peak = measure(factory, graph, repeat)
+            problem = check_result(graph, path, distance, optimum, exact)
+            if exact and optimum is None and problem is None:
+                optimum = distance
+            entry = {
+                "case": name,
+                "family": family,
+                "params": params,
+                "seed": seed,
+                "vertices": len(vertices),
+                "edges": edges,
+                "solver": solver_name,
+                "exact": exact,
+                "time": summarize_times(times),
+                "peak_memory_bytes": peak,
+                "distance": distance,
+                "path_length": len(path),
+                "is_optimal": solver.is_optimal,
+                "nodes_explored": getattr(solver, "nodes_explored", None),
+            }
+            results.append(entry)
+            stats = entry["time"]
+            progress(f"  {solver_name:<9} 中央値 {stats['median'] * 1e3:9.2f}ms "
+                     f"(最小 {stats['min'] * 1e3:.2f}ms, 標準偏差 {stats['stdev'] * 1e3:.2f}ms) "
+                     f"ピーク {peak / 1024:8.1f}KiB 距離 {distance:.3f}")
+            if problem is not None:
+                mismatches.append({"case": name, "solver": solver_name, "problem": problem})
+                progress(f"  ⚠ {solver_name}: {problem}")
+
+    return {
+        "version": RESULT_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+        "mismatches": mismatches,
+    }
+
+def compare_results(current, baseline, tolerance=0.25, min_seconds=0.002):
+    """基準の結果と比べた回帰の一覧
+
+    同じ (ケース, ソルバー) について、中央値が基準の (1 + tolerance) 倍を超え、
+    かつ差が min_seconds 秒を超えたもの（短い計測のゆらぎは無視する）と、
+    距離が変わったもの（同じ種なら同じグラフのため、常に回帰とみなす）を返す。
+    """
+    base = {(entry["case"], entry["solver"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        previous = base.get((entry["case"], entry["solver"]))
+        if previous is None or previous.get("seed") != entry.get("seed"):
+            continue
+        if not same_distance(entry["distance"], previous["distance"]):
+            regressions.append({"case": entry["case"], "solver": entry["solver"],
+                                "kind": "distance", "baseline": previous["distance"],
+                                "current": entry["distance"]})
+        before, after = previous["time"]["median"], entry["time"]["median"]
+        if after > before * (1.0 + tolerance) and after - before > min_seconds:
+            regressions.append({"case": entry["case"], "solver": entry["solver"],
+                                "kind": "time", "baseline": before, "current": after,
+                                "ratio": after / before if before > 0 else float('inf')})
+    return regressions
+
+def format_regression(regression):
+    """回帰1件の表示用の文字列"""
+    if regression["kind"] == "distance":
+        return (f"{regression['case']} / {regression['solver']}: 距離が変化 "
+                f"{regression['baseline']:.3f} → {regression['current']:.3f}")
+    return (f"{regression['case']} / {regression['solver']}: 実行時間が悪化 "
+            f"{regression['baseline'] * 1e3:.2f}ms → {regression['current'] * 1e3:.2f}ms "
+            f"(x{regression['ratio']:.2f})")
@@ -0,0 +1,58 @@
+"""テストで共通に使うグラフの読み込み・生成の補助関数"""
+
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), 'sample_inputs')
+
+def load_sample(name):
+    """サンプル入力ファイルからグラフを構築"""
+    graph = Graph()
+    with open(os.path.join(SAMPLE_DIR, name)) as f:
+        for line in f:
+            parts = [p.strip() for p in line.split(',')]
+            if len(parts) == 3:
+                graph.add_edge(int(parts[0]), int(parts[1]), float(parts[2]))
+    return graph
+
+def build_graph(edges):
+    """(u, v, 重み) の列からグラフを構築"""
+    graph = Graph()
+    for u, v, w in edges:
+        graph.add_edge(u, v, w)
+    return graph
+
+def path_graph(n):
+    """頂点 1..n を重み 1 の辺でつないだパスグラフ"""
+    return build_graph([(v, v + 1, 1.0) for v in range(1, n)])
+
+def complete_graph(n):
+    """頂点 1..n の完全グラフ（重みは 1〜5）"""
+    return build_graph([(u, v, float(u * v % 5 + 1))
+                        for u in range(1, n + 1) for v in range(u + 1, n + 1)])
+
+def random_graph(rng, n, density):
+    """各頂点対に確率 density で辺を張ったランダムな重み付き単純グラフ"""
+    graph = Graph()
+    for u in range(1, n + 1):
+        for v in range(u + 1, n + 1):
+            if rng.random() < density:
+                graph.add_edge(u, v, round(rng.uniform(0.1, 10.0), 2))
+    return graph
+
+def random_multigraph(rng, n, edges):
+    """edges 本の辺を持つランダムグラフ（多重辺・自己ループ・連続しない頂点IDを含みうる）
+
+    重みには丸め誤差で向きにより距離が変わりやすい値も含める。
+    """
+    graph = Graph()
+    for _ in range(edges):
+        weight = rng.choice([float(rng.randint(0, 3)), round(rng.uniform(0.0, 10.0), 2),
+                             rng.choice([0.1, 0.2, 0.3, 0.7])])
+        graph.add_edge(rng.randint(1, n) * 3 % 13, rng.randint(1, n) * 3 % 13, weight)
+    return graph
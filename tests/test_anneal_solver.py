@@ -0,0 +1,86 @@
+import unittest
+import random
+import sys
+import os
+import time
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from anneal_solver import AnnealingSolver
+from session import path_distance
+from helpers import load_sample, random_multigraph
+
+def anneal(graph, **options):
+    """反復回数の予算で再現可能に実行する"""
+    options.setdefault('max_iterations', 3000)
+    options.setdefault('max_workers', 1)
+    return AnnealingSolver(graph, time_budget=60.0, **options)
+
+class TestAnnealingSolver(unittest.TestCase):
+
+    def test_valid_paths_on_random_graphs(self):
+        """求めたパスが単純パスで、距離が正しく最長距離を超えないか"""
+        rng = random.Random(0)
+        for trial in range(60):
+            graph = random_multigraph(rng, rng.randint(1, 9), rng.randint(1, 16))
+            solver = anneal(graph, seed=trial)
+            path, distance = solver.find_longest_path()
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            with self.subTest(trial=trial):
+                self.assertEqual(len(path), len(set(path)))
+                if len(path) > 1:
+                    self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+                self.assertLessEqual(distance, expected + 1e-9)
+                self.assertGreaterEqual(solver.upper_bound, expected - 1e-9)
+
+    def test_finds_optimum_on_samples(self):
+        """サンプルでは最長距離に届くか"""
+        for name in ('performance_killer.txt', 'large_graph.txt'):
+            graph = load_sample(name)
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            _, distance = anneal(graph).find_longest_path()
+            with self.subTest(name=name):
+                self.assertAlmostEqual(distance, expected, places=9)
+
+    def test_reproducible_with_seed(self):
+        """同じ種と反復回数なら、プロセス数によらず同じ結果と反復回数か"""
+        rng = random.Random(3)
+        graph = Graph()
+        for v in range(1, 120):
+            graph.add_edge(v, rng.randrange(v), float(rng.randint(1, 50)))
+        for _ in range(200):
+            graph.add_edge(rng.randrange(120), rng.randrange(120), float(rng.randint(1, 50)))
+
+        first = anneal(graph, seed=7, restarts=2)
+        second = anneal(graph, seed=7, restarts=2, max_workers=2)
+        self.assertEqual(first.find_longest_path(), second.find_longest_path())
+        self.assertEqual(first.iterations, second.iterations)
+
+        # 最良距離の推移は単調に増え、最後は最良距離
+        distances = [distance for _, distance in first.history]
+        self.assertEqual(distances, sorted(set(distances)))
+        self.assertEqual(distances[-1], first.best_distance)
+        self.assertFalse(first.is_optimal)
+
+    def test_time_budget_includes_polish(self):
+        """数万駅でも初期解と最良解の局所改善を含めて制限時間程度で終わるか"""
+        rng = random.Random(5)
+        graph = Graph()
+        for v in range(1, 20000):
+            graph.add_edge(v, rng.randrange(v), float(rng.randint(1, 100)))
+            graph.add_edge(rng.randrange(20000), rng.randrange(20000), float(rng.randint(1, 100)))
+        solver = AnnealingSolver(graph, time_budget=0.3, max_workers=1)
+        started = time.perf_counter()
+        path, distance = solver.find_longest_path()
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertGreater(distance, 0.0)
+        self.assertEqual(len(path), len(set(path)))
+
+    def test_empty_graph(self):
+        self.assertEqual(anneal(Graph()).find_longest_path(), ([], 0.0))
+
+if __name__ == '__main__':
+    unittest.main()
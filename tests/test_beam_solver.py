@@ -0,0 +1,74 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from beam_solver import BeamSearchSolver
+from search_control import SearchLimit
+from session import path_distance
+from helpers import load_sample, random_multigraph
+
+class TestBeamSearchSolver(unittest.TestCase):
+
+    def test_wide_beam_is_exact(self):
+        """状態を捨てない幅なら最長距離に一致し、最適と判定するか"""
+        rng = random.Random(0)
+        for trial in range(100):
+            graph = random_multigraph(rng, rng.randint(1, 8), rng.randint(1, 14))
+            solver = BeamSearchSolver(graph, beam_width=10**6)
+            path, distance = solver.find_longest_path()
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            with self.subTest(trial=trial):
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertTrue(solver.is_optimal)
+
+    def test_narrow_beam_gives_valid_paths(self):
+        """幅が狭くても単純パスで、距離が正しく最長距離と上界の間にあるか"""
+        rng = random.Random(1)
+        for trial in range(100):
+            graph = random_multigraph(rng, rng.randint(1, 9), rng.randint(1, 16))
+            solver = BeamSearchSolver(graph, beam_width=rng.randint(1, 3))
+            path, distance = solver.find_longest_path()
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            with self.subTest(trial=trial):
+                self.assertEqual(len(path), len(set(path)))
+                if path:
+                    self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+                self.assertLessEqual(distance, expected + 1e-9)
+                self.assertGreaterEqual(solver.upper_bound, expected - 1e-9)
+                if not solver.is_optimal:
+                    self.assertGreater(solver.upper_bound, distance)
+
+    def test_samples(self):
+        """サンプルでは幅64で最長距離に届き、展開数が深さ×幅に収まるか"""
+        for name in ('performance_killer.txt', 'large_graph.txt'):
+            graph = load_sample(name)
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            solver = BeamSearchSolver(graph, beam_width=64)
+            _, distance = solver.find_longest_path()
+            with self.subTest(name=name):
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertLessEqual(solver.states_expanded, 64 * len(graph.get_all_vertices()))
+
+    def test_interrupted_search_keeps_best(self):
+        """打ち切られたらそれまでの最良解を返し、最適とはしないか"""
+        graph = load_sample('large_graph.txt')
+        limit = SearchLimit(check_interval=1)
+        limit.cancel()
+        solver = BeamSearchSolver(graph, beam_width=64)
+        solver.set_search_limit(limit)
+        solver.find_longest_path()
+        self.assertFalse(solver.is_optimal)
+        self.assertGreaterEqual(solver.upper_bound, solver.best_distance)
+
+    def test_invalid_width(self):
+        with self.assertRaises(ValueError):
+            BeamSearchSolver(Graph(), beam_width=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import copy
+import json
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_suite import (GENERATORS, grid_graph, rail_network, complete_graph,
+                             chain_heavy_graph, run_suite, check_result, compare_results)
+
+def edge_list(graph):
+    return sorted((u, v, w) for u in graph.get_all_vertices()
+                  for v, w in graph.get_neighbors(u) if u < v)
+
+class TestGenerators(unittest.TestCase):
+
+    def test_same_seed_same_graph(self):
+        """同じ種なら同じグラフ、違う種なら違う重みになるか"""
+        params = {"grid": {"rows": 3, "cols": 4}, "rail": {"n": 30},
+                  "gnp": {"n": 10, "p": 0.5}, "complete": {"n": 5},
+                  "chain": {"hubs": 4, "chains": 6, "max_chain_length": 4}}
+        for family, generator in GENERATORS.items():
+            with self.subTest(family=family):
+                first = edge_list(generator(**params[family], seed=1))
+                self.assertEqual(first, edge_list(generator(**params[family], seed=1)))
+                self.assertNotEqual(first, edge_list(generator(**params[family], seed=2)))
+
+    def test_shapes(self):
+        self.assertEqual(len(edge_list(grid_graph(3, 4))), 3 * 3 + 2 * 4)
+        self.assertEqual(len(edge_list(complete_graph(6))), 15)
+        rail = rail_network(50)
+        self.assertEqual(len(rail.get_all_vertices()), 50)
+        self.assertTrue(rail.is_forest())
+        self.assertFalse(chain_heavy_graph(4, 6, 4).is_forest())
+
+class TestRunSuite(unittest.TestCase):
+
+    def test_cross_checks_and_serializes(self):
+        """小さなケースで厳密解法どうしが一致し、結果を JSON に変換できるか"""
+        cases = [("grid", {"rows": 2, "cols": 3}, ["bitmask", "dp", "blocks", "beam"]),
+                 ("rail", {"n": 12}, ["tree", "parallel"])]
+        report = run_suite(cases, repeat=2, progress=lambda message: None)
+        self.assertEqual(report["mismatches"], [])
+        self.assertEqual(len(report["results"]), 6)
+        for entry in report["results"]:
+            self.assertEqual(entry["time"]["runs"], 2)
+            self.assertGreater(entry["peak_memory_bytes"], 0)
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    def test_check_result_reports_problems(self):
+        graph = grid_graph(2, 2)
+        path = [1, 2, 4]
+        distance = sum(w for u, v, w in edge_list(graph) if (u, v) in ((1, 2), (2, 4)))
+        self.assertIsNone(check_result(graph, path, distance, distance, True))
+        self.assertIsNotNone(check_result(graph, path, distance + 1.0, None, True))
+        self.assertIsNotNone(check_result(graph, [1, 2, 1], 0.0, None, True))
+        self.assertIsNotNone(check_result(graph, path, distance, distance + 5.0, True))
+        # 近似解は最長距離以下なら問題なし
+        self.assertIsNone(check_result(graph, path, distance, distance + 5.0, False))
+
+class TestCompareResults(unittest.TestCase):
+
+    def make_report(self, median, distance):
+        return {"results": [{"case": "grid-rows2-cols3", "solver": "bitmask", "seed": 0,
+                             "distance": distance, "time": {"median": median}}]}
+
+    def test_flags_time_and_distance_regressions(self):
+        baseline = self.make_report(0.100, 10.0)
+        self.assertEqual(compare_results(self.make_report(0.110, 10.0), baseline), [])
+
+        regressions = compare_results(self.make_report(0.200, 10.0), baseline)
+        self.assertEqual([r["kind"] for r in regressions], ["time"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 2.0)
+
+        regressions = compare_results(self.make_report(0.100, 9.0), baseline)
+        self.assertEqual([r["kind"] for r in regressions], ["distance"])
+
+    def test_ignores_noise_and_unmatched_entries(self):
+        """短い計測のゆらぎ・種の違う結果・基準にないケースは比較しないか"""
+        baseline = self.make_report(0.0001, 10.0)
+        self.assertEqual(compare_results(self.make_report(0.0005, 10.0), baseline), [])
+
+        other_seed = copy.deepcopy(baseline)
+        other_seed["results"][0]["seed"] = 1
+        self.assertEqual(compare_results(self.make_report(1.0, 9.0), other_seed), [])
+        self.assertEqual(compare_results(self.make_report(1.0, 9.0), {"results": []}), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from solver import LongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from helpers import SAMPLE_DIR, load_sample
+
+class TestBitmaskLongestPathSolver(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+
+    def test_example_from_problem(self):
+        """問題例のテスト"""
+        self.graph.add_edge(1, 2, 8.54)
+        self.graph.add_edge(2, 3, 3.11)
+        self.graph.add_edge(3, 1, 2.19)
+        self.graph.add_edge(3, 4, 4.0)
+        self.graph.add_edge(4, 1, 1.4)
+
+        solver = BitmaskLongestPathSolver(self.graph)
+        path, distance = solver.find_longest_path()
+
+        self.assertEqual(path, [1, 2, 3, 4])
+        self.assertAlmostEqual(distance, 15.65, places=2)
+
+    def test_empty_graph(self):
+        """空グラフのテスト"""
+        solver = BitmaskLongestPathSolver(self.graph)
+        path, distance = solver.find_longest_path()
+
+        self.assertEqual(path, [])
+        self.assertEqual(distance, 0.0)
+
+    def test_sparse_vertex_ids(self):
+        """飛び飛びの大きな頂点IDでも正しく動作するか"""
+        self.graph.add_edge(1000, 20, 1.5)
+        self.graph.add_edge(20, 99999, 2.5)
+        self.graph.add_edge(99999, 1000, 0.5)
+
+        solver = BitmaskLongestPathSolver(self.graph)
+        path, distance = solver.find_longest_path()
+
+        self.assertEqual(len(path), 3)
+        self.assertAlmostEqual(distance, 4.0)
+
+    def test_matches_original_solver_on_samples(self):
+        """全サンプル入力で LongestPathSolver と同一の結果になるか"""
+        for name in sorted(os.listdir(SAMPLE_DIR)):
+            with self.subTest(sample=name):
+                graph = load_sample(name)
+                expected = LongestPathSolver(graph).find_longest_path()
+                actual = BitmaskLongestPathSolver(graph).find_longest_path()
+                self.assertEqual(actual, expected)
+
+if __name__ == '__main__':
+    unittest.main()
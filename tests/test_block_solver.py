@@ -0,0 +1,93 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from block_solver import BlockCutTreeSolver, biconnected_components, build_simple_adjacency
+from session import path_distance
+
+class TestBlockCutTreeSolver(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+
+    def test_biconnected_components(self):
+        """2つの三角形を橋でつないだグラフのブロック分解"""
+        # 1-2-3 の三角形, 3-4 の橋, 4-5-6 の三角形
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(2, 3, 1.0)
+        self.graph.add_edge(3, 1, 1.0)
+        self.graph.add_edge(3, 4, 1.0)
+        self.graph.add_edge(4, 5, 1.0)
+        self.graph.add_edge(5, 6, 1.0)
+        self.graph.add_edge(6, 4, 1.0)
+
+        blocks = biconnected_components(build_simple_adjacency(self.graph))
+        self.assertEqual(sorted(blocks), [[1, 2, 3], [3, 4], [4, 5, 6]])
+
+        solver = BlockCutTreeSolver(self.graph)
+        path, distance = solver.find_longest_path()
+        self.assertEqual(solver.articulation_points, {3, 4})
+        self.assertEqual(len(path), 6)
+        self.assertAlmostEqual(distance, 5.0)
+
+    def test_example_from_problem(self):
+        """問題例のテスト"""
+        self.graph.add_edge(1, 2, 8.54)
+        self.graph.add_edge(2, 3, 3.11)
+        self.graph.add_edge(3, 1, 2.19)
+        self.graph.add_edge(3, 4, 4.0)
+        self.graph.add_edge(4, 1, 1.4)
+
+        path, distance = BlockCutTreeSolver(self.graph).find_longest_path()
+        self.assertEqual(path, [1, 2, 3, 4])
+        self.assertAlmostEqual(distance, 15.65, places=2)
+
+    def test_empty_graph(self):
+        """空グラフのテスト"""
+        self.assertEqual(BlockCutTreeSolver(self.graph).find_longest_path(), ([], 0.0))
+
+    def test_matches_exhaustive_search_on_random_graphs(self):
+        """木に近いランダムグラフで全探索と同じ最長距離になるか"""
+        rng = random.Random(0)
+        for trial in range(200):
+            graph = Graph()
+            n = rng.randint(2, 11)
+            for v in range(2, n + 1):
+                graph.add_edge(v, rng.randint(1, v - 1), round(rng.uniform(0.1, 9.0), 2))
+            for _ in range(rng.randint(0, n)):
+                u, v = rng.randint(1, n), rng.randint(1, n)
+                if u != v:
+                    graph.add_edge(u, v, round(rng.uniform(0.1, 9.0), 2))
+
+            with self.subTest(trial=trial):
+                _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+                path, distance = BlockCutTreeSolver(graph).find_longest_path()
+
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertEqual(len(path), len(set(path)))
+                self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+
+    def test_large_sparse_graph(self):
+        """小さなブロックばかりの大規模グラフでも解けるか"""
+        rng = random.Random(1)
+        parent = {}
+        for v in range(2, 3001):
+            parent[v] = rng.randint(max(1, v - 20), v - 1)
+            self.graph.add_edge(v, parent[v], round(rng.uniform(0.1, 9.0), 2))
+        for v in rng.sample(range(3, 3001), 300):
+            if parent[v] in parent:
+                self.graph.add_edge(v, parent[parent[v]], 1.0)
+
+        path, distance = BlockCutTreeSolver(self.graph).find_longest_path()
+        self.assertEqual(len(path), len(set(path)))
+        self.assertAlmostEqual(path_distance(self.graph, path), distance, places=6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bounds import (IncrementalPathBound, max_spanning_forest_bound,
+                    reachable_mask)
+from parallel_solver import ParallelLongestPathSolver, _kernel_adjacency
+from helpers import random_graph
+
+def brute_force_gain(adjacency, current, visited):
+    """現在の頂点から未訪問頂点だけを通って伸ばせる最大距離（全探索）"""
+    best = 0.0
+    for neighbor, bit, weight in adjacency[current]:
+        if not visited & bit:
+            best = max(best, weight + brute_force_gain(adjacency, neighbor, visited | bit))
+    return best
+
+def random_walk(rng, adjacency, length):
+    """ランダムな単純パスの接頭辞を生成"""
+    current = rng.randrange(len(adjacency))
+    path = [current]
+    visited = 1 << current
+    for _ in range(length):
+        candidates = [n for n, bit, _ in adjacency[current] if not visited & bit]
+        if not candidates:
+            break
+        current = rng.choice(candidates)
+        path.append(current)
+        visited |= 1 << current
+    return path, visited
+
+class TestPathBounds(unittest.TestCase):
+
+    def test_bounds_are_admissible(self):
+        """全ての上界が真の残り距離以上になるか"""
+        rng = random.Random(7)
+        for trial in range(60):
+            graph = random_graph(rng, rng.randint(2, 8), rng.choice([0.3, 0.6, 1.0]))
+            adjacency = _kernel_adjacency(graph.freeze())
+            if not adjacency:
+                continue
+
+            neighbor_masks = [sum(bit for _, bit, _ in neighbors) for neighbors in adjacency]
+            sorted_edges = sorted(((w, v, u) for v, nbrs in enumerate(adjacency)
+                                   for u, _, w in nbrs if v < u), reverse=True)
+            bound = IncrementalPathBound(adjacency)
+
+            path, visited = random_walk(rng, adjacency, rng.randint(0, 4))
+            current = path[-1]
+            bound.reset(current, visited)
+            gain = brute_force_gain(adjacency, current, visited)
+
+            with self.subTest(trial=trial):
+                self.assertGreaterEqual(bound.value(current, visited), gain)
+                self.assertGreaterEqual(
+                    bound.reachable_value(neighbor_masks, current, visited), gain)
+                reached = reachable_mask(neighbor_masks, current, visited)
+                self.assertGreaterEqual(
+                    max_spanning_forest_bound(sorted_edges, current, reached) + 1e-9, gain)
+
+    def test_incremental_updates_match_recomputation(self):
+        """advance / retreat の増分更新が再計算と一致するか"""
+        rng = random.Random(11)
+        for trial in range(30):
+            graph = random_graph(rng, rng.randint(3, 9), 0.6)
+            adjacency = _kernel_adjacency(graph.freeze())
+            if not adjacency:
+                continue
+
+            incremental = IncrementalPathBound(adjacency)
+            fresh = IncrementalPathBound(adjacency)
+
+            path, visited = random_walk(rng, adjacency, 0)
+            incremental.reset(path[-1], visited)
+            marks = []
+
+            with self.subTest(trial=trial):
+                for _ in range(len(adjacency)):
+                    current = path[-1]
+                    candidates = [(n, bit) for n, bit, _ in adjacency[current] if not visited & bit]
+                    if not candidates:
+                        break
+                    nxt, bit = rng.choice(candidates)
+                    visited |= bit
+                    marks.append(incremental.advance(current, nxt, visited))
+                    path.append(nxt)
+
+                    fresh.reset(nxt, visited)
+                    self.assertAlmostEqual(incremental.sum1, fresh.sum1, places=9)
+                    self.assertAlmostEqual(incremental.sum2, fresh.sum2, places=9)
+
+                # 全て取り消すと初期状態に戻る
+                while marks:
+                    incremental.retreat(marks.pop())
+                    visited &= ~(1 << path.pop())
+                fresh.reset(path[-1], visited)
+                self.assertAlmostEqual(incremental.sum1, fresh.sum1, places=9)
+                self.assertAlmostEqual(incremental.sum2, fresh.sum2, places=9)
+
+class TestParallelSolverExactness(unittest.TestCase):
+
+    def test_sequential_search_matches_brute_force(self):
+        """枝刈り付き探索が全探索と同じ最長距離を返すか"""
+        rng = random.Random(3)
+        for trial in range(40):
+            graph = random_graph(rng, rng.randint(2, 8), rng.choice([0.3, 0.6, 1.0]))
+            adjacency = _kernel_adjacency(graph.freeze())
+            if not adjacency:
+                continue
+
+            expected = max(brute_force_gain(adjacency, v, 1 << v) for v in range(len(adjacency)))
+            with self.subTest(trial=trial):
+                _, distance = ParallelLongestPathSolver(graph, max_workers=1).find_longest_path()
+                self.assertAlmostEqual(distance, expected, places=9)
+
+    def test_process_pool_matches_brute_force(self):
+        """プロセスプール経由でも全探索と同じ最長距離を返すか"""
+        rng = random.Random(5)
+        for trial in range(3):
+            graph = random_graph(rng, 8, 0.7)
+            adjacency = _kernel_adjacency(graph.freeze())
+
+            expected = max(brute_force_gain(adjacency, v, 1 << v) for v in range(len(adjacency)))
+            with self.subTest(trial=trial):
+                _, distance = ParallelLongestPathSolver(graph, max_workers=2).find_longest_path()
+                self.assertAlmostEqual(distance, expected, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
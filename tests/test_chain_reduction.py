@@ -0,0 +1,87 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from chain_reduction import ChainContraction, ChainContractedSolver
+from session import path_distance
+
+class TestChainContraction(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+
+    def test_long_chain_is_contracted(self):
+        """分岐駅間の長い鎖が代表駅だけに縮約されるか"""
+        # 1 と 2 を直接結ぶ辺と、10 駅の鎖で結ぶ経路
+        self.graph.add_edge(1, 2, 1.0)
+        previous = 1
+        for station in range(100, 110):
+            self.graph.add_edge(previous, station, 2.0)
+            previous = station
+        self.graph.add_edge(previous, 2, 2.0)
+        self.graph.add_edge(2, 3, 5.0)
+
+        reduction = ChainContraction(self.graph)
+        self.assertLess(len(reduction.graph.get_all_vertices()), 10)
+        self.assertGreater(reduction.contracted_vertices, 0)
+
+        path, distance = ChainContractedSolver(self.graph, BitmaskLongestPathSolver).find_longest_path()
+        _, expected = BitmaskLongestPathSolver(self.graph).find_longest_path()
+        self.assertAlmostEqual(distance, expected)
+        self.assertAlmostEqual(path_distance(self.graph, path), distance)
+        self.assertEqual(len(path), 13)
+
+    def test_cycle_without_hub(self):
+        """分岐駅を持たない環状線では最も軽い辺だけを除いたパスになるか"""
+        weights = [3.0, 4.0, 1.0, 5.0, 6.0, 2.0, 7.0]
+        for i, weight in enumerate(weights):
+            self.graph.add_edge(i + 1, (i + 1) % len(weights) + 1, weight)
+
+        path, distance = ChainContractedSolver(self.graph, BitmaskLongestPathSolver).find_longest_path()
+        self.assertAlmostEqual(distance, sum(weights) - 1.0)
+        self.assertEqual(len(path), len(weights))
+
+    def test_negative_weights_are_not_contracted(self):
+        """負の重みを含むグラフは縮約しない"""
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(2, 3, -1.0)
+        self.graph.add_edge(3, 4, 1.0)
+
+        reduction = ChainContraction(self.graph)
+        self.assertIs(reduction.graph, self.graph)
+
+    def test_matches_exhaustive_search_on_random_chain_graphs(self):
+        """鎖の多いランダムグラフで全探索と同じ最長距離になるか"""
+        rng = random.Random(0)
+        for trial in range(150):
+            graph = Graph()
+            hubs = rng.randint(1, 4)
+            next_id = 100
+            for _ in range(rng.randint(1, 5)):
+                previous, end = rng.randint(1, hubs), rng.randint(1, hubs)
+                for _ in range(rng.randint(0, 5)):
+                    next_id += 1
+                    graph.add_edge(previous, next_id, round(rng.uniform(0.0, 9.0), 1))
+                    previous = next_id
+                graph.add_edge(previous, end, round(rng.uniform(0.0, 9.0), 1))
+            if len(graph.get_all_vertices()) > 14:
+                continue
+
+            with self.subTest(trial=trial):
+                _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+                path, distance = ChainContractedSolver(graph, BitmaskLongestPathSolver).find_longest_path()
+
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertEqual(len(path), len(set(path)))
+                if len(path) > 1:
+                    self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
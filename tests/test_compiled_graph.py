@@ -0,0 +1,96 @@
+import unittest
+import pickle
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from compiled_graph import CompiledGraph
+from solver import LongestPathSolver
+from simple_solver import SimpleLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from helpers import random_multigraph
+
+class TestCompiledGraph(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+        self.graph.add_edge(30, 10, 1.5)
+        self.graph.add_edge(10, 20, 2.5)
+        self.graph.add_edge(20, 30, 3.5)
+        self.graph.add_edge(10, 20, 4.0)
+        self.graph.add_edge(40, 40, 1.0)
+
+    def test_same_read_api_as_graph(self):
+        """Graph と同じ頂点順序・隣接（頂点ID順）を返すか"""
+        compiled = self.graph.freeze()
+        self.assertIsInstance(compiled, CompiledGraph)
+        self.assertEqual(compiled.get_all_vertices(), self.graph.get_all_vertices())
+        for v in self.graph.get_all_vertices():
+            self.assertEqual(compiled.get_neighbors(v), self.graph.get_neighbors(v))
+        self.assertEqual(compiled.get_neighbors(99), [])
+        self.assertEqual(compiled.edge_count, 5)
+        self.assertIs(compiled.freeze(), compiled)
+
+    def test_csr_layout(self):
+        """CSR配列のオフセットと隣接インデックスが一致するか"""
+        compiled = self.graph.freeze()
+        self.assertEqual(compiled.offsets[0], 0)
+        self.assertEqual(compiled.offsets[-1], len(compiled.targets))
+        self.assertEqual(len(compiled.targets), len(compiled.weights))
+        for i, v in enumerate(compiled.vertex_ids):
+            start, end = compiled.offsets[i], compiled.offsets[i + 1]
+            self.assertEqual(end - start, len(self.graph.get_neighbors(v)))
+
+    def test_frozen_copy_is_independent(self):
+        """変換後の add_edge は変換済みのグラフに反映されないか"""
+        compiled = self.graph.freeze()
+        self.graph.add_edge(10, 50, 1.0)
+        self.assertNotIn(50, compiled.get_all_vertices())
+
+    def test_pickle_round_trip(self):
+        """ワーカーへ送るための pickle で内容が保たれるか"""
+        compiled = self.graph.freeze()
+        restored = pickle.loads(pickle.dumps(compiled))
+        self.assertEqual(restored.vertex_ids, compiled.vertex_ids)
+        self.assertEqual(restored.index, compiled.index)
+        self.assertEqual(restored.get_neighbors(10), compiled.get_neighbors(10))
+
+    def test_is_forest(self):
+        """森の判定が Graph.is_forest と一致するか"""
+        rng = random.Random(0)
+        for trial in range(100):
+            graph = random_multigraph(rng, rng.randint(1, 8), rng.randint(0, 8))
+            with self.subTest(trial=trial):
+                self.assertEqual(graph.freeze().is_forest(), graph.is_forest())
+
+    def test_solvers_accept_compiled_graph(self):
+        """各ソルバーが Graph と CompiledGraph で同じ結果を返すか"""
+        rng = random.Random(1)
+        for trial in range(30):
+            graph = random_multigraph(rng, rng.randint(2, 7), rng.randint(1, 12))
+            if not graph.get_all_vertices():
+                continue
+            compiled = graph.freeze()
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            factories = [
+                LongestPathSolver,
+                SimpleLongestPathSolver,
+                lambda g: ParallelLongestPathSolver(g, max_workers=1),
+                AdvancedLongestPathSolver,
+            ]
+            for i, factory in enumerate(factories):
+                with self.subTest(trial=trial, solver=i):
+                    from_graph = factory(graph).find_longest_path()
+                    from_compiled = factory(compiled).find_longest_path()
+                    self.assertEqual(from_graph, from_compiled)
+                    if i != 3:
+                        self.assertAlmostEqual(from_graph[1], expected, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from dp_solver import HeldKarpLongestPathSolver
+from session import path_distance
+
+class TestHeldKarpLongestPathSolver(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+
+    def test_example_from_problem(self):
+        """問題例のテスト"""
+        self.graph.add_edge(1, 2, 8.54)
+        self.graph.add_edge(2, 3, 3.11)
+        self.graph.add_edge(3, 1, 2.19)
+        self.graph.add_edge(3, 4, 4.0)
+        self.graph.add_edge(4, 1, 1.4)
+
+        solver = HeldKarpLongestPathSolver(self.graph)
+        path, distance = solver.find_longest_path()
+
+        self.assertEqual(path, [1, 2, 3, 4])
+        self.assertAlmostEqual(distance, 15.65, places=2)
+
+    def test_empty_graph(self):
+        """空グラフのテスト"""
+        solver = HeldKarpLongestPathSolver(self.graph)
+        self.assertEqual(solver.find_longest_path(), ([], 0.0))
+
+    def test_too_many_vertices(self):
+        """上限を超える頂点数ではエラーになるか"""
+        for i in range(1, 6):
+            self.graph.add_edge(i, i + 1, 1.0)
+
+        solver = HeldKarpLongestPathSolver(self.graph, max_vertices=5)
+        with self.assertRaises(ValueError):
+            solver.find_longest_path()
+
+    def test_matches_exhaustive_search_on_random_graphs(self):
+        """ランダムグラフで全探索と同じ最長距離になるか"""
+        rng = random.Random(42)
+        for trial in range(30):
+            graph = Graph()
+            n = rng.randint(2, 9)
+            for u in range(1, n + 1):
+                for v in range(u + 1, n + 1):
+                    if rng.random() < 0.5:
+                        graph.add_edge(u, v, round(rng.uniform(0.5, 20.0), 2))
+            if not graph.get_all_vertices():
+                continue
+
+            with self.subTest(trial=trial):
+                _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+                path, distance = HeldKarpLongestPathSolver(graph).find_longest_path()
+
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertEqual(len(path), len(set(path)))
+                self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
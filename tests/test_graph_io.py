@@ -0,0 +1,140 @@
+import unittest
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from compiled_graph import CompiledGraph
+from graph_io import load_graph, read_edges, _parse_chunk_fast
+
+def parse_line_by_line(text):
+    """比較用: 従来の1行ずつの解析（Graph と警告された行のリストを返す）"""
+    graph = Graph()
+    warnings = []
+    for line in io.StringIO(text, newline=None):
+        line = line.strip()
+        if not line:
+            continue
+        if line.lower() in ['end', 'quit', 'exit']:
+            break
+        match = re.match(r'^\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*$', line)
+        try:
+            graph.add_edge(int(match.group(1)), int(match.group(2)), float(match.group(3)))
+        except (AttributeError, ValueError):
+            warnings.append(line)
+    return graph, warnings
+
+def assert_same_csr(test, compiled, expected):
+    test.assertEqual(compiled.vertex_ids, expected.vertex_ids)
+    test.assertEqual(list(compiled.offsets), list(expected.offsets))
+    test.assertEqual(list(compiled.targets), list(expected.targets))
+    test.assertEqual(list(compiled.weights), list(expected.weights))
+
+class TestCompiledGraphFromEdges(unittest.TestCase):
+
+    def test_same_layout_as_graph(self):
+        """Graph に同じ順で追加して変換した場合と同じCSR配列になるか"""
+        rng = random.Random(0)
+        for trial in range(200):
+            n = rng.randint(1, 30)
+            edges = [(rng.randint(0, n) * 37 % 101, rng.randint(0, n) * 37 % 101,
+                      float(rng.randint(0, 5))) for _ in range(rng.randint(0, 60))]
+            graph = Graph()
+            for u, v, w in edges:
+                graph.add_edge(u, v, w)
+            with self.subTest(trial=trial):
+                us, vs, ws = zip(*edges) if edges else ((), (), ())
+                assert_same_csr(self, CompiledGraph.from_edges(us, vs, ws), graph.freeze())
+
+    def test_sorted_edge_list(self):
+        """頂点ID順に並んだ辺リスト（行の並べ替えを省く場合）でも同じCSR配列になるか"""
+        rng = random.Random(1)
+        for trial in range(50):
+            n = rng.randint(2, 40)
+            edges = sorted((u, v, float(rng.randint(1, 5))) for u in range(n)
+                           for v in range(u + 1, n) if rng.random() < 0.3)
+            graph = Graph()
+            for u, v, w in edges:
+                graph.add_edge(u, v, w)
+            with self.subTest(trial=trial):
+                us, vs, ws = zip(*edges) if edges else ((), (), ())
+                assert_same_csr(self, CompiledGraph.from_edges(us, vs, ws), graph.freeze())
+
+class TestEdgeListLoader(unittest.TestCase):
+
+    PIECES = ['1,2,3.5', '10 , 20 ,\t1.25', ' 3,3,0', '2,,3', 'a,b,c', '1 2,3,4', '5,6',
+              '7,8,9,1', '.,1,2', '1,2,.', '', '   ', 'END', 'x', '4,5,6.', '1,2,3\r']
+
+    def random_text(self, rng):
+        lines = []
+        for _ in range(rng.randint(0, 12)):
+            if rng.random() < 0.7:
+                lines.append(f"{rng.randint(0, 9)}{rng.choice([',', ' ,', ', '])}"
+                             f"{rng.randint(0, 9)},{rng.choice(['1', '2.5', '0.1', '7.'])}")
+            else:
+                lines.append(rng.choice(self.PIECES))
+        return rng.choice(['\n', '\r\n']).join(lines) + rng.choice(['', '\n'])
+
+    def test_same_result_as_line_parser(self):
+        """チャンクの切れ目によらず、従来の1行ずつの解析と同じグラフ・警告になるか"""
+        rng = random.Random(1)
+        for trial in range(500):
+            text = self.random_text(rng)
+            expected, expected_warnings = parse_line_by_line(text)
+            for stream in (io.BytesIO(text.encode()), io.StringIO(text)):
+                with self.subTest(trial=trial, stream=type(stream).__name__):
+                    warnings = []
+                    chunk_size = rng.choice([rng.randint(1, 20), 1 << 20])
+                    compiled = load_graph(stream, warn=warnings.append, chunk_size=chunk_size)
+                    assert_same_csr(self, compiled, expected.freeze())
+                    self.assertEqual(warnings, expected_warnings)
+
+    def test_warning_message(self):
+        """不正な行は標準エラー出力に警告し、残りの行は読み込むか"""
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            us, vs, ws = read_edges(io.BytesIO(b"1,2,3\n  foo bar \n2,3,x\n2,3,4\n"))
+        self.assertEqual(stderr.getvalue(), "Warning: Invalid input format: foo bar\n"
+                                            "Warning: Invalid input format: 2,3,x\n")
+        self.assertEqual((list(us), list(vs), list(ws)), ([1, 2], [2, 3], [3.0, 4.0]))
+
+    def test_terminator_stops_reading(self):
+        """終了行（end/quit/exit）以降は読まないか"""
+        us, _, _ = read_edges(io.BytesIO(b"1,2,3\nQuit\n4,5,6\n"))
+        self.assertEqual(list(us), [1])
+
+    def test_fast_path(self):
+        """数字と区切りだけのチャンクは一括変換し、崩れた行を含むチャンクは見送るか"""
+        us, vs, ws = _parse_chunk_fast(b"1,2,3\n 4 , 5 ,\t6.5\r\n")
+        self.assertEqual((list(us), list(vs), list(ws)), ([1, 4], [2, 5], [3.0, 6.5]))
+        for chunk in [b"1 2,3,4\n", b"1,2,3\n\n", b"1,2\n3,4,5,6\n", b"1,,2\n", b"1,2,.\n",
+                      b"1,2,3\nend\n", b"1,2,3\r4,5,6\n", b"99999999999999999999,1,1\n"]:
+            with self.subTest(chunk=chunk):
+                self.assertIsNone(_parse_chunk_fast(chunk))
+
+    def test_memory_mapped_file(self):
+        """ファイルはメモリマップで読み、チャンクの切れ目や末尾の改行の有無によらないか"""
+        text = "# 路線データ\n1, 2, 1.5\n2, 3, 2.5\n3, 1, 4.0"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'edges.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            expected, _ = parse_line_by_line(text.replace('# 路線データ\n', ''))
+            for chunk_size in (3, 1 << 20):
+                with self.subTest(chunk_size=chunk_size):
+                    compiled = load_graph(path, comment='#', chunk_size=chunk_size)
+                    assert_same_csr(self, compiled, expected.freeze())
+
+            empty = os.path.join(directory, 'empty.txt')
+            open(empty, 'w').close()
+            self.assertEqual(load_graph(empty).get_all_vertices(), [])
+
+if __name__ == '__main__':
+    unittest.main()
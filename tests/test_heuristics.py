@@ -0,0 +1,98 @@
+import unittest
+import random
+import sys
+import time
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver
+from heuristics import PathHeuristics, warm_start_path
+from search_control import SearchLimit
+from session import path_distance
+from helpers import load_sample, random_multigraph
+
+class TestPathHeuristics(unittest.TestCase):
+
+    def test_local_moves(self):
+        """挿入・2-opt・端の付け替えで距離が伸びるか"""
+        # 0-1-2 の間に 3 を挟むと伸びる
+        rows = [[(1, 1.0), (3, 5.0)], [(0, 1.0), (2, 1.0), (3, 5.0)], [(1, 1.0)],
+                [(0, 5.0), (1, 5.0)]]
+        heuristics = PathHeuristics(rows)
+        self.assertEqual(heuristics.improve([0, 1, 2]), [2, 1, 3, 0])
+        self.assertEqual(heuristics.distance([2, 1, 3, 0]), 11.0)
+
+        # 0-1-2-3 を 0-2-1-3 に付け替えると伸びる
+        edges = {(0, 1): 1.0, (1, 2): 1.0, (2, 3): 1.0, (0, 2): 4.0, (1, 3): 4.0}
+        rows = [[] for _ in range(4)]
+        for (u, v), w in edges.items():
+            rows[u].append((v, w))
+            rows[v].append((u, w))
+        heuristics = PathHeuristics(rows)
+        path = heuristics.improve([0, 1, 2, 3])
+        self.assertEqual(heuristics.distance(path), 9.0)
+
+    def test_improve_respects_deadline(self):
+        """大きなグラフでも局所改善が制限時間・中断要求で止まるか"""
+        rng = random.Random(3)
+        n = 20000
+        rows = [[] for _ in range(n)]
+        for v in range(1, n):
+            for u in (rng.randrange(v), rng.randrange(n)):
+                weight = float(rng.randint(1, 100))
+                rows[u].append((v, weight))
+                rows[v].append((u, weight))
+        heuristics = PathHeuristics(rows)
+        path = heuristics.greedy(0)
+        started = time.perf_counter()
+        heuristics.improve(list(path), started + 0.05)
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+        limit = SearchLimit()
+        limit.cancel()
+        self.assertEqual(heuristics.improve(list(path), None, limit), path)
+
+    def test_valid_paths_on_random_graphs(self):
+        """求めたパスが単純パスで、距離が正しく最長距離を超えないか"""
+        rng = random.Random(0)
+        for trial in range(100):
+            graph = random_multigraph(rng, rng.randint(1, 9), rng.randint(1, 16))
+            path, distance = warm_start_path(graph, 1.0)
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            with self.subTest(trial=trial):
+                self.assertEqual(len(path), len(set(path)))
+                if len(path) > 1:
+                    self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+                self.assertLessEqual(distance, expected + 1e-9)
+
+    def test_empty_graph(self):
+        self.assertEqual(warm_start_path(Graph(), 1.0), ([], 0.0))
+
+class TestWarmStart(unittest.TestCase):
+
+    def test_results_unchanged(self):
+        """ヒューリスティックの暫定解を使っても同じパスと距離を返すか"""
+        rng = random.Random(1)
+        for trial in range(100):
+            graph = random_multigraph(rng, rng.randint(1, 9), rng.randint(1, 16))
+            cold = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=0)
+            warm = ParallelLongestPathSolver(graph, max_workers=1)
+            with self.subTest(trial=trial):
+                self.assertEqual(warm.find_longest_path(), cold.find_longest_path())
+
+    def test_reduces_nodes(self):
+        """サンプルで最長距離に届く暫定解を作り、探索ノード数を減らすか"""
+        graph = load_sample('large_graph.txt')
+        cold = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=0)
+        expected = cold.find_longest_path()
+        warm = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=1.0)
+        self.assertEqual(warm.find_longest_path(), expected)
+        self.assertAlmostEqual(warm.warm_start_distance, expected[1], places=9)
+        self.assertLess(warm.nodes_explored, cold.nodes_explored)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from ordering import (START_ORDERINGS, NEIGHBOR_ORDERINGS, eccentricity_estimate,
+                      order_starts, order_neighbors)
+from helpers import load_sample, build_graph, path_graph, complete_graph
+
+def rows_of(graph):
+    return graph.freeze().neighbor_rows()
+
+class TestOrderStarts(unittest.TestCase):
+
+    def test_every_strategy_is_permutation(self):
+        rows = rows_of(load_sample('large_graph.txt'))
+        for strategy in START_ORDERINGS:
+            with self.subTest(strategy=strategy):
+                self.assertEqual(sorted(order_starts(rows, strategy)), list(range(len(rows))))
+
+    def test_peripheral_puts_endpoints_first(self):
+        """パスグラフでは両端が先頭に来て、中央ほど後になるか"""
+        rows = rows_of(path_graph(7))
+        self.assertEqual(eccentricity_estimate(rows), [6, 5, 4, 3, 4, 5, 6])
+        order = order_starts(rows, "peripheral")
+        self.assertEqual(order[:2], [0, 6])
+        self.assertEqual(order[-1], 3)
+
+    def test_eccentricity_per_component(self):
+        rows = rows_of(build_graph([(1, 2, 1.0), (2, 3, 1.0), (4, 5, 1.0)]))
+        self.assertEqual(eccentricity_estimate(rows), [2, 1, 2, 1, 1])
+
+    def test_unknown_strategy(self):
+        rows = rows_of(path_graph(3))
+        with self.assertRaises(ValueError):
+            order_starts(rows, "random")
+        with self.assertRaises(ValueError):
+            order_neighbors(rows, "random")
+
+class TestOrderNeighbors(unittest.TestCase):
+
+    def test_every_strategy_keeps_edges(self):
+        rows = rows_of(load_sample('large_graph.txt'))
+        for strategy in NEIGHBOR_ORDERINGS:
+            with self.subTest(strategy=strategy):
+                ordered = order_neighbors(rows, strategy)
+                for row, result in zip(rows, ordered):
+                    self.assertEqual(sorted(row), sorted(result))
+
+    def test_reach_prefers_extendable_neighbor(self):
+        """重みが同じなら、先へ伸ばせる頂点を先に試すか"""
+        # 1 から 2（行き止まり）と 3（先に重い辺）へ同じ重みの辺
+        rows = rows_of(build_graph([(1, 2, 5.0), (1, 3, 5.0), (3, 4, 9.0)]))
+        self.assertEqual([v for v, _ in order_neighbors(rows, "weight")[0]], [1, 2])
+        self.assertEqual([v for v, _ in order_neighbors(rows, "reach")[0]], [2, 1])
+
+class TestOrderedSearch(unittest.TestCase):
+
+    def test_every_combination_is_exact(self):
+        """どの順序の組み合わせでも最長距離が変わらないか"""
+        graphs = [load_sample('large_graph.txt'), load_sample('performance_killer.txt'),
+                  complete_graph(7)]
+        for graph in graphs:
+            _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+            for start_ordering in START_ORDERINGS:
+                for neighbor_ordering in NEIGHBOR_ORDERINGS:
+                    for workers in (1, 2):
+                        with self.subTest(start=start_ordering, neighbor=neighbor_ordering,
+                                          workers=workers):
+                            solver = ParallelLongestPathSolver(
+                                graph, max_workers=workers, warm_start_budget=0,
+                                start_ordering=start_ordering,
+                                neighbor_ordering=neighbor_ordering)
+                            path, distance = solver.find_longest_path()
+                            self.assertAlmostEqual(distance, expected, places=9)
+                            self.assertEqual(len(path), len(set(path)))
+
+    def test_advanced_forwards_orderings(self):
+        graph = load_sample('performance_killer.txt')
+        _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+        solver = AdvancedLongestPathSolver(graph, start_ordering="index",
+                                           neighbor_ordering="reach")
+        _, distance = solver.find_longest_path()
+        self.assertAlmostEqual(distance, expected, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
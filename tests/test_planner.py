@@ -0,0 +1,105 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import AdvancedLongestPathSolver, ParallelLongestPathSolver
+from planner import GraphFeatures, estimate_costs, plan_solver
+from helpers import load_sample, build_graph, path_graph, complete_graph
+from benchmark_suite import grid_graph
+
+class TestGraphFeatures(unittest.TestCase):
+
+    def test_components_and_blocks(self):
+        """連結成分・ブロックを求めるか（自己ループ・多重辺は数えない）"""
+        # 三角形 1-2-3 に橋 3-4 がつながった成分と、孤立した辺 5-6
+        graph = build_graph([(1, 2, 1.0), (2, 3, 1.0), (3, 1, 1.0), (3, 4, 1.0),
+                             (1, 2, 5.0), (4, 4, 1.0), (5, 6, 1.0)])
+        features = GraphFeatures(graph)
+        self.assertEqual((features.vertex_count, features.edge_count), (6, 5))
+        self.assertEqual(sorted(features.components), [(2, 1), (4, 4)])
+        self.assertEqual(sorted(features.blocks), [(2, 1), (2, 1), (3, 3)])
+        self.assertEqual(features.max_block_size, 3)
+        self.assertFalse(features.is_forest)
+        self.assertEqual(features.max_degree, 3)
+
+    def test_forest_and_complete(self):
+        self.assertTrue(GraphFeatures(path_graph(5)).is_forest)
+        features = GraphFeatures(complete_graph(6))
+        self.assertTrue(features.is_complete)
+        self.assertEqual(features.max_block_size, 6)
+
+class TestPlanSolver(unittest.TestCase):
+
+    def test_picks_cheapest_exact_engine(self):
+        """木は木DP、密な中規模グラフはDP、疎で大きなグラフはブロック分解を選ぶか"""
+        self.assertEqual(plan_solver(path_graph(200)).engine, "tree")
+        self.assertEqual(plan_solver(complete_graph(12)).engine, "dp")
+
+        # 小さな閉路を多数の橋でつないだ疎なグラフ
+        edges = []
+        for i in range(30):
+            a, b, c = 3 * i, 3 * i + 1, 3 * i + 2
+            edges += [(a, b, 1.0), (b, c, 2.0), (c, a, 3.0), (c, a + 3, 1.0)]
+        plan = plan_solver(build_graph(edges))
+        self.assertEqual(plan.engine, "blocks")
+        self.assertFalse(plan.approximate)
+
+    def test_degrades_only_when_no_exact_engine_fits(self):
+        """どの厳密解法も制限時間に収まらない場合に限り近似解法を選び、近似と明示するか"""
+        graph = complete_graph(30)
+        estimates = estimate_costs(GraphFeatures(graph))
+        self.assertGreater(min(estimates.values()), 10.0)
+
+        plan = plan_solver(graph, time_budget=10.0)
+        self.assertEqual(plan.engine, "anneal")
+        self.assertTrue(plan.approximate)
+        self.assertIn("近似", plan.describe())
+
+        plan = plan_solver(graph, time_budget=None)
+        self.assertFalse(plan.approximate)
+        self.assertEqual(plan.engine, "parallel")
+
+    def test_samples_plan_exact(self):
+        """サンプルはすべて厳密解法で1秒以内と見積もるか"""
+        for name in ('example1.txt', 'simple_line.txt', 'difficult_case1.txt',
+                     'performance_killer.txt', 'large_graph.txt'):
+            plan = plan_solver(load_sample(name), time_budget=1.0)
+            with self.subTest(name=name):
+                self.assertFalse(plan.approximate)
+
+class TestAdvancedStrategies(unittest.TestCase):
+
+    def test_matches_exact_solver(self):
+        """完全グラフ・疎グラフ（成分が5頂点以上）でも厳密解法と同じ最長距離を返すか"""
+        rng = random.Random(0)
+        graphs = [complete_graph(n) for n in (7, 9)]
+        for _ in range(20):
+            # 疎: 全域木に少しだけ辺を足した2つの成分
+            edges = []
+            for offset in (0, 100):
+                n = rng.randint(5, 9)
+                edges += [(offset + v, offset + rng.randrange(v), float(rng.randint(1, 9)))
+                          for v in range(1, n)]
+                edges.append((offset, offset + n - 1, float(rng.randint(1, 9))))
+            graphs.append(build_graph(edges))
+
+        # 疎でもブロックが大きい格子（ブロック分解・上界なしの全探索では終わらない）
+        grids = [grid_graph(5, 5), grid_graph(6, 6)]
+
+        for trial, graph in enumerate(graphs + grids):
+            solver = AdvancedLongestPathSolver(graph)
+            _, distance = solver.find_longest_path()
+            reference = (ParallelLongestPathSolver(graph, max_workers=1) if trial >= len(graphs)
+                         else BitmaskLongestPathSolver(graph))
+            _, expected = reference.find_longest_path()
+            with self.subTest(trial=trial):
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertTrue(solver.is_optimal)
+
+if __name__ == '__main__':
+    unittest.main()
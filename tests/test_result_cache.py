@@ -0,0 +1,125 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from solver import LongestPathSolver
+from result_cache import CachedSolver, ResultCache, graph_fingerprint
+from helpers import build_graph
+
+EDGES = [(1, 2, 1.5), (2, 3, 2.5), (3, 1, 4.0), (3, 4, 0.5), (4, 4, 1.0), (1, 2, 0.25)]
+
+class CountingSolver:
+    """探索の回数を数えるテスト用ソルバー"""
+
+    def __init__(self, graph, is_optimal=True):
+        self.inner = LongestPathSolver(graph)
+        self.optimal = is_optimal
+        self.calls = 0
+        self.is_optimal = True
+        self.upper_bound = 0.0
+
+    def set_search_limit(self, search_limit):
+        self.inner.set_search_limit(search_limit)
+
+    def find_longest_path(self):
+        self.calls += 1
+        result = self.inner.find_longest_path()
+        self.is_optimal = self.optimal
+        self.upper_bound = self.inner.upper_bound
+        return result
+
+class TestGraphFingerprint(unittest.TestCase):
+
+    def test_independent_of_edge_order(self):
+        """辺の順序・向きを変えても、CSR形式に変換しても同じハッシュ値か"""
+        expected = graph_fingerprint(build_graph(EDGES))
+        rng = random.Random(0)
+        for trial in range(20):
+            edges = [(v, u, w) if rng.random() < 0.5 else (u, v, w) for u, v, w in EDGES]
+            rng.shuffle(edges)
+            graph = build_graph(edges)
+            with self.subTest(trial=trial):
+                self.assertEqual(graph_fingerprint(graph), expected)
+                self.assertEqual(graph_fingerprint(graph.freeze()), expected)
+
+    def test_sensitive_to_weights_and_edges(self):
+        """重みや辺の本数が変わればハッシュ値も変わるか"""
+        expected = graph_fingerprint(build_graph(EDGES))
+        changed_weight = [(1, 2, 1.5000000001)] + EDGES[1:]
+        self.assertNotEqual(graph_fingerprint(build_graph(changed_weight)), expected)
+        self.assertNotEqual(graph_fingerprint(build_graph(EDGES[:-1])), expected)
+        self.assertNotEqual(graph_fingerprint(build_graph(EDGES + [EDGES[0]])), expected)
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.graph = build_graph(EDGES)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_hit_skips_search(self):
+        """2回目は探索せずキャッシュの結果を返すか"""
+        cache = ResultCache(self.directory.name)
+        first = CountingSolver(self.graph)
+        cached = CachedSolver(self.graph, first, cache)
+        expected = cached.find_longest_path()
+        self.assertFalse(cached.cache_hit)
+        self.assertEqual(first.calls, 1)
+
+        second = CountingSolver(build_graph(reversed(EDGES)))
+        cached = CachedSolver(build_graph(reversed(EDGES)), second, cache)
+        self.assertEqual(cached.find_longest_path(), expected)
+        self.assertTrue(cached.cache_hit)
+        self.assertEqual(cached.cached_solver_name, 'CountingSolver')
+        self.assertTrue(cached.is_optimal)
+        self.assertEqual(second.calls, 0)
+
+    def test_unproven_results_are_not_stored(self):
+        """最適性が証明されていない結果は保存しないか"""
+        cache = ResultCache(self.directory.name)
+        CachedSolver(self.graph, CountingSolver(self.graph, is_optimal=False),
+                     cache).find_longest_path()
+        cached = CachedSolver(self.graph, CountingSolver(self.graph), cache)
+        cached.find_longest_path()
+        self.assertFalse(cached.cache_hit)
+
+    def test_lru_eviction(self):
+        """件数の上限を超えたら最後に使われた時刻が古いものから削除するか"""
+        cache = ResultCache(self.directory.name, max_entries=2)
+        for i, key in enumerate(['a', 'b']):
+            cache.store(key, 'solver', [1, 2], 1.0)
+            os.utime(os.path.join(self.directory.name, f"{key}.json"), ns=(i, i))
+        self.assertIsNotNone(cache.lookup('a'))
+        cache.store('c', 'solver', [1, 2], 1.0)
+        self.assertIsNotNone(cache.lookup('a'))
+        self.assertIsNone(cache.lookup('b'))
+        self.assertIsNotNone(cache.lookup('c'))
+
+    def test_size_limit(self):
+        """合計サイズの上限を超えたら削除するか"""
+        cache = ResultCache(self.directory.name, max_bytes=200)
+        for key in 'abcdef':
+            cache.store(key, 'solver', list(range(10)), 1.0)
+        sizes = [entry.stat().st_size for entry in os.scandir(self.directory.name)]
+        self.assertLessEqual(sum(sizes), 200)
+        self.assertIsNotNone(cache.lookup('f'))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """壊れたエントリはミスとして扱い削除するか"""
+        cache = ResultCache(self.directory.name)
+        path = os.path.join(self.directory.name, 'broken.json')
+        with open(path, 'w') as f:
+            f.write('{"version": 1, "path": [1')
+        self.assertIsNone(cache.lookup('broken'))
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
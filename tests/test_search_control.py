@@ -0,0 +1,148 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from solver import LongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from dp_solver import HeldKarpLongestPathSolver
+from block_solver import BlockCutTreeSolver
+from tree_solver import TreeDiameterSolver
+from chain_reduction import ChainContractedSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from search_control import SearchInterrupted, SearchLimit, graph_upper_bound
+from session import path_distance
+
+def dense_graph(n, seed=0):
+    """全探索では制限時間内に解けない密なランダムグラフ"""
+    rng = random.Random(seed)
+    graph = Graph()
+    for u in range(1, n + 1):
+        for v in range(u + 1, n + 1):
+            if rng.random() < 0.7:
+                graph.add_edge(u, v, round(rng.uniform(1.0, 20.0), 1))
+    return graph
+
+class TestSearchLimit(unittest.TestCase):
+
+    def test_check_raises_after_cancel(self):
+        """中断要求後は check_interval 回以内に SearchInterrupted が送出されるか"""
+        limit = SearchLimit(check_interval=4)
+        for _ in range(10):
+            limit.check()
+        limit.cancel()
+        with self.assertRaises(SearchInterrupted):
+            for _ in range(4):
+                limit.check()
+        self.assertTrue(limit.stopped)
+
+    def test_expired_deadline(self):
+        """制限時間 0 秒では直ちに打ち切り判定になるか"""
+        limit = SearchLimit(0.0)
+        self.assertTrue(limit.should_stop())
+        self.assertEqual(limit.remaining(), 0.0)
+        self.assertIsNone(SearchLimit().remaining())
+
+    def test_shared_flag(self):
+        """共有フラグ経由で中断要求が伝わるか"""
+        limit = SearchLimit()
+        worker_limit = SearchLimit.from_shared(limit.share())
+        self.assertFalse(worker_limit.should_stop())
+        limit.cancel()
+        self.assertTrue(worker_limit.should_stop())
+
+    def test_graph_upper_bound(self):
+        """上界は最大全域森の重み以上になるか"""
+        graph = Graph()
+        graph.add_edge(1, 2, 3.0)
+        graph.add_edge(2, 3, 4.0)
+        graph.add_edge(3, 1, 5.0)
+        self.assertGreaterEqual(graph_upper_bound(graph), 9.0)
+
+class TestAnytimeSearch(unittest.TestCase):
+
+    def assert_anytime_result(self, graph, solver):
+        """打ち切られた場合も空でない有効なパスと上界を返すか"""
+        solver.set_search_limit(SearchLimit(0.05))
+        path, distance = solver.find_longest_path()
+
+        self.assertFalse(solver.is_optimal)
+        self.assertGreater(len(path), 1)
+        self.assertGreater(distance, 0.0)
+        self.assertEqual(len(path), len(set(path)))
+        self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+        self.assertGreaterEqual(solver.upper_bound, distance)
+
+    def test_interrupted_solvers_return_valid_paths(self):
+        """制限時間切れのソルバーが最良解・非最適フラグ・上界を返すか"""
+        graph = dense_graph(20)
+        factories = [
+            LongestPathSolver,
+            BitmaskLongestPathSolver,
+            HeldKarpLongestPathSolver,
+            BlockCutTreeSolver,
+            lambda g: ParallelLongestPathSolver(g, max_workers=1),
+            lambda g: ChainContractedSolver(g, BitmaskLongestPathSolver),
+        ]
+        for i, factory in enumerate(factories):
+            with self.subTest(solver=i):
+                self.assert_anytime_result(graph, factory(graph))
+
+    def test_partial_result_improves_with_time(self):
+        """打ち切り時にはそれまでに見つけた暫定解を返すか"""
+        graph = dense_graph(12)
+        solver = BitmaskLongestPathSolver(graph)
+        solver.set_search_limit(SearchLimit(0.05))
+        path, distance = solver.find_longest_path()
+
+        self.assertFalse(solver.is_optimal)
+        self.assertGreater(distance, 0.0)
+        self.assertAlmostEqual(path_distance(graph, path), distance, places=9)
+
+    def test_unlimited_search_is_optimal(self):
+        """制限なしで完了した場合は最適性が証明済みで上界が距離に一致するか"""
+        graph = dense_graph(7)
+        _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+        for solver in (LongestPathSolver(graph), HeldKarpLongestPathSolver(graph),
+                       BlockCutTreeSolver(graph), ParallelLongestPathSolver(graph, max_workers=1)):
+            with self.subTest(solver=type(solver).__name__):
+                solver.set_search_limit(SearchLimit())
+                _, distance = solver.find_longest_path()
+                self.assertTrue(solver.is_optimal)
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertAlmostEqual(solver.upper_bound, distance)
+
+    def test_tree_solver_is_always_optimal(self):
+        """木ソルバーは線形時間で解くため常に最適か"""
+        graph = Graph()
+        graph.add_edge(1, 2, 1.0)
+        graph.add_edge(2, 3, 2.0)
+        solver = TreeDiameterSolver(graph)
+        solver.set_search_limit(SearchLimit(0.0, check_interval=1))
+        _, distance = solver.find_longest_path()
+        self.assertTrue(solver.is_optimal)
+        self.assertAlmostEqual(distance, 3.0)
+
+    def test_advanced_complete_graph_is_exact(self):
+        """Advanced は完全グラフを厳密に解き、打ち切れば最適と表示しないか"""
+        graph = Graph()
+        for u in range(1, 9):
+            for v in range(u + 1, 9):
+                graph.add_edge(u, v, float((u * v) % 7 + 1))
+        solver = AdvancedLongestPathSolver(graph)
+        _, distance = solver.find_longest_path()
+        _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+        self.assertTrue(solver.is_optimal)
+        self.assertAlmostEqual(distance, expected, places=9)
+
+        solver.set_search_limit(SearchLimit(0.0, check_interval=1))
+        _, distance = solver.find_longest_path()
+        self.assertFalse(solver.is_optimal)
+        self.assertGreaterEqual(solver.upper_bound, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import json
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from solver import LongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from dp_solver import HeldKarpLongestPathSolver
+from block_solver import BlockCutTreeSolver
+from tree_solver import TreeDiameterSolver
+from beam_solver import BeamSearchSolver
+from anneal_solver import AnnealingSolver
+from chain_reduction import ChainContractedSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from search_stats import SearchStats
+from helpers import load_sample, path_graph
+
+def solve_with_stats(solver):
+    stats = SearchStats()
+    solver.set_search_stats(stats)
+    stats.start()
+    _, distance = solver.find_longest_path()
+    stats.finish()
+    return stats, distance
+
+class TestSearchStats(unittest.TestCase):
+
+    def assert_consistent(self, stats, distance):
+        """改善履歴が時刻・距離ともに単調で、最後が最長距離か"""
+        self.assertGreater(stats.nodes_expanded, 0)
+        times = [when for when, _ in stats.improvements]
+        distances = [value for _, value in stats.improvements]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(distances, sorted(set(distances)))
+        self.assertAlmostEqual(distances[-1], distance, places=9)
+        self.assertEqual(stats.max_depth, len(stats.depth_counts) - 1)
+
+    def test_dfs_solvers_count_every_node(self):
+        """DFS系のソルバーでは展開数が nodes_explored と一致し、深さが頂点数未満か"""
+        graph = load_sample('large_graph.txt')
+        solvers = [LongestPathSolver(graph), BitmaskLongestPathSolver(graph),
+                   ParallelLongestPathSolver(graph, max_workers=1),
+                   ParallelLongestPathSolver(graph, max_workers=2)]
+        for solver in solvers:
+            stats, distance = solve_with_stats(solver)
+            with self.subTest(solver=type(solver).__name__, workers=getattr(solver, 'max_workers', 1)):
+                self.assert_consistent(stats, distance)
+                self.assertEqual(stats.nodes_expanded, solver.nodes_explored)
+                self.assertLess(stats.max_depth, len(graph.get_all_vertices()))
+                self.assertGreater(stats.prunes.get("symmetry", 0), 0)
+                if isinstance(solver, ParallelLongestPathSolver):
+                    self.assertEqual(stats.prunes.get("shared_bound", 0),
+                                     solver.shared_bound_prunes)
+                    self.assertGreater(stats.prunes.get("bound", 0), 0)
+
+    def test_every_solver_records(self):
+        """すべてのソルバーが計測値を受け付けて記録するか"""
+        graph = load_sample('large_graph.txt')
+        solvers = [HeldKarpLongestPathSolver(graph), BlockCutTreeSolver(graph),
+                   AdvancedLongestPathSolver(graph), BeamSearchSolver(graph, beam_width=4),
+                   AnnealingSolver(graph, time_budget=0.2, max_iterations=2000, max_workers=1),
+                   ChainContractedSolver(graph, BitmaskLongestPathSolver),
+                   TreeDiameterSolver(path_graph(6))]
+        for solver in solvers:
+            stats, distance = solve_with_stats(solver)
+            with self.subTest(solver=type(solver).__name__):
+                self.assert_consistent(stats, distance)
+
+        stats, _ = solve_with_stats(BeamSearchSolver(graph, beam_width=4))
+        self.assertGreater(stats.prunes["beam_width"], 0)
+        self.assertGreater(stats.prunes["duplicate"], 0)
+
+    def test_disabled_by_default(self):
+        """計測値を渡さなければ記録しないか"""
+        solver = BitmaskLongestPathSolver(load_sample('example1.txt'))
+        solver.find_longest_path()
+        self.assertIsNone(solver.search_stats)
+
+    def test_merge_and_json(self):
+        """合算で改善履歴を時刻順の改善だけに絞り、JSONに変換できるか"""
+        first, second = SearchStats(), SearchStats()
+        first.start()
+        first.node(0)
+        first.node(2, 3)
+        first.prune("bound")
+        first.improve(5.0, first.started + 0.1)
+        first.improve(4.0, first.started + 0.2)
+        second.node(1)
+        second.prune("bound", 2)
+        second.prune("symmetry")
+        second.improve(3.0, first.started + 0.05)
+        second.improve(7.0, first.started + 0.3)
+        first.merge(second)
+        first.finish()
+
+        self.assertEqual(first.depth_counts, [1, 1, 3])
+        self.assertEqual(first.prunes, {"bound": 3, "symmetry": 1})
+        self.assertEqual([d for _, d in first.improvements], [3.0, 5.0, 7.0])
+
+        report = json.loads(first.to_json(solver="test"))
+        self.assertEqual(report["nodes_expanded"], 5)
+        self.assertEqual(report["max_depth"], 2)
+        self.assertEqual(report["depth_histogram"], [1, 1, 3])
+        self.assertEqual(report["solver"], "test")
+        self.assertAlmostEqual(report["improvements"][-1]["seconds"], 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
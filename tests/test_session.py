@@ -0,0 +1,151 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver
+from session import SolverSession, default_solver, path_distance
+from helpers import load_sample
+
+def random_edge(rng, vertices):
+    u, v = rng.choice(vertices), rng.choice(vertices)
+    return u, v, float(rng.randint(0, 9))
+
+class TestGraphEdits(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(1, 2, 2.0)
+        self.graph.add_edge(2, 3, 1.0)
+        self.graph.add_edge(3, 3, 5.0)
+
+    def test_remove_edge(self):
+        """多重辺は1本だけ、自己ループは両方の記録を削除し、孤立した頂点を取り除くか"""
+        self.assertEqual(self.graph.remove_edge(2, 1, 2.0), 2.0)
+        self.assertEqual(self.graph.get_neighbors(1), [(2, 1.0)])
+        self.assertEqual(self.graph.remove_edge(3, 3), 5.0)
+        self.assertEqual(self.graph.get_neighbors(3), [(2, 1.0)])
+        self.graph.remove_edge(3, 2)
+        self.assertEqual(sorted(self.graph.get_all_vertices()), [1, 2])
+        with self.assertRaises(KeyError):
+            self.graph.remove_edge(2, 3)
+
+    def test_set_weight(self):
+        """両方向の隣接の重みを変更し、変更前の重みを返すか"""
+        self.assertEqual(self.graph.set_weight(2, 1, 4.0, old_weight=2.0), 2.0)
+        self.assertEqual(self.graph.get_neighbors(1), [(2, 1.0), (2, 4.0)])
+        self.assertEqual(self.graph.get_neighbors(2), [(1, 1.0), (1, 4.0), (3, 1.0)])
+        self.assertEqual(self.graph.set_weight(3, 3, 6.0), 5.0)
+        self.assertEqual(self.graph.get_neighbors(3), [(2, 1.0), (3, 6.0), (3, 6.0)])
+
+class CountingFactory:
+    """作ったソルバーの数を数えるソルバーファクトリ"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, graph):
+        self.calls += 1
+        return default_solver(graph)
+
+class TestSolverSession(unittest.TestCase):
+
+    def test_matches_full_solve_after_random_deltas(self):
+        """辺の追加・削除・重みの変更の後も、全体を解き直した場合と同じ最長距離か"""
+        rng = random.Random(0)
+        for trial in range(40):
+            vertices = list(range(rng.randint(2, 9)))
+            graph = Graph()
+            for _ in range(rng.randint(1, 10)):
+                graph.add_edge(*random_edge(rng, vertices))
+            session = SolverSession(graph)
+            for step in range(8):
+                edges = [(u, v, w) for u in session.graph.get_all_vertices()
+                         for v, w in session.graph.get_neighbors(u) if u <= v]
+                action = rng.random()
+                if action < 0.4 or len(edges) < 2:
+                    session.add_edge(*random_edge(rng, vertices))
+                elif action < 0.7:
+                    u, v, w = rng.choice(edges)
+                    session.remove_edge(u, v, w)
+                else:
+                    u, v, w = rng.choice(edges)
+                    session.set_weight(u, v, float(rng.randint(0, 9)), old_weight=w)
+
+                path, distance = session.solve()
+                _, expected = BitmaskLongestPathSolver(session.graph).find_longest_path()
+                with self.subTest(trial=trial, step=step):
+                    self.assertAlmostEqual(distance, expected, places=9)
+                    self.assertTrue(session.is_optimal)
+                    self.assertEqual(len(path), len(set(path)))
+                    if path:
+                        self.assertAlmostEqual(path_distance(session.graph, path), distance,
+                                               places=9)
+
+    def test_deletion_off_best_path_skips_search(self):
+        """最長パスが通らない辺の削除・重みの減少では探索しないか"""
+        graph = Graph()
+        for u, v, w in [(1, 2, 5.0), (2, 3, 5.0), (3, 1, 1.0), (3, 4, 0.5)]:
+            graph.add_edge(u, v, w)
+        factory = CountingFactory()
+        session = SolverSession(graph, factory)
+        path, distance = session.solve()
+        self.assertEqual(distance, 10.5)
+        self.assertEqual(factory.calls, 1)
+
+        # 追加は最長距離を増やしうるため解き直す（元に戻れば成分の結果を再利用する）
+        session.add_edge(1, 5, 0.1)
+        session.remove_edge(1, 5)
+        session.solve()
+        self.assertFalse(session.skipped)
+        self.assertEqual((session.components_searched, factory.calls), (0, 1))
+
+        session.set_weight(3, 1, 0.5)
+        self.assertEqual(session.solve(), (path, distance))
+        self.assertTrue(session.skipped)
+        session.remove_edge(1, 3)
+        self.assertEqual(session.solve(), (path, distance))
+        self.assertTrue(session.skipped)
+
+        session.remove_edge(2, 3)
+        _, distance = session.solve()
+        self.assertFalse(session.skipped)
+        self.assertEqual(distance, 5.0)
+
+    def test_only_changed_component_is_searched(self):
+        """変更のない連結成分は前回の結果を再利用するか"""
+        graph = Graph()
+        for offset in (0, 10, 20):
+            for u in range(1, 6):
+                for v in range(u + 1, 6):
+                    graph.add_edge(offset + u, offset + v, float((u * v + offset) % 7 + 1))
+        factory = CountingFactory()
+        session = SolverSession(graph, factory)
+        session.solve()
+        self.assertEqual(session.components_searched, 3)
+
+        session.set_weight(11, 12, 20.0)
+        _, distance = session.solve()
+        self.assertEqual((session.components_searched, session.components_reused), (1, 2))
+        _, expected = BitmaskLongestPathSolver(session.graph).find_longest_path()
+        self.assertAlmostEqual(distance, expected, places=9)
+
+    def test_initial_incumbent_reduces_nodes(self):
+        """前回の最長パスを暫定解として与えると、結果を変えずに探索ノード数が減るか"""
+        graph = load_sample('large_graph.txt')
+        plain = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=0)
+        expected = plain.find_longest_path()
+        seeded = ParallelLongestPathSolver(graph, max_workers=1, warm_start_budget=0)
+        seeded.set_initial_incumbent(*expected)
+        self.assertEqual(seeded.find_longest_path(), expected)
+        self.assertLess(seeded.nodes_explored, plain.nodes_explored)
+
+if __name__ == '__main__':
+    unittest.main()
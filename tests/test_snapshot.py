@@ -0,0 +1,106 @@
+import unittest
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver
+from snapshot import (SnapshotError, StaleSnapshotError, load_or_build, load_snapshot,
+                      save_snapshot, source_checksum)
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graph.snap')
+        self.graph = Graph()
+        self.graph.add_edge(30, 10, 1.5)
+        self.graph.add_edge(10, 20, 2.5)
+        self.graph.add_edge(20, 30, 3.5)
+        self.graph.add_edge(10, 20, 4.0)
+        self.graph.add_edge(40, 40, 1.0)
+        self.graph.add_edge(40, 2**40, 0.25)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_source(self, text):
+        source = os.path.join(self.directory.name, 'edges.txt')
+        with open(source, 'w') as f:
+            f.write(text)
+        return source
+
+    def test_round_trip(self):
+        """書き出したスナップショットが同じCSR配列として読み込まれるか"""
+        save_snapshot(self.graph, self.path)
+        compiled = self.graph.freeze()
+        loaded = load_snapshot(self.path)
+        self.assertEqual(loaded.vertex_ids, compiled.vertex_ids)
+        self.assertEqual(list(loaded.offsets), list(compiled.offsets))
+        self.assertEqual(list(loaded.targets), list(compiled.targets))
+        self.assertEqual(list(loaded.weights), list(compiled.weights))
+        for v in self.graph.get_all_vertices():
+            self.assertEqual(loaded.get_neighbors(v), self.graph.get_neighbors(v))
+
+    @unittest.skipUnless(sys.byteorder == 'little', "ビッグエンディアンでは複製して読む")
+    def test_zero_copy(self):
+        """配列が複製されずメモリマップを参照しているか"""
+        save_snapshot(self.graph, self.path)
+        loaded = load_snapshot(self.path)
+        for values in (loaded.offsets, loaded.targets, loaded.weights):
+            self.assertIsInstance(values, memoryview)
+            self.assertIsInstance(values.obj, mmap.mmap)
+
+    def test_empty_graph(self):
+        """空のグラフも読み書きできるか"""
+        save_snapshot(Graph(), self.path)
+        self.assertEqual(load_snapshot(self.path).get_all_vertices(), [])
+
+    def test_solvers_and_pickle(self):
+        """読み込んだグラフでソルバーが同じ結果を返し、ワーカーへ pickle できるか"""
+        save_snapshot(self.graph, self.path)
+        loaded = load_snapshot(self.path)
+        expected = BitmaskLongestPathSolver(self.graph).find_longest_path()
+        self.assertEqual(BitmaskLongestPathSolver(loaded).find_longest_path(), expected)
+        restored = pickle.loads(pickle.dumps(loaded))
+        self.assertEqual(ParallelLongestPathSolver(restored, max_workers=1).find_longest_path(),
+                         ParallelLongestPathSolver(self.graph, max_workers=1).find_longest_path())
+
+    def test_invalid_files(self):
+        """スナップショットでないファイル・切り詰められたファイルを検出するか"""
+        with open(self.path, 'wb') as f:
+            f.write(b"1, 2, 3.0\n")
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path)
+
+        save_snapshot(self.graph, self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 8)
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path)
+
+    def test_stale_snapshot_is_rebuilt(self):
+        """元テキストが変わったスナップショットを検出して作り直すか"""
+        source = self.write_source("1, 2, 1.5\n2, 3, 2.5\n")
+        graph, rebuilt = load_or_build(source, self.path)
+        self.assertTrue(rebuilt)
+        graph, rebuilt = load_or_build(source, self.path)
+        self.assertFalse(rebuilt)
+        self.assertEqual(graph.get_neighbors(2), [(1, 1.5), (3, 2.5)])
+
+        self.write_source("1, 2, 1.5\n2, 3, 9.0\n")
+        with self.assertRaises(StaleSnapshotError):
+            load_snapshot(self.path, source_checksum(source))
+        graph, rebuilt = load_or_build(source, self.path)
+        self.assertTrue(rebuilt)
+        self.assertEqual(graph.get_neighbors(3), [(2, 9.0)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import random
 import sys
 import os
 
@@ -7,6 +8,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from graph import Graph
 from solver import LongestPathSolver
+from search_stats import SearchStats
+from helpers import load_sample, random_graph
 
 class TestLongestPathSolver(unittest.TestCase):
 
@@ -87,5 +90,45 @@ class TestLongestPathSolver(unittest.TestCase):
         self.assertTrue(len(path) >= 2)
         self.assertTrue(distance > 0.0)
 
+class TestReachPruning(unittest.TestCase):
+
+    def assert_same_as_plain(self, graph, **options):
+        """到達可能性による枝刈りの有無でパス・距離が完全に一致するか"""
+        plain = LongestPathSolver(graph, reach_interval=0, **options).find_longest_path()
+        for interval in (1, 2, 5):
+            with self.subTest(interval=interval, **options):
+                self.assertEqual(LongestPathSolver(graph, reach_interval=interval,
+                                                   **options).find_longest_path(), plain)
+
+    def test_matches_plain_dfs_on_samples(self):
+        for name in ('example1.txt', 'difficult_case1.txt', 'large_graph.txt'):
+            graph = load_sample(name)
+            self.assert_same_as_plain(graph)
+            self.assert_same_as_plain(graph, symmetry_breaking=False)
+
+    def test_matches_plain_dfs_on_random_graphs(self):
+        """非連結・同距離のパスが多いグラフ・負の重みを含むランダムグラフでも一致するか"""
+        rng = random.Random(11)
+        for trial in range(30):
+            n = rng.randint(2, 9)
+            graph = random_graph(rng, n, rng.choice([0.2, 0.4, 0.8]))
+            for _ in range(n):
+                u, v = rng.sample(range(1, n + 1), 2)
+                graph.add_edge(u, v, [1.0, 2.0, -1.5][trial % 3])
+            with self.subTest(trial=trial):
+                self.assert_same_as_plain(graph)
+
+    def test_prunes_and_records(self):
+        """探索ノード数が減り、枝刈りを理由 reach として記録するか"""
+        graph = load_sample('large_graph.txt')
+        plain = LongestPathSolver(graph, reach_interval=0)
+        plain.find_longest_path()
+        pruned = LongestPathSolver(graph)
+        stats = SearchStats()
+        pruned.set_search_stats(stats)
+        pruned.find_longest_path()
+        self.assertLess(pruned.nodes_explored, plain.nodes_explored * 0.5)
+        self.assertGreater(stats.prunes["reach"], 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
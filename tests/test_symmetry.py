@@ -0,0 +1,90 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from solver import LongestPathSolver
+from bitmask_solver import BitmaskLongestPathSolver
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from symmetry import CanonicalIncumbent, reverse_sum
+from helpers import load_sample, random_multigraph
+
+class TestCanonicalIncumbent(unittest.TestCase):
+
+    def test_reverse_sum_order(self):
+        """逆向きの加算順序で距離を計算するか"""
+        weights = [0.1, 0.2, 0.3]
+        self.assertEqual(reverse_sum(weights), (0.3 + 0.2) + 0.1)
+        self.assertNotEqual(reverse_sum(weights), (0.1 + 0.2) + 0.3)
+
+    def test_prefers_larger_orientation(self):
+        """逆向きの方が距離が大きい場合は逆向きのパスを採用するか"""
+        incumbent = CanonicalIncumbent([10, 20, 30, 40])
+        incumbent.offer([0, 1, 2, 3], [0.3, 0.2, 0.1], (0.3 + 0.2) + 0.1)
+        self.assertEqual(incumbent.path, [40, 30, 20, 10])
+        self.assertEqual(incumbent.distance, (0.1 + 0.2) + 0.3)
+
+    def test_tie_keeps_earlier_in_enumeration_order(self):
+        """同距離なら (始点の順位, 頂点IDの列) の順で先のパスを残すか"""
+        incumbent = CanonicalIncumbent([10, 20, 30], rank=[1, 0, 2])
+        self.assertTrue(incumbent.offer([0, 2], [1.0], 1.0))
+        self.assertEqual(incumbent.path, [10, 30])
+        self.assertTrue(incumbent.offer([1, 2], [1.0], 1.0))
+        self.assertEqual(incumbent.path, [20, 30])
+        self.assertTrue(incumbent.offer([1, 0], [1.0], 1.0))
+        self.assertEqual(incumbent.path, [20, 10])
+        self.assertFalse(incumbent.offer([1, 2], [1.0], 1.0))
+        self.assertFalse(incumbent.offer([0, 2], [0.5], 0.5))
+        self.assertTrue(incumbent.offer([0, 2], [2.0], 2.0))
+
+class TestSymmetryBreaking(unittest.TestCase):
+
+    def test_same_output_as_full_enumeration(self):
+        """向きの正規化の有無で出力（パスと距離）が一致するか"""
+        rng = random.Random(5)
+        for trial in range(300):
+            graph = random_multigraph(rng, rng.randint(1, 8), rng.randint(0, 16))
+            for solver_class in (LongestPathSolver, BitmaskLongestPathSolver,
+                                 AdvancedLongestPathSolver):
+                with self.subTest(trial=trial, solver=solver_class.__name__):
+                    full = solver_class(graph, symmetry_breaking=False).find_longest_path()
+                    canonical = solver_class(graph).find_longest_path()
+                    self.assertEqual(canonical, full)
+
+    def test_parallel_kernel_is_exact(self):
+        """並列ソルバーの探索カーネルでも最長距離が変わらないか"""
+        rng = random.Random(6)
+        for trial in range(200):
+            graph = random_multigraph(rng, rng.randint(2, 9), rng.randint(1, 20))
+            with self.subTest(trial=trial):
+                _, expected = ParallelLongestPathSolver(
+                    graph, max_workers=1, symmetry_breaking=False).find_longest_path()
+                path, distance = ParallelLongestPathSolver(graph, max_workers=1).find_longest_path()
+                self.assertAlmostEqual(distance, expected, places=9)
+                self.assertEqual(len(path), len(set(path)))
+
+    def test_rounding_sensitive_sample(self):
+        """向きで距離の丸めが異なるサンプルでも従来と同じパスを返すか"""
+        graph = load_sample('difficult_case1.txt')
+        path, distance = LongestPathSolver(graph).find_longest_path()
+        self.assertEqual(path, [4, 2, 5, 1, 6, 3])
+        self.assertEqual(distance, 19.6)
+
+    def test_fewer_nodes_explored(self):
+        """探索ノード数が減るか"""
+        graph = load_sample('performance_killer.txt')
+        # 到達可能性による枝刈りは対称性の除去と独立に効くため、外して比べる
+        for solver_class, options in ((LongestPathSolver, {"reach_interval": 0}),
+                                      (BitmaskLongestPathSolver, {})):
+            with self.subTest(solver=solver_class.__name__):
+                full = solver_class(graph, symmetry_breaking=False, **options)
+                canonical = solver_class(graph, **options)
+                full.find_longest_path()
+                canonical.find_longest_path()
+                self.assertLess(canonical.nodes_explored, full.nodes_explored * 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
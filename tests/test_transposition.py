@@ -0,0 +1,104 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from parallel_solver import ParallelLongestPathSolver, AdvancedLongestPathSolver
+from search_stats import SearchStats
+from transposition import TranspositionTable, ENTRY_BYTES
+from helpers import load_sample, random_graph
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_prunes_shorter_or_equal_arrivals(self):
+        table = TranspositionTable(64)
+        self.assertFalse(table.visit((0b011, 1), 5.0, 1))
+        self.assertTrue(table.visit((0b011, 1), 5.0, 1))
+        self.assertTrue(table.visit((0b011, 1), 4.0, 1))
+        # 長い接頭辞で到達したら記録を更新して先へ進む
+        self.assertFalse(table.visit((0b011, 1), 6.0, 1))
+        self.assertTrue(table.visit((0b011, 1), 5.5, 1))
+        self.assertFalse(table.visit((0b011, 0), 1.0, 1))
+        self.assertEqual(table.take_counters(), (6, 3, 2, 0))
+        self.assertEqual(table.take_counters(), (0, 0, 0, 0))
+
+    def test_clear_forgets_entries(self):
+        table = TranspositionTable(64)
+        table.visit((0b101, 2), 3.0, 1)
+        table.clear()
+        self.assertFalse(table.visit((0b101, 2), 3.0, 1))
+
+    def test_fixed_capacity_keeps_shallow_states(self):
+        """容量を超えても格納数は増えず、浅い状態は深い状態に追い出されないか"""
+        table = TranspositionTable(10)
+        self.assertEqual(table.capacity, 8)
+        shallow = [((1 << v, v), 1.0) for v in range(40)]
+        for key, distance in shallow:
+            table.visit(key, distance, 1)
+        for v in range(40, 400):
+            table.visit((1 << v | 1, v), 1.0, 9)
+        _, _, stores, evictions = table.take_counters()
+        self.assertEqual(stores, 400)
+        self.assertEqual(stores - evictions, table.capacity)
+        # 各バケットの深さ優先のスロットには浅い状態が残る
+        kept = sum(key in table._keys for key, _ in shallow)
+        self.assertEqual(kept, table.capacity // 2)
+
+        self.assertEqual(TranspositionTable.from_megabytes(1).capacity,
+                         TranspositionTable(1024 * 1024 // ENTRY_BYTES).capacity)
+
+class TestTranspositionSearch(unittest.TestCase):
+
+    def assert_same_result(self, graph, **options):
+        """置換表の有無（小さすぎて溢れる表も含む）でパス・距離が一致するか"""
+        expected = ParallelLongestPathSolver(graph, **options).find_longest_path()
+        for megabytes in (1, 0.001):
+            with self.subTest(megabytes=megabytes, **options):
+                solver = ParallelLongestPathSolver(graph, transposition_mb=megabytes, **options)
+                self.assertEqual(solver.find_longest_path(), expected)
+                self.assertGreater(solver.table_lookups, 0)
+
+    def test_matches_search_without_table(self):
+        for name in ('performance_killer.txt', 'large_graph.txt'):
+            graph = load_sample(name)
+            for workers in (1, 2):
+                self.assert_same_result(graph, max_workers=workers)
+            self.assert_same_result(graph, max_workers=1, warm_start_budget=0)
+
+    def test_matches_on_random_graphs(self):
+        rng = random.Random(7)
+        for trial in range(20):
+            graph = random_graph(rng, rng.randint(5, 10), rng.choice([0.4, 0.7, 1.0]))
+            with self.subTest(trial=trial):
+                self.assert_same_result(graph, max_workers=1, warm_start_budget=0)
+
+    def test_reports_hit_rate(self):
+        """ヒット率を集計し、計測値の枝刈り数と JSON に記録するか"""
+        graph = load_sample('large_graph.txt')
+        solver = AdvancedLongestPathSolver(graph, transposition_mb=1)
+        stats = SearchStats()
+        solver.set_search_stats(stats)
+        solver.find_longest_path()
+        self.assertGreater(solver.table_hits, 0)
+        self.assertEqual(stats.prunes["transposition"], solver.table_hits)
+        report = stats.to_dict()["transposition"]
+        self.assertEqual(report["lookups"], solver.table_lookups)
+        self.assertEqual(report["stores"], solver.table_stores)
+        self.assertEqual(report["evictions"], solver.table_evictions)
+        self.assertAlmostEqual(report["hit_rate"], solver.table_hit_rate)
+        self.assertAlmostEqual(solver.table_hit_rate, solver.table_hits / solver.table_lookups)
+
+        # 置換表を使わなければ回数は 0 でヒット率は None
+        solver = AdvancedLongestPathSolver(graph)
+        solver.find_longest_path()
+        self.assertEqual((solver.table_lookups, solver.table_stores, solver.table_evictions),
+                         (0, 0, 0))
+        self.assertIsNone(solver.table_hit_rate)
+
+        self.assertIsNone(SearchStats().to_dict()["transposition"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import random
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graph import Graph
+from bitmask_solver import BitmaskLongestPathSolver
+from tree_solver import TreeDiameterSolver
+
+class TestTreeDiameterSolver(unittest.TestCase):
+
+    def setUp(self):
+        """テスト用のセットアップ"""
+        self.graph = Graph()
+
+    def test_is_forest(self):
+        """森の判定（多重辺・自己ループは閉路とみなさない）"""
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(2, 3, 1.0)
+        self.graph.add_edge(4, 5, 1.0)
+        self.assertTrue(self.graph.is_forest())
+
+        self.graph.add_edge(2, 1, 5.0)
+        self.graph.add_edge(3, 3, 1.0)
+        self.assertTrue(self.graph.is_forest())
+
+        self.graph.add_edge(3, 1, 1.0)
+        self.assertFalse(self.graph.is_forest())
+
+    def test_simple_linear_graph(self):
+        """線形グラフのテスト"""
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(2, 3, 2.0)
+        self.graph.add_edge(3, 4, 3.0)
+
+        path, distance = TreeDiameterSolver(self.graph).find_longest_path()
+        self.assertEqual(path, [1, 2, 3, 4])
+        self.assertAlmostEqual(distance, 6.0)
+
+    def test_star_graph(self):
+        """スター型グラフでは重い2本の枝を通る"""
+        self.graph.add_edge(1, 2, 5.0)
+        self.graph.add_edge(1, 3, 1.0)
+        self.graph.add_edge(1, 4, 7.0)
+
+        path, distance = TreeDiameterSolver(self.graph).find_longest_path()
+        self.assertEqual(path, [2, 1, 4])
+        self.assertAlmostEqual(distance, 12.0)
+
+    def test_rejects_cyclic_graph(self):
+        """閉路を含むグラフではエラーになるか"""
+        self.graph.add_edge(1, 2, 1.0)
+        self.graph.add_edge(2, 3, 1.0)
+        self.graph.add_edge(3, 1, 1.0)
+
+        with self.assertRaises(ValueError):
+            TreeDiameterSolver(self.graph).find_longest_path()
+
+    def test_matches_exhaustive_search_on_random_forests(self):
+        """ランダムな森で全探索と同じ最長距離になるか"""
+        rng = random.Random(0)
+        for trial in range(100):
+            graph = Graph()
+            n = rng.randint(2, 10)
+            for v in range(2, n + 1):
+                if rng.random() < 0.9:
+                    graph.add_edge(v, rng.randint(1, v - 1), round(rng.uniform(-2.0, 9.0), 2))
+            if not graph.get_all_vertices():
+                continue
+
+            with self.subTest(trial=trial):
+                _, expected = BitmaskLongestPathSolver(graph).find_longest_path()
+                _, distance = TreeDiameterSolver(graph).find_longest_path()
+                self.assertAlmostEqual(distance, expected, places=9)
+
+    def test_long_chain(self):
+        """再帰を使わないため長い路線でも解けるか"""
+        for v in range(1, 20000):
+            self.graph.add_edge(v, v + 1, 1.0)
+
+        path, distance = TreeDiameterSolver(self.graph).find_longest_path()
+        self.assertEqual(len(path), 20000)
+        self.assertAlmostEqual(distance, 19999.0)
+
+if __name__ == '__main__':
+    unittest.main()